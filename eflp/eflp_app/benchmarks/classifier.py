@@ -0,0 +1,114 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks import print_table
+from benchmarks.synthetic import fortigate_lines
+from parsers.base_parser import BaseParser
+from parsers.fortigate_parser import FortigateParser
+from parsers.keyword_matcher import KeywordClassifier
+
+import eflp_app
+
+
+CLASSIFIERS = {
+    "parser action": BaseParser.ACTION_CLASSIFIER,
+    "parser outcome": BaseParser.OUTCOME_CLASSIFIER,
+    "parser category": BaseParser.CATEGORY_CLASSIFIER,
+    "parser network type": BaseParser.NETWORK_TYPE_CLASSIFIER,
+    "app category": eflp_app.LOG_CATEGORY_CLASSIFIER,
+    "app outcome": eflp_app.OUTCOME_CLASSIFIER,
+    "app network type": eflp_app.NETWORK_TYPE_CLASSIFIER,
+}
+
+
+def fuzz_texts(count, seed=3):
+    # Keywords glued to each other and to random letters, so overlapping and
+    # nested keywords are exercised as well as ordinary log text.
+    rng = random.Random(seed)
+    words = sorted({word for classifier in CLASSIFIERS.values() for _, group in classifier.rules for word in group})
+    alphabet = "abcdefghijklmnopqrstuvwxyz -_:/="
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(0, 8)):
+            if rng.random() < 0.5:
+                parts.append(rng.choice(words))
+            else:
+                parts.append("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 6))))
+        texts.append(("" if rng.random() < 0.5 else " ").join(parts))
+    return texts
+
+
+def check_identical(texts):
+    mismatches = 0
+    for name, classifier in CLASSIFIERS.items():
+        for text in texts:
+            if classifier.classify(text) != classifier.classify_cascade(text):
+                mismatches += 1
+                print(f"mismatch in {name}: {text!r}")
+    return mismatches
+
+
+def classify_record(parser, record):
+    raw_fields = record.get("raw_fields") or {}
+    message = record.get("message", "")
+    action = parser.normalize_action(raw_fields.get("action"), message)
+    parser.infer_outcome(action, message, raw_fields)
+    parser.infer_log_category(raw_fields, message, record.get("event", ""), action)
+    parser.infer_network_type(message, raw_fields)
+    text = f"{message} {record.get('event', '')} {action}"
+    eflp_app.infer_log_category_from_text(text)
+    eflp_app.infer_outcome_from_text(text)
+
+
+def classify_rate(parser, records):
+    started = time.perf_counter()
+    for record in records:
+        classify_record(parser, record)
+    return len(records) / (time.perf_counter() - started)
+
+
+def run(count, fuzz):
+    texts = fuzz_texts(fuzz)
+    mismatches = check_identical(texts)
+    with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as fh:
+        fh.write("\n".join(fortigate_lines(count)) + "\n")
+        path = fh.name
+    parser = FortigateParser()
+    matcher = KeywordClassifier.classify
+    try:
+        KeywordClassifier.classify = KeywordClassifier.classify_cascade
+        cascade_records = parser.parse(path)
+        records = [record.to_dict() for record in cascade_records]
+        cascade_rate = classify_rate(parser, records)
+        KeywordClassifier.classify = matcher
+        matcher_records = parser.parse(path)
+        matcher_rate = classify_rate(parser, records)
+    finally:
+        KeywordClassifier.classify = matcher
+        os.remove(path)
+    same = records == [record.to_dict() for record in matcher_records]
+    rows = [
+        ["any() cascades", f"{cascade_rate:,.0f}"],
+        ["keyword matcher", f"{matcher_rate:,.0f}", f"{matcher_rate / cascade_rate:.2f}x"],
+    ]
+    rows[0].append("1.00x")
+    print(f"{len(texts)} fuzzed texts x {len(CLASSIFIERS)} classifiers: {mismatches} mismatches")
+    print(f"{count} FortiGate records parsed both ways; records identical: {same}")
+    print_table(["classifier", "records/s", "speedup"], rows)
+    return 1 if mismatches or not same else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword classifier throughput and equivalence check.")
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--fuzz", type=int, default=20000)
+    args = parser.parse_args()
+    raise SystemExit(run(args.records, args.fuzz))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import json
+import random
+
+import json_codec
+from benchmarks import best_of, print_table
+
+
+def sample_records(count, seed=7):
+    rng = random.Random(seed)
+    actions = ["allow", "deny", "drop", "reset-both"]
+    records = []
+    for number in range(count):
+        src_ip = f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+        dst_ip = f"172.16.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+        action = rng.choice(actions)
+        records.append({
+            "timestamp": f"2024-03-{1 + number % 28:02d}T{number % 24:02d}:{number % 60:02d}:{(number * 7) % 60:02d}",
+            "vendor": "palo_alto",
+            "severity": "informational",
+            "severity_int": 6,
+            "log_category": "traffic",
+            "event": "TRAFFIC",
+            "action": action,
+            "outcome": "blocked" if action != "allow" else "allowed",
+            "src_ip": src_ip,
+            "dst_ip": dst_ip,
+            "src_port": rng.randint(1024, 65535),
+            "dst_port": rng.choice([22, 53, 80, 443, 3389]),
+            "protocol": "tcp",
+            "user": f"corp\\user{rng.randint(1, 500)}",
+            "rule": f"rule-{rng.randint(1, 40)}",
+            "signature": "",
+            "event_id": str(number),
+            "session_id": str(rng.randint(100000, 999999)),
+            "network_type": "lan",
+            "message": f"TRAFFIC end {action} {src_ip} -> {dst_ip} bytes={rng.randint(60, 90000)}",
+            "raw_fields": {"bytes": str(rng.randint(60, 90000)), "app": "ssl", "zone": "trust", "é": "ü"},
+        })
+    return records
+
+
+def legacy_round_trip(record):
+    return json.loads(json.dumps(record, default=str))
+
+
+def legacy_es_dumps(document):
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def run(count, repeat):
+    records = sample_records(count)
+    search_payload = {
+        "query": {"ip": "10.0.0.5"},
+        "cases": [{"case_id": str(number), "label": f"case {number}", "vendor": "palo_alto", "count": 25,
+                   "row_type": "record", "rows": list(range(25))} for number in range(200)],
+        "elapsed_ms": 1.25,
+    }
+    codecs = json_codec.available_codecs()
+    lines = [codecs["stdlib"].dumpb(record) + b"\n" for record in records]
+    rows = []
+
+    def add(site, variant, seconds, operations):
+        rows.append([site, variant, f"{operations / seconds:,.0f}", f"{seconds * 1e6 / operations:.2f}"])
+
+    for name, codec in codecs.items():
+        add("jsonl encode (partitions, live append)", name,
+            best_of(lambda: [codec.dumpb(record) + b"\n" for record in records], repeat), count)
+    for name, codec in codecs.items():
+        add("jsonl decode (partitions, live tail, RAG sync)", name,
+            best_of(lambda: [codec.loads(line) for line in lines], repeat), count)
+    add("ES documents (RAG prepare, ES export)", "legacy round trip",
+        best_of(lambda: [legacy_es_dumps(legacy_round_trip(record)) for record in records], repeat), count)
+    for name, codec in codecs.items():
+        add("ES documents (RAG prepare, ES export)", name,
+            best_of(lambda: [codec.dumpb(dict(record)) for record in records], repeat), count)
+    for name, codec in codecs.items():
+        add("jsonify (/api/search response)", name,
+            best_of(lambda: codec.dumpb(search_payload, sort_keys=True), repeat), 1)
+    for name, codec in codecs.items():
+        add("export_json (indent=2)", name,
+            best_of(lambda: codec.dumpb(records, indent=2), repeat), count)
+    print(f"{count} records, best of {repeat}; active codec: {json_codec.CODEC.name}")
+    print_table(["call site", "codec", "ops/s", "us/op"], rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON codec micro-benchmarks for EFLP call sites.")
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.records, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+from benchmarks import print_table
+from benchmarks.synthetic import VENDOR_LINE, write_corpus
+from parsers import base_parser
+from parsers.record import PARSER_PROVENANCE, NormalizedRecord
+
+
+# enrich_record without extraction plans: every candidate key list
+# is scanned and every raw_fields key lowercased again for each record.
+
+def legacy_enrich_record(parser, record, vendor="", default_category="unknown"):
+    rec = dict(record or {})
+    raw_fields = parser.lower_keys(rec.get("raw_fields") or {})
+
+    payload_message = parser.first_value(
+        rec.get("message"),
+        parser.dict_first(raw_fields, ["msg", "message", "description", "reason", "details"]),
+        ""
+    )
+
+    date_part = parser.dict_first(raw_fields, ["date", "logdate", "eventdate", "devdate"])
+    time_part = parser.dict_first(raw_fields, ["time", "eventtime", "devtime"])
+    dt_compound = f"{date_part} {time_part}".strip() if date_part or time_part else ""
+
+    timestamp = parser.normalize_timestamp(
+        rec.get("timestamp"),
+        dt_compound,
+        parser.dict_first(raw_fields, ["timestamp", "event_time", "generated_time", "receive_time", "time_generated", "starttime"]),
+        parser.dict_first(raw_fields, ["rt"]),
+    )
+
+    severity_candidate = parser.first_value(
+        rec.get("severity"),
+        parser.dict_first(raw_fields, ["severity", "level", "risk", "threatlevel", "priority", "pri"]),
+        rec.get("syslog_priority"),
+    )
+    severity = parser.normalize_severity(
+        severity_candidate,
+        fallback=parser.severity_from_priority(rec.get("syslog_priority")) if rec.get("syslog_priority") is not None else "INFO",
+    )
+
+    host = parser.first_value(
+        rec.get("host"),
+        rec.get("syslog_host"),
+        parser.dict_first(raw_fields, ["host", "hostname", "device", "device_name", "devname"]),
+    )
+
+    src_ip = parser.normalize_ip(parser.first_value(
+        rec.get("src_ip"),
+        rec.get("srcip"),
+        parser.dict_first(raw_fields, ["src", "srcip", "src_ip", "source", "source_ip", "sip", "clientip", "client_ip"]),
+    ))
+    dst_ip = parser.normalize_ip(parser.first_value(
+        rec.get("dst_ip"),
+        rec.get("dstip"),
+        parser.dict_first(raw_fields, ["dst", "dstip", "dst_ip", "destination", "destination_ip", "dip", "serverip", "server_ip"]),
+    ))
+
+    if not src_ip:
+        msg_src = re.search(r'\bfrom\s+((?:\d{1,3}\.){3}\d{1,3})\b', payload_message, re.IGNORECASE)
+        if msg_src:
+            src_ip = msg_src.group(1)
+    if not dst_ip:
+        msg_dst = re.search(r'\bto\s+((?:\d{1,3}\.){3}\d{1,3})\b', payload_message, re.IGNORECASE)
+        if msg_dst:
+            dst_ip = msg_dst.group(1)
+
+    src_port = parser.normalize_port(parser.first_value(
+        rec.get("src_port"),
+        rec.get("srcport"),
+        parser.dict_first(raw_fields, ["srcport", "sport", "spt", "source_port"]),
+    ), field="src_port")
+    dst_port = parser.normalize_port(parser.first_value(
+        rec.get("dst_port"),
+        rec.get("dstport"),
+        parser.dict_first(raw_fields, ["dstport", "dport", "dpt", "destination_port"]),
+    ), field="dst_port")
+
+    protocol = str(parser.first_value(
+        rec.get("protocol"),
+        parser.dict_first(raw_fields, ["proto", "protocol", "service", "transport"]),
+    )).upper()
+
+    action = parser.normalize_action(
+        parser.first_value(
+            rec.get("action"),
+            rec.get("palo_action"),
+            parser.dict_first(raw_fields, ["action", "act", "result", "status", "disposition", "verdict", "operation"]),
+        ),
+        payload_message,
+    )
+
+    event = parser.first_value(
+        rec.get("event"),
+        rec.get("event_type"),
+        parser.infer_event(raw_fields=raw_fields, message=payload_message),
+    )
+
+    log_category = parser.first_value(
+        rec.get("log_category"),
+        rec.get("category"),
+        parser.infer_log_category(
+            raw_fields=raw_fields,
+            message=payload_message,
+            event=event,
+            action=action,
+            default=default_category,
+        ),
+        default_category,
+    )
+
+    outcome = parser.first_value(
+        rec.get("outcome"),
+        parser.infer_outcome(action=action, message=payload_message, raw_fields=raw_fields),
+    )
+
+    user = parser.first_value(
+        rec.get("user"),
+        parser.dict_first(raw_fields, ["user", "username", "srcuser", "dstuser", "admin", "account", "userid", "user_id"]),
+    )
+
+    rule = parser.first_value(
+        rec.get("rule"),
+        rec.get("policy"),
+        parser.dict_first(raw_fields, ["rule", "rulename", "policy", "policyid", "policyname", "acl", "access_rule"]),
+    )
+
+    signature = parser.first_value(
+        rec.get("signature"),
+        parser.dict_first(raw_fields, ["signature", "attack", "threat", "sig", "sig_name", "ips_signature"]),
+    )
+
+    event_id = parser.first_value(
+        rec.get("event_id"),
+        parser.dict_first(raw_fields, ["eventid", "event_id", "id", "logid", "msgid", "messageid", "sid"]),
+    )
+
+    session_id = parser.first_value(
+        rec.get("session_id"),
+        rec.get("sessionid"),
+        parser.dict_first(raw_fields, ["sessionid", "session_id", "connection_id", "connid", "flowid", "sid"]),
+    )
+
+    network_type = parser.first_value(
+        rec.get("network_type"),
+        parser.infer_network_type(payload_message, raw_fields=raw_fields),
+    )
+
+    rec.update(
+        parser.build_record(
+            vendor=vendor or rec.get("vendor", ""),
+            timestamp=timestamp,
+            severity=severity,
+            severity_int=parser._severity_to_int(severity),
+            host=host,
+            message=payload_message,
+            event=event,
+            log_category=log_category,
+            action=action,
+            outcome=outcome,
+            user=user,
+            rule=rule,
+            signature=signature,
+            event_id=str(event_id) if event_id is not None else "",
+            session_id=str(session_id) if session_id is not None else "",
+            protocol=protocol,
+            src_ip=src_ip,
+            dst_ip=dst_ip,
+            src_port=src_port,
+            dst_port=dst_port,
+            srcip=src_ip,
+            dstip=dst_ip,
+            srcport=src_port,
+            dstport=dst_port,
+            network_type=network_type,
+            raw_fields=raw_fields,
+            provenance=PARSER_PROVENANCE,
+        )
+    )
+    return NormalizedRecord.from_dict(rec)
+
+
+def captured_inputs(parser, vendor, count, seed):
+    # Parse a synthetic corpus and keep what each record looked like when it
+    # reached enrich_record.
+    inputs = []
+    enrich = parser.enrich_record
+
+    def capture(record, vendor="", default_category="unknown", context=None):
+        inputs.append((record, vendor, default_category))
+        return enrich(record, vendor=vendor, default_category=default_category, context=context)
+
+    fd, path = tempfile.mkstemp(suffix=".log", prefix=f"eflp-bench-{vendor}-")
+    os.close(fd)
+    try:
+        write_corpus(path, vendor, count, seed)
+        parser.enrich_record = capture
+        parser.parse(path)
+    finally:
+        del parser.enrich_record
+        os.remove(path)
+    return inputs
+
+
+def timed(func, inputs, repeat):
+    best = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        results = [func(record, vendor=vendor, default_category=category) for record, vendor, category in inputs]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return results, best
+
+
+def run(vendors, count, seed, repeat):
+    from eflp_app import PARSERS
+
+    rows = []
+    mismatches = 0
+    for vendor in vendors:
+        parser = PARSERS[vendor]()
+        inputs = captured_inputs(parser, vendor, count, seed)
+        if not inputs:
+            continue
+        base_parser.PLAN_CACHES.pop(parser.VENDOR, None)
+        expected, legacy_seconds = timed(lambda *args, **kwargs: legacy_enrich_record(parser, *args, **kwargs), inputs, repeat)
+        actual, plan_seconds = timed(parser.enrich_record, inputs, repeat)
+        mismatches += sum(1 for left, right in zip(expected, actual) if left.to_dict() != right.to_dict())
+        records = len(inputs)
+        rows.append([
+            vendor,
+            f"{records:,}",
+            f"{len(base_parser.PLAN_CACHES.get(parser.VENDOR, ())):,}",
+            f"{legacy_seconds / records * 1e6:.2f}",
+            f"{plan_seconds / records * 1e6:.2f}",
+            f"{legacy_seconds / plan_seconds:.2f}x",
+        ])
+    print(f"{count:,} lines per vendor, enrich_record only; mismatches: {mismatches}")
+    print_table(["vendor", "records", "cached plans", "legacy us/rec", "plan us/rec", "speedup"], rows)
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="enrich_record with and without cached extraction plans.")
+    parser.add_argument("--lines", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--repeat", type=int, default=3, help="best of this many passes")
+    parser.add_argument("--vendor", action="append", choices=sorted(VENDOR_LINE))
+    args = parser.parse_args()
+    if run(args.vendor or sorted(VENDOR_LINE), args.lines, args.seed, args.repeat):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks import print_table
+
+
+# Packages that only specific pages or exports need; importing the app must
+# not pull them in.
+DEFERRED = ("pandas", "numpy", "plotly", "elasticsearch", "neo4j", "influxdb", "matplotlib")
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROBE = (
+    "import json, sys; import eflp_app; "
+    f"print(json.dumps(sorted(name for name in {DEFERRED!r} if name in sys.modules)))"
+)
+
+
+def import_once():
+    # A fresh interpreter per run, so nothing is already in sys.modules.
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=APP_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    if completed.returncode:
+        raise SystemExit(f"import eflp_app failed:\n{completed.stderr[-2000:]}")
+    # Children are printed before their parent, indented two spaces per level.
+    total = 0
+    direct = []
+    children = []
+    for row in completed.stderr.splitlines():
+        if not row.startswith("import time:") or row.count("|") != 2:
+            continue
+        _, cumulative, name = row.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            children.append((name.strip(), int(cumulative)))
+        elif depth == 0:
+            if name.strip() == "eflp_app":
+                total, direct = int(cumulative), children
+            children = []
+    return total / 1e6, direct, json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import time of eflp_app against a budget.")
+    parser.add_argument("--budget", type=float, default=0.6, help="seconds allowed for `import eflp_app`")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [import_once() for _ in range(max(1, args.repeat))]
+    seconds, direct, deferred = min(runs, key=lambda run: run[0])
+    rows = [[name, f"{micros / 1000:,.1f}"] for name, micros in sorted(direct, key=lambda item: -item[1])[:args.top]]
+    print_table(["module", "cumulative ms"], rows)
+    print(f"import eflp_app: best {seconds:.3f}s of {len(runs)}, budget {args.budget:.3f}s")
+
+    failed = False
+    if deferred:
+        print(f"FAIL: imported at load time: {', '.join(deferred)}")
+        failed = True
+    if seconds > args.budget:
+        print("FAIL: over budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import itertools
+import json
+import re
+import sys
+import time
+
+from benchmarks import print_table
+from benchmarks.synthetic import VENDOR_LINES
+from parsers.fortigate_parser import FortigateParser
+
+
+LEGACY_KV_REGEX = re.compile(
+    r'(?P<key>[A-Za-z0-9_.\-]+)\s*(?:=|:)\s*(?P<value>"[^"]*"|\'[^\']*\'|\[[^\]]*\]|[^\s,;]+)'
+)
+# Which tokenizers each vendor parser runs on its payload.
+VENDOR_CALLS = {
+    "fortigate": ("kv",),
+    "sonicwall": ("kv",),
+    "sophos_utm": ("kv", "json"),
+    "sophos_xgs": ("kv", "json"),
+    "meraki": ("json",),
+}
+
+
+def legacy_clean_value(value):
+    if isinstance(value, str):
+        return value.strip().strip('"').strip("'")
+    return value
+
+
+def legacy_parse_kv_pairs(text):
+    if not text:
+        return {}
+    pairs = {}
+    for match in LEGACY_KV_REGEX.finditer(text):
+        pairs[match.group("key").lower()] = legacy_clean_value(match.group("value"))
+    return pairs
+
+
+def legacy_parse_json_line(text):
+    try:
+        payload = json.loads(text)
+        if isinstance(payload, dict):
+            return {str(k).lower(): legacy_clean_value(v) for k, v in payload.items()}
+    except Exception:
+        return {}
+    return {}
+
+
+def tokenizers(calls, kv, js):
+    if calls == ("kv",):
+        return lambda payloads: [kv(payload) for payload in payloads]
+    if calls == ("json",):
+        return lambda payloads: [js(payload) for payload in payloads]
+    return lambda payloads: [{**kv(payload), **js(payload)} for payload in payloads]
+
+
+def timed(func, payloads):
+    started = time.perf_counter()
+    result = func(payloads)
+    return result, time.perf_counter() - started
+
+
+def run(vendors, count, chunk):
+    parser = FortigateParser()
+    rows = []
+    mismatches = 0
+    for vendor in vendors:
+        calls = VENDOR_CALLS[vendor]
+        legacy = tokenizers(calls, legacy_parse_kv_pairs, legacy_parse_json_line)
+        fast = tokenizers(calls, parser.parse_kv_pairs, parser.parse_json_line)
+        legacy_seconds = fast_seconds = 0.0
+        lines = VENDOR_LINES[vendor](count)
+        while True:
+            payloads = []
+            for line in itertools.islice(lines, chunk):
+                meta = parser.parse_syslog_prefix(line)
+                payloads.append(meta.get("payload", "") if meta else line)
+            if not payloads:
+                break
+            expected, seconds = timed(legacy, payloads)
+            legacy_seconds += seconds
+            actual, seconds = timed(fast, payloads)
+            fast_seconds += seconds
+            mismatches += sum(1 for left, right in zip(expected, actual) if left != right)
+        rows.append([
+            vendor,
+            "+".join(calls),
+            f"{count / legacy_seconds:,.0f}",
+            f"{count / fast_seconds:,.0f}",
+            f"{legacy_seconds / fast_seconds:.2f}x",
+        ])
+    print(f"{count:,} lines per vendor, tokenizer only; mismatches: {mismatches}")
+    print_table(["vendor", "tokenizers", "legacy lines/s", "fast lines/s", "speedup"], rows)
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KV/JSON payload tokenizer, legacy versus single pass.")
+    parser.add_argument("--lines", type=int, default=1000000)
+    parser.add_argument("--chunk", type=int, default=100000)
+    parser.add_argument("--vendor", action="append", choices=sorted(VENDOR_CALLS))
+    args = parser.parse_args()
+    if run(args.vendor or list(VENDOR_CALLS), args.lines, args.chunk):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+import argparse
+import time
+
+import eflp_app as app
+from benchmarks import print_table
+from benchmarks.synthetic import VENDOR_LINE, vendor_lines
+
+
+COMPARED = (
+    "timestamp", "severity", "event", "action", "outcome", "log_category", "protocol",
+    "src_ip", "dst_ip", "src_port", "dst_port", "rule", "traffic_bytes",
+)
+
+
+# The live syslog parser before parse_line: a second, vendor-agnostic field
+# extraction with per-vendor special cases, followed by enrich_record. It
+# calls the same parser helpers, so speedups in those show in both columns.
+
+def legacy_category_hint(parser, raw_fields, payload, vendor):
+    if vendor == "netscaler" and hasattr(parser, "_category_from_tag"):
+        tag = raw_fields.get("tag") or raw_fields.get("module") or raw_fields.get("event")
+        return parser._category_from_tag(tag, payload)
+
+    type_map = getattr(parser, "TYPE_TO_CATEGORY", {}) or {}
+    candidates = [
+        raw_fields.get("type"),
+        raw_fields.get("log_type"),
+        raw_fields.get("subtype"),
+        raw_fields.get("eventtype"),
+        raw_fields.get("category"),
+        raw_fields.get("cat"),
+        raw_fields.get("c"),
+        raw_fields.get("module"),
+        raw_fields.get("service"),
+    ]
+    for candidate in candidates:
+        value = str(candidate or "").strip()
+        if not value:
+            continue
+        if value in type_map:
+            return type_map[value]
+        if value.lower() in type_map:
+            return type_map[value.lower()]
+        if value.upper() in type_map:
+            return type_map[value.upper()]
+    return app.infer_log_category_from_text(f"{payload} {' '.join(str(v or '') for v in candidates)}")
+
+
+def legacy_parse_live_line(line, vendor, source_ip=""):
+    parser = app.get_parser_instance(vendor)
+    if not parser:
+        raise ValueError(f"Unsupported vendor '{vendor}'.")
+
+    text = str(line or "").strip()
+    meta = parser.parse_syslog_prefix(text) or {}
+    payload = meta.get("payload") or text
+    raw_fields = {}
+    raw_fields.update(parser.parse_kv_pairs(payload))
+    raw_fields.update(parser.parse_json_line(payload))
+
+    if vendor == "cisco_ftd" and hasattr(parser, "_parse_name_values"):
+        raw_fields.update(parser._parse_name_values(payload))
+
+    tagged = None
+    if vendor == "netscaler" and hasattr(parser, "SYSLOG_RE"):
+        tagged = parser.SYSLOG_RE.match(text)
+        if tagged:
+            raw_fields.setdefault("tag", tagged.group("tag") or "")
+            payload = tagged.group("msg") or payload
+            meta.setdefault("timestamp", tagged.group("ts") or "")
+            meta.setdefault("host", tagged.group("host") or "")
+
+    palo_fields = []
+    palo_type = ""
+    palo_subtype = ""
+    palo_src_ip = ""
+    palo_dst_ip = ""
+    palo_src_port = None
+    palo_dst_port = None
+    palo_action = ""
+    palo_rule = ""
+    palo_bytes_in = None
+    palo_bytes_out = None
+    palo_bytes_total = None
+    if vendor == "palo_alto" and hasattr(parser, "_parse_csv_fields"):
+        palo_fields = parser._parse_csv_fields(payload)
+        if palo_fields:
+            palo_type, palo_subtype = parser._extract_type_subtype(palo_fields, raw_fields)
+            palo_action = parser._extract_action(palo_fields, raw_fields, payload)
+            palo_src_ip, palo_dst_ip, palo_src_port, palo_dst_port = parser._extract_network_tuple(palo_fields, raw_fields)
+            if len(palo_fields) > 31 and palo_type == "TRAFFIC":
+                palo_rule = palo_fields[10]
+                palo_bytes_total = app.traffic_int_value(palo_fields[29])
+                palo_bytes_out = app.traffic_int_value(palo_fields[30])
+                palo_bytes_in = app.traffic_int_value(palo_fields[31])
+            if palo_type:
+                raw_fields.setdefault("type", palo_type)
+            if palo_subtype:
+                raw_fields.setdefault("subtype", palo_subtype)
+            if palo_rule:
+                raw_fields.setdefault("rule", palo_rule)
+            if palo_bytes_total is not None:
+                raw_fields.setdefault("bytes", palo_bytes_total)
+            if palo_bytes_out is not None:
+                raw_fields.setdefault("bytes_sent", palo_bytes_out)
+            if palo_bytes_in is not None:
+                raw_fields.setdefault("bytes_received", palo_bytes_in)
+
+    cisco_src_ip = ""
+    cisco_dst_ip = ""
+    cisco_src_port = None
+    cisco_dst_port = None
+    cisco_msg_id = ""
+    cisco_sev = ""
+    if vendor == "cisco_ftd" and hasattr(parser, "MSG_ID_REGEX"):
+        msg_match = parser.MSG_ID_REGEX.search(payload)
+        if msg_match:
+            cisco_msg_id = msg_match.group("msg_id") or ""
+            cisco_sev = msg_match.group("sev") or ""
+        if hasattr(parser, "_extract_asa_network_tuple"):
+            cisco_src_ip, cisco_src_port, cisco_dst_ip, cisco_dst_port = parser._extract_asa_network_tuple(payload)
+
+    received_at = app.utc_now_iso()
+    date_part = parser.dict_first(raw_fields, ["date", "logdate", "eventdate", "devdate"])
+    time_part = parser.dict_first(raw_fields, ["time", "eventtime", "devtime"])
+    compound_ts = f"{date_part} {time_part}".strip() if date_part or time_part else ""
+    category = legacy_category_hint(parser, raw_fields, payload, vendor)
+    action = parser.normalize_action(
+        parser.first_value(
+            raw_fields.get("action"),
+            raw_fields.get("act"),
+            raw_fields.get("result"),
+            raw_fields.get("status"),
+            raw_fields.get("disposition"),
+            palo_action,
+        ),
+        payload,
+    )
+    bytes_in = app.traffic_first_value({"raw_fields": raw_fields}, app.TRAFFIC_IN_BYTE_FIELDS)
+    bytes_out = app.traffic_first_value({"raw_fields": raw_fields}, app.TRAFFIC_OUT_BYTE_FIELDS)
+    bytes_total = app.traffic_first_value({"raw_fields": raw_fields}, app.TRAFFIC_TOTAL_BYTE_FIELDS)
+    traffic_bytes = bytes_total if bytes_total is not None else int((bytes_in or 0) + (bytes_out or 0))
+    if traffic_bytes <= 0:
+        traffic_bytes = app.traffic_amount_from_text(payload, text) or 0
+
+    record = {
+        "vendor": vendor,
+        "timestamp": parser.first_value(
+            raw_fields.get("@timestamp"),
+            raw_fields.get("timestamp"),
+            raw_fields.get("event_time"),
+            raw_fields.get("generated_time"),
+            raw_fields.get("receive_time"),
+            raw_fields.get("eventtime"),
+            compound_ts,
+            meta.get("timestamp"),
+            received_at,
+        ),
+        "received_at": received_at,
+        "ingestion_mode": "syslog",
+        "ingest_source": source_ip,
+        "host": parser.first_value(
+            meta.get("host"),
+            raw_fields.get("host"),
+            raw_fields.get("hostname"),
+            raw_fields.get("device"),
+            raw_fields.get("devname"),
+        ),
+        "severity": parser.first_value(
+            raw_fields.get("severity"),
+            raw_fields.get("level"),
+            raw_fields.get("risk"),
+            raw_fields.get("priority"),
+            raw_fields.get("pri"),
+            cisco_sev,
+            meta.get("priority"),
+        ),
+        "message": parser.first_value(
+            raw_fields.get("msg"),
+            raw_fields.get("message"),
+            raw_fields.get("description"),
+            raw_fields.get("reason"),
+            payload,
+        ),
+        "event": parser.first_value(
+            raw_fields.get("event"),
+            raw_fields.get("event_type"),
+            raw_fields.get("eventtype"),
+            raw_fields.get("subtype"),
+            raw_fields.get("log_type"),
+            raw_fields.get("signature"),
+            raw_fields.get("msgid"),
+            cisco_msg_id,
+            palo_subtype,
+            palo_type,
+        ),
+        "event_id": parser.first_value(raw_fields.get("eventid"), raw_fields.get("event_id"), raw_fields.get("id"), raw_fields.get("logid"), raw_fields.get("msgid"), cisco_msg_id),
+        "action": action,
+        "log_category": category,
+        "src_ip": parser.first_value(raw_fields.get("src_ip"), raw_fields.get("srcip"), raw_fields.get("src"), raw_fields.get("source_ip"), raw_fields.get("source"), raw_fields.get("sip"), raw_fields.get("clientip"), palo_src_ip, cisco_src_ip),
+        "dst_ip": parser.first_value(raw_fields.get("dst_ip"), raw_fields.get("dstip"), raw_fields.get("dst"), raw_fields.get("destination_ip"), raw_fields.get("destination"), raw_fields.get("dip"), raw_fields.get("serverip"), palo_dst_ip, cisco_dst_ip),
+        "src_port": parser.first_value(raw_fields.get("src_port"), raw_fields.get("srcport"), raw_fields.get("sport"), raw_fields.get("spt"), palo_src_port, cisco_src_port),
+        "dst_port": parser.first_value(raw_fields.get("dst_port"), raw_fields.get("dstport"), raw_fields.get("dport"), raw_fields.get("dpt"), palo_dst_port, cisco_dst_port),
+        "protocol": parser.first_value(raw_fields.get("protocol"), raw_fields.get("proto"), raw_fields.get("service"), raw_fields.get("transport")),
+        "rule": parser.first_value(raw_fields.get("rule"), raw_fields.get("rulename"), raw_fields.get("policy"), raw_fields.get("policyid"), raw_fields.get("policyname"), raw_fields.get("acl"), palo_rule),
+        "user": parser.first_value(raw_fields.get("user"), raw_fields.get("username"), raw_fields.get("srcuser"), raw_fields.get("dstuser"), raw_fields.get("account"), raw_fields.get("userid")),
+        "signature": parser.first_value(raw_fields.get("signature"), raw_fields.get("attack"), raw_fields.get("threat"), raw_fields.get("sig"), raw_fields.get("sig_name")),
+        "session_id": parser.first_value(raw_fields.get("session_id"), raw_fields.get("sessionid"), raw_fields.get("sid"), raw_fields.get("connid"), raw_fields.get("flowid")),
+        "bytes_in": bytes_in,
+        "bytes_out": bytes_out,
+        "bytes_total": bytes_total,
+        "traffic_bytes": traffic_bytes,
+        "raw_message": text,
+        "raw_fields": raw_fields,
+        "syslog_priority": meta.get("priority"),
+    }
+    return parser.enrich_record(record, vendor=vendor, default_category=category)
+
+
+def timed(func, lines, vendor, repeat):
+    best = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        records = [func(line, vendor, source_ip="192.0.2.1") for line in lines]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return records, best
+
+
+def changed_fields(legacy, current):
+    changes = []
+    for field in COMPARED:
+        count = sum(1 for old, new in zip(legacy, current) if str(old.get(field) or "") != str(new.get(field) or ""))
+        if count:
+            changes.append(f"{field} {count:,}")
+    return ", ".join(changes) or "none"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live syslog parsing: legacy live parser against parse_line.")
+    parser.add_argument("--lines", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--repeat", type=int, default=3, help="best of this many passes")
+    parser.add_argument("--vendor", action="append", choices=sorted(VENDOR_LINE))
+    args = parser.parse_args()
+
+    rows = []
+    for vendor in args.vendor or sorted(VENDOR_LINE):
+        lines = list(vendor_lines(vendor, args.lines, args.seed))
+        legacy, legacy_seconds = timed(legacy_parse_live_line, lines, vendor, args.repeat)
+        current, current_seconds = timed(app.parse_live_syslog_line, lines, vendor, args.repeat)
+        rows.append([
+            vendor,
+            f"{len(lines) / legacy_seconds:,.0f}",
+            f"{len(lines) / current_seconds:,.0f}",
+            f"{legacy_seconds / current_seconds:.2f}x",
+            changed_fields(legacy, current),
+        ])
+    print(f"{args.lines:,} lines per vendor")
+    print_table(["vendor", "legacy lines/s", "parse_line lines/s", "speedup", "values that differ"], rows)
+
+
+if __name__ == "__main__":
+    main()
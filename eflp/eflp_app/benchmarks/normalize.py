@@ -0,0 +1,80 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks import print_table
+from benchmarks.synthetic import VENDOR_LINE, write_corpus
+
+
+COMPARED = (
+    "timestamp", "severity", "event", "action", "outcome", "log_category", "protocol",
+    "src_ip", "dst_ip", "src_port", "dst_port", "network_type",
+)
+
+
+def parsed_frame(vendor, count, seed):
+    from eflp_app import PARSERS
+    from parsers.record import records_frame
+
+    fd, path = tempfile.mkstemp(suffix=".log", prefix=f"eflp-bench-{vendor}-")
+    os.close(fd)
+    try:
+        write_corpus(path, vendor, count, seed)
+        return records_frame(PARSERS[vendor]().parse(path))
+    finally:
+        os.remove(path)
+
+
+def timed(df, trust_parser, repeat):
+    from eflp_app import normalize_case_dataframe
+
+    best = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = normalize_case_dataframe(df, trust_parser=trust_parser)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def changed_fields(full, trusted):
+    changes = []
+    for field in COMPARED:
+        left = full[field].fillna("").astype(str)
+        right = trusted[field].fillna("").astype(str)
+        count = int(left.ne(right).sum())
+        if count:
+            changes.append(f"{field} {count:,}")
+    return ", ".join(changes) or "none"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="normalize_case_dataframe with and without trusting parser fields.")
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--repeat", type=int, default=3, help="best of this many passes")
+    parser.add_argument("--vendor", action="append", choices=sorted(VENDOR_LINE))
+    args = parser.parse_args()
+
+    rows = []
+    for vendor in args.vendor or sorted(VENDOR_LINE):
+        df = parsed_frame(vendor, args.lines, args.seed)
+        if df.empty:
+            continue
+        full, full_seconds = timed(df, False, args.repeat)
+        trusted, trusted_seconds = timed(df, True, args.repeat)
+        rows.append([
+            vendor,
+            f"{len(df):,}",
+            f"{full_seconds:.3f}",
+            f"{trusted_seconds:.3f}",
+            f"{full_seconds / trusted_seconds:.2f}x",
+            changed_fields(full, trusted),
+        ])
+    print(f"{args.lines:,} lines per vendor")
+    print_table(["vendor", "records", "full s", "trusted s", "speedup", "values changed by trusting"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+from benchmarks import best_of, print_table
+from benchmarks.synthetic import fortigate_lines
+from parsers.fortigate_parser import FortigateParser
+from parsers.record import RecordBatch
+
+
+# Uploads whose columns use only the srcip/dstip/srcport/dstport aliases must
+# normalize to the same canonical fields as ones that use src_ip/dst_ip/...
+ALIAS_CSV = "timestamp,srcip,dstip,srcport,dstport,action\n2024-01-01T00:00:00Z,10.0.0.1,10.0.0.2,51000,443,allow\n"
+ALIAS_JSON = '{"timestamp": "2024-01-01T00:00:00Z", "srcip": "10.0.0.1", "dstip": "10.0.0.2", "srcport": 51000, "dstport": 443, "action": "allow"}'
+ALIAS_EXPECTED = {"src_ip": "10.0.0.1", "dst_ip": "10.0.0.2", "src_port": 51000, "dst_port": 443}
+# A CSV carrying only its own header columns (no network_type, vendor, ...)
+# must normalize exactly as the pre-RecordBatch dict path did.
+HEADER_CSV = (
+    "timestamp,severity,message,src_ip,dst_ip,action,user\n"
+    "2024-01-01 00:00:00,HIGH,vpn tunnel up for alice,10.0.0.1,10.0.0.2,allow,alice\n"
+    "2024-01-01 00:01:00,LOW,disk check,10.0.0.3,,deny,\n"
+)
+HEADER_EXPECTED = [
+    {"network_type": "sslvpn", "severity": "HIGH", "action": "allow", "outcome": "allowed", "log_category": "vpn", "user": "alice", "src_ip": "10.0.0.1", "dst_ip": "10.0.0.2", "event": "unknown"},
+    {"network_type": "unknown", "severity": "LOW", "action": "deny", "outcome": "blocked", "log_category": "unknown", "user": "", "src_ip": "10.0.0.3", "dst_ip": "", "event": "unknown"},
+]
+
+
+def check_aliases():
+    from eflp_app import normalize_case_dataframe, parse_uploaded_file
+
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as fh:
+        fh.write(ALIAS_CSV)
+        path = fh.name
+    try:
+        batches = {
+            "csv": parse_uploaded_file(path, "fortigate"),
+            "json": RecordBatch.from_records([json.loads(ALIAS_JSON)]),
+        }
+    finally:
+        os.remove(path)
+    failed = []
+    for source, batch in batches.items():
+        row = normalize_case_dataframe(batch.to_frame()).iloc[0]
+        got = {field: row[field] for field in ALIAS_EXPECTED}
+        got = {field: int(value) if field.endswith("_port") and value not in (None, "") else value for field, value in got.items()}
+        if got != ALIAS_EXPECTED:
+            failed.append(f"{source}: {got}")
+    return failed
+
+
+def normalized_csv(text):
+    from eflp_app import normalize_case_dataframe, parse_uploaded_file
+
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as fh:
+        fh.write(text)
+        path = fh.name
+    try:
+        return normalize_case_dataframe(parse_uploaded_file(path, "fortigate").to_frame())
+    finally:
+        os.remove(path)
+
+
+def check_header_csv():
+    frame = normalized_csv(HEADER_CSV)
+    failed = []
+    for index, expected in enumerate(HEADER_EXPECTED):
+        row = frame.iloc[index]
+        got = {field: row[field] for field in expected}
+        if got != expected:
+            failed.append(f"row {index}: {got}")
+    try:
+        rows = len(normalized_csv(HEADER_CSV.splitlines()[0] + "\n"))
+    except Exception as exc:
+        failed.append(f"header without rows: {exc!r}")
+    else:
+        if rows:
+            failed.append(f"header without rows: {rows} rows")
+    return failed
+
+
+def run(count, repeat):
+    with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as fh:
+        fh.write("\n".join(fortigate_lines(count)) + "\n")
+        path = fh.name
+    try:
+        batch = FortigateParser().parse(path)
+    finally:
+        os.remove(path)
+    rows = [record.to_dict() for record in batch]
+    results = [
+        ["pd.DataFrame(list of dicts)", best_of(lambda: pd.DataFrame(rows), repeat)],
+        ["RecordBatch.to_frame()", best_of(batch.to_frame, repeat)],
+        ["RecordBatch.from_records(dicts)", best_of(lambda: RecordBatch.from_records(rows), repeat)],
+        ["RecordBatch slice (half)", best_of(lambda: batch[:count // 2], repeat)],
+    ]
+    print(f"{count} FortiGate traffic records, best of {repeat}")
+    print_table(["operation", "ms"], [[label, f"{seconds * 1000:.1f}"] for label, seconds in results])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DataFrame construction from row dicts versus a RecordBatch.")
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    failed = check_aliases()
+    if failed:
+        print("FAIL: alias-only uploads lost fields: " + "; ".join(failed))
+        sys.exit(1)
+    failed = check_header_csv()
+    if failed:
+        print("FAIL: CSV upload differs from the dict path: " + "; ".join(failed))
+        sys.exit(1)
+    run(args.records, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import json_codec
+from benchmarks import best_of, print_table
+from benchmarks.synthetic import fortigate_lines
+from parsers.fortigate_parser import FortigateParser
+from parsers.record import NormalizedRecord
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    records = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return records, size
+
+
+def check_keys():
+    # Rows read back from a parsed batch must carry the same keys, None
+    # values included, as the record parse_line() returns for the line.
+    line = next(fortigate_lines(1))
+    parser = FortigateParser()
+    expected = dict(parser.parse_line(line))
+    with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as fh:
+        fh.write(line + "\n")
+        path = fh.name
+    try:
+        row = dict(parser.parse(path)[0])
+    finally:
+        os.remove(path)
+    return sorted(set(expected) ^ set(row))
+
+
+def run(count, repeat):
+    with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as fh:
+        fh.write("\n".join(fortigate_lines(count)) + "\n")
+        path = fh.name
+    try:
+        parsed = FortigateParser().parse(path)
+    finally:
+        os.remove(path)
+    lines = [json_codec.dump_line(record) for record in parsed]
+    rows = []
+
+    def add(label, build):
+        records, size = measure(build)
+        seconds = best_of(build, repeat)
+        rows.append([label, f"{size / len(records):,.0f}", f"{size / 1024 / 1024:,.1f}", f"{seconds * 1e6 / len(records):.2f}"])
+
+    add("dict (legacy cache)", lambda: [json_codec.loads(line) for line in lines])
+    add("NormalizedRecord", lambda: [NormalizedRecord.from_dict(json_codec.loads(line)) for line in lines])
+    print(f"{count} FortiGate traffic records loaded from JSONL, best of {repeat}")
+    print_table(["representation", "bytes/record", "MiB", "us/record"], rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-record memory of cached case data.")
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    differing = check_keys()
+    if differing:
+        print("FAIL: batch rows differ from parse_line() in keys: " + ", ".join(differing))
+        sys.exit(1)
+    run(args.records, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
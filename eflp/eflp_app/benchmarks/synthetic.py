@@ -0,0 +1,433 @@
+import json
+import random
+
+
+# Share of each kind of event in a generated corpus; every vendor generator
+# renders all five in the formats its parser reads.
+KINDS = ("traffic", "threat", "auth", "vpn", "system")
+KIND_WEIGHTS = (70, 12, 8, 5, 5)
+USERS = 500
+RULES = 40
+
+
+def random_ip(rng, prefix="10"):
+    if prefix == "10":
+        return f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+    return f"{prefix}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+
+
+def syslog_stamp(number):
+    return f"Mar {1 + number % 28:2d} {number % 24:02d}:{number % 60:02d}:{(number * 7) % 60:02d}"
+
+
+def iso_stamp(number):
+    return f"2024-03-{1 + number % 28:02d}T{number % 24:02d}:{number % 60:02d}:{(number * 7) % 60:02d}"
+
+
+def flow(rng):
+    return {
+        "src": random_ip(rng),
+        "dst": random_ip(rng, "172.16"),
+        "sport": rng.randint(1024, 65535),
+        "dport": rng.choice([22, 53, 80, 443, 3389]),
+        "user": f"user{rng.randint(1, USERS)}",
+        "rule": rng.randint(1, RULES),
+        "bytes": rng.randint(60, 90000),
+    }
+
+
+def palo_alto_line(rng, number, kind):
+    f = flow(rng)
+    when = f"2024/03/{1 + number % 28:02d} {number % 24:02d}:{number % 60:02d}:00"
+    head = f"<14>{syslog_stamp(number)} PA-3220 1,{when},013201001234"
+    if kind == "traffic":
+        action = rng.choice(["allow", "allow", "deny", "drop"])
+        return (
+            f"{head},TRAFFIC,end,2560,{when},{f['src']},{f['dst']},0.0.0.0,0.0.0.0,rule-{f['rule']},corp\\{f['user']},,ssl,"
+            f"vsys1,trust,untrust,ethernet1/1,ethernet1/2,Forward,{when},{number},1,{f['sport']},{f['dport']},0,0,0x0,tcp,"
+            f"{action},{f['bytes']},{f['bytes'] // 2},{f['bytes'] // 2},12,{when},30,any,0,{number},0x0,10.0.0.0-10.255.255.255,US"
+        )
+    if kind == "threat":
+        return (
+            f"{head},THREAT,vulnerability,2560,{when},{f['src']},{f['dst']},0.0.0.0,0.0.0.0,rule-{f['rule']},corp\\{f['user']},,"
+            f"web-browsing,vsys1,trust,untrust,ethernet1/1,ethernet1/2,Forward,{when},{number},1,{f['sport']},{f['dport']},0,0,"
+            f"0x0,tcp,reset-both,\"HTTP SQL Injection Attempt(38195)\",any,critical,client-to-server"
+        )
+    if kind == "auth":
+        return (
+            f"{head},AUTHENTICATION,0,2560,{when},vsys1,{f['src']},corp\\{f['user']},,"
+            f"{rng.choice(['auth-success', 'auth-fail'])},radius,GP-portal,{number}"
+        )
+    if kind == "vpn":
+        return (
+            f"{head},GLOBALPROTECT,0,2560,{when},vsys1,gateway-auth,login,{f['user']},{f['src']},US,"
+            f"{rng.choice(['success', 'failure'])},GP-gateway,{number}"
+        )
+    return f"{head},SYSTEM,general,2560,{when},,general,,0,0,general,informational,\"Commit job succeeded\",{number}"
+
+
+def fortigate_line(rng, number, kind):
+    f = flow(rng)
+    head = (
+        f"<189>date=2024-03-{1 + number % 28:02d} time={number % 24:02d}:{number % 60:02d}:{(number * 7) % 60:02d} "
+        f"devname=FGT60F devid=FGT60FTK2009"
+    )
+    if kind == "traffic":
+        return (
+            f"{head} logid=0000000013 type=traffic subtype=forward level=notice vd=root srcip={f['src']} "
+            f"srcport={f['sport']} srcintf=port1 dstip={f['dst']} dstport={f['dport']} dstintf=wan1 "
+            f"sessionid={number} proto=6 action={rng.choice(['accept', 'deny', 'close', 'timeout'])} "
+            f"policyid={f['rule']} service=HTTPS sentbyte={f['bytes']} rcvdbyte={f['bytes'] // 3} sentpkt=4 rcvdpkt=3 "
+            f"user={f['user']} msg=\"session close\""
+        )
+    if kind == "threat":
+        return (
+            f"{head} logid=0419016384 type=utm subtype=ips eventtype=signature level=alert vd=root severity=high "
+            f"srcip={f['src']} dstip={f['dst']} srcport={f['sport']} dstport={f['dport']} sessionid={number} "
+            f"action=dropped proto=6 service=HTTP policyid={f['rule']} attack=\"Apache.Log4j.Error.Log.Remote.Code.Execution\" "
+            f"msg=\"applications3: Apache.Log4j.Error.Log.Remote.Code.Execution\""
+        )
+    if kind == "auth":
+        return (
+            f"{head} logid=0100032002 type=event subtype=system level=alert vd=root logdesc=\"Admin login failed\" "
+            f"sn=0 user=\"{f['user']}\" ui=https({f['src']}) method=https srcip={f['src']} dstip=10.0.0.1 "
+            f"action=login status=failed reason=passwd_invalid msg=\"Administrator {f['user']} login failed\""
+        )
+    if kind == "vpn":
+        return (
+            f"{head} logid=0101039424 type=event subtype=vpn level=information vd=root logdesc=\"SSL VPN tunnel up\" "
+            f"action=tunnel-up tunneltype=ssl-tunnel tunnelid={number} remip={f['src']} user=\"{f['user']}\" "
+            f"group=\"vpn-users\" reason=\"tunnel established\" msg=\"SSL tunnel established\""
+        )
+    return (
+        f"{head} logid=0100032102 type=event subtype=system level=information vd=root "
+        f"logdesc=\"Configuration changed\" user=\"admin\" ui=GUI action=Edit cfgpath=\"firewall.policy\" "
+        f"msg=\"Edit firewall.policy {f['rule']}\""
+    )
+
+
+def sonicwall_line(rng, number, kind):
+    f = flow(rng)
+    head = (
+        f"<134>{syslog_stamp(number)} sonicwall-tz id=firewall sn=0040103D5F0A "
+        f"time=\"2024-03-{1 + number % 28:02d} {number % 24:02d}:{number % 60:02d}:00\" fw=203.0.113.1"
+    )
+    endpoints = f"src={f['src']}:{f['sport']}:X0 dst={f['dst']}:{f['dport']}:X1"
+    if kind == "traffic":
+        return (
+            f"{head} pri=6 c=262144 m=98 msg=\"Connection {rng.choice(['Opened', 'Closed', 'Dropped'])}\" "
+            f"cat=\"Firewall\" n={number} {endpoints} proto=tcp/https sent={f['bytes']} rcvd={f['bytes'] // 2} "
+            f"usr=\"{f['user']}\" fw_action=\"{rng.choice(['forward', 'drop'])}\""
+        )
+    if kind == "threat":
+        return (
+            f"{head} pri=1 c=32 m=608 msg=\"IPS Detection Alert: WEB-ATTACKS SQL injection\" cat=\"IPS\" "
+            f"sid=1789 ipscat=WEB-ATTACKS ipspri=1 n={number} {endpoints} proto=tcp/http fw_action=\"drop\""
+        )
+    if kind == "auth":
+        return (
+            f"{head} pri=5 c=0 m=24 msg=\"User login failed\" cat=\"Auth\" n={number} {endpoints} "
+            f"usr=\"{f['user']}\" result=failure"
+        )
+    if kind == "vpn":
+        return (
+            f"{head} pri=6 c=16 m=1080 msg=\"SSL VPN zone remote user login allowed\" cat=\"VPN\" n={number} "
+            f"{endpoints} usr=\"{f['user']}\" proto=tcp/https fw_action=\"forward\""
+        )
+    return f"{head} pri=6 c=16 m=1154 msg=\"Configuration saved\" cat=\"System\" n={number} usr=\"admin\""
+
+
+def cisco_ftd_line(rng, number, kind):
+    f = flow(rng)
+    head = f"<166>{syslog_stamp(number)} ftd01"
+    if kind == "traffic":
+        verb = rng.choice(["Deny", "Built outbound"])
+        if verb == "Deny":
+            return (
+                f"{head} %FTD-4-106023: Deny tcp src inside:{f['src']}/{f['sport']} dst outside:{f['dst']}/{f['dport']} "
+                f"by access-group \"CSM_FW_ACL_\" [0x97aa021a, 0x0]"
+            )
+        return (
+            f"{head} %FTD-6-302013: Built outbound TCP connection {number} for outside:{f['dst']}/{f['dport']} "
+            f"({f['dst']}/{f['dport']}) to inside:{f['src']}/{f['sport']} ({f['src']}/{f['sport']})"
+        )
+    if kind == "threat":
+        return (
+            f"{head} %FTD-1-430001: DeviceUUID: 9a0c-11ee, InstanceID: 1, SrcIP: {f['src']}, DstIP: {f['dst']}, "
+            f"SrcPort: {f['sport']}, DstPort: {f['dport']}, Protocol: tcp, IngressInterface: inside, "
+            f"EgressInterface: outside, Priority: 1, GID: 1, SID: 49711, Revision: 3, Classification: Attempted Admin, "
+            f"Message: SERVER-WEBAPP Log4j remote code execution attempt, AccessControlRuleAction: Block"
+        )
+    if kind == "auth":
+        return (
+            f"{head} %FTD-6-113005: AAA user authentication Rejected : reason = AAA failure : server = 10.0.0.5 : "
+            f"user = {f['user']} : user IP = {f['src']}"
+        )
+    if kind == "vpn":
+        return (
+            f"{head} %FTD-4-722051: Group <RA-VPN> User <{f['user']}> IP <{f['src']}> IPv4 Address <192.168.50.{number % 250 + 1}> "
+            f"assigned to session"
+        )
+    return f"{head} %FTD-5-111008: User 'admin' executed the 'write memory' command."
+
+
+def checkpoint_line(rng, number, kind):
+    f = flow(rng)
+    if kind == "threat":
+        return (
+            f"LEEF:2.0|Check Point|VPN-1 & FireWall-1|Check Point|Prevent|cat=IPS\tdevTime={1709280000 + number}\t"
+            f"src={f['src']}\tdst={f['dst']}\tsrcPort={f['sport']}\tdstPort={f['dport']}\tproto=tcp\taction=Prevent\t"
+            f"attack=Log4j Remote Code Execution\tseverity=Critical\torigin=gw01\tuser={f['user']}"
+        )
+    head = f"<134>1 {iso_stamp(number)}Z gw01 CheckPoint 2390 - [action:\"{{action}}\"; "
+    if kind == "traffic":
+        action = rng.choice(["Accept", "Drop", "Reject"])
+        return (
+            f"<134>{syslog_stamp(number)} gw01 time={1709280000 + number}; action={action}; origin=gw01; "
+            f"product=VPN-1 & FireWall-1; src={f['src']}; dst={f['dst']}; s_port={f['sport']}; service={f['dport']}; "
+            f"proto=6; rule_name=rule-{f['rule']}; layer_name=Network; sid={number}; user={f['user']}"
+        )
+    if kind == "auth":
+        return head.format(action=rng.choice(["Log In", "Failed Log In"])) + (
+            f"product:\"Identity Awareness\"; src:\"{f['src']}\"; src_user_name:\"{f['user']}\"; auth_method:\"Kerberos\"]"
+        )
+    if kind == "vpn":
+        return head.format(action="Key Install") + (
+            f"product:\"VPN-1 & FireWall-1\"; src:\"{f['src']}\"; dst:\"{f['dst']}\"; scheme:\"IKE\"; "
+            f"vpn_feature_name:\"IKE\"; user:\"{f['user']}\"]"
+        )
+    return head.format(action="Update") + "product:\"SmartConsole\"; administrator:\"admin\"; operation:\"Install Policy\"]"
+
+
+def meraki_line(rng, number, kind):
+    f = flow(rng)
+    if kind == "traffic" and number % 2:
+        return (
+            f"<134>1 {1709280000 + number}.000000000 MX84 flows {rng.choice(['allow', 'deny'])} src={f['src']} "
+            f"dst={f['dst']} mac=00:18:0A:{number % 99:02d}:00:01 protocol=tcp sport={f['sport']} dport={f['dport']}"
+        )
+    event = {
+        "traffic": "flows",
+        "threat": "ids-alerted",
+        "auth": "8021x_auth",
+        "vpn": "vpn_connectivity_change",
+        "system": "settings_changed",
+    }[kind]
+    return json.dumps({
+        "occurredAt": f"{iso_stamp(number)}Z",
+        "networkId": "N_24329156",
+        "type": event,
+        "description": f"{event} event",
+        "deviceSerial": "Q2XX-ABCD-1234",
+        "src": f"{f['src']}:{f['sport']}",
+        "dst": f"{f['dst']}:{f['dport']}",
+        "protocol": "tcp",
+        "user": f["user"],
+        "action": "deny" if kind == "threat" else rng.choice(["allow", "deny"]),
+    })
+
+
+def unifi_line(rng, number, kind):
+    f = flow(rng)
+    head = f"<30>{syslog_stamp(number)} UDM-Pro"
+    if kind in ("traffic", "threat"):
+        action = "D" if kind == "threat" or number % 3 == 0 else "A"
+        return (
+            f"{head} kernel: [WAN_IN-{f['rule']}-{action}]IN=eth8 OUT=br0 MAC=74:ac:b9:00:00:01 SRC={f['src']} "
+            f"DST={f['dst']} LEN=52 TOS=0x00 PREC=0x00 TTL=63 ID={number % 65535} DF PROTO=TCP SPT={f['sport']} "
+            f"DPT={f['dport']} WINDOW=64240 RES=0x00 SYN URGP=0"
+        )
+    if kind == "auth":
+        return f"{head} hostapd: event=auth_failed user={f['user']} src={f['src']} ssid=corp result=failure"
+    if kind == "vpn":
+        return f"{head} charon: event=vpn_connect user={f['user']} src={f['src']} dst={f['dst']} result=success"
+    return f"{head} unifi: event=system_update subsystem=system msg=\"Firmware check completed\""
+
+
+def juniper_line(rng, number, kind):
+    f = flow(rng)
+    head = f"<14>{syslog_stamp(number)} srx01"
+    tuple_ = f"{f['src']}/{f['sport']}->{f['dst']}/{f['dport']}"
+    if kind == "traffic":
+        tag = rng.choice(["RT_FLOW_SESSION_CREATE", "RT_FLOW_SESSION_CLOSE", "RT_FLOW_SESSION_DENY"])
+        return (
+            f"{head} RT_FLOW: {tag}: session {tuple_} 0x0 junos-https {tuple_} 0x0 N/A N/A N/A N/A 6 "
+            f"policy=rule-{f['rule']} trust untrust sessionid={number} bytes={f['bytes']} user={f['user']}"
+        )
+    if kind == "threat":
+        return (
+            f"{head} RT_IDP: IDP_ATTACK_LOG_EVENT: IDP: at {1709280000 + number}, ANOMALY Attack log <{tuple_}> "
+            f"attack=HTTP:SQL:INJ:GENERIC action=DROP severity=critical"
+        )
+    if kind == "auth":
+        return f"{head} UI_AUTH_EVENT: Authenticated user '{f['user']}' at permission level 'j-operator' src={f['src']}"
+    if kind == "vpn":
+        return f"{head} KMD: KMD_VPN_UP_ALERT: VPN to-branch from {f['dst']} is up. local-ip={f['src']} gateway=branch"
+    return f"{head} CHASSISD: CHASSISD_SNMP_TRAP7: SNMP trap generated: Fan/Blower OK (jnxFruName Fan Tray 0)"
+
+
+def watchguard_line(rng, number, kind):
+    f = flow(rng)
+    head = f"<142>{syslog_stamp(number)} FireboxV ({iso_stamp(number)})"
+    if kind == "traffic":
+        action = rng.choice(["Allow", "Deny"])
+        return (
+            f"{head} firewall: msg_id=\"3000-0148\" {action} 1-Trusted 0-External 52 tcp 20 128 {f['src']} {f['dst']} "
+            f"{f['sport']} {f['dport']} offset 8 S 123456 win 64240 policy=\"Allow-Out-{f['rule']}\" "
+            f"sessionid={number} src_user=\"{f['user']}\""
+        )
+    if kind == "threat":
+        return (
+            f"{head} http-proxy[2200]: msg_id=\"1AFF-0020\" Deny 1-Trusted 0-External tcp {f['src']} {f['dst']} "
+            f"{f['sport']} {f['dport']} msg=\"IPS detected\" signature_name=\"WEB SQL Injection\" severity=\"5\" "
+            f"policy=\"HTTP-proxy-00\""
+        )
+    if kind == "auth":
+        return (
+            f"{head} admd[1311]: msg_id=\"3E00-0002\" Authentication of Firebox-DB user [{f['user']}] from "
+            f"{f['src']} was rejected, password is incorrect"
+        )
+    if kind == "vpn":
+        return f"{head} iked[1311]: msg_id=\"0207-0001\" IKE Phase-2 negotiation with peer {f['dst']} succeeded user={f['user']}"
+    return f"{head} sysd[1010]: msg_id=\"3D01-0001\" System configuration saved by admin"
+
+
+def sophos_utm_line(rng, number, kind):
+    f = flow(rng)
+    head = f"<30>{syslog_stamp(number)} utm-fw"
+    if kind == "traffic":
+        return (
+            f"{head} ulogd[4121]: sophosutm: id=\"2001\" severity=\"info\" sys=\"SecureNet\" sub=\"packetfilter\" "
+            f"name=\"Packet dropped\" action=\"{rng.choice(['drop', 'accept'])}\" fwrule=\"{f['rule']}\" initf=\"eth0\" "
+            f"srcmac=\"00:1a:8c:{number % 90 + 10}:0b:2c\" srcip=\"{f['src']}\" dstip=\"{f['dst']}\" proto=\"6\" "
+            f"length=\"52\" tos=\"0x00\" prec=\"0x00\" ttl=\"64\" srcport=\"{f['sport']}\" dstport=\"{f['dport']}\" "
+            f"tcpflags=\"SYN\" type=\"firewall\""
+        )
+    if kind == "threat":
+        return (
+            f"{head} snort[2133]: sophosutm: id=\"2101\" severity=\"warn\" sys=\"SecureNet\" sub=\"ips\" "
+            f"name=\"Intrusion protection alert\" action=\"drop\" reason=\"SQL injection attempt\" group=\"410\" "
+            f"srcip=\"{f['src']}\" dstip=\"{f['dst']}\" proto=\"6\" srcport=\"{f['sport']}\" dstport=\"{f['dport']}\" "
+            f"sid=\"19439\" class=\"Web Application Attack\" priority=\"1\" type=\"ips\""
+        )
+    if kind == "auth":
+        return (
+            f"{head} aua[5120]: sophosutm: id=\"3005\" severity=\"warn\" sys=\"System\" sub=\"auth\" "
+            f"name=\"Authentication failed\" srcip=\"{f['src']}\" user=\"{f['user']}\" caller=\"webadmin\" "
+            f"reason=\"DENIED\" type=\"auth\""
+        )
+    if kind == "vpn":
+        return (
+            f"{head} openvpn[9012]: sophosutm: id=\"2201\" severity=\"info\" sys=\"SecureNet\" sub=\"vpn\" "
+            f"event=\"Connection started\" username=\"{f['user']}\" variant=\"ssl\" srcip=\"{f['src']}\" "
+            f"virtual_ip=\"10.242.2.{number % 250 + 1}\" type=\"vpn\""
+        )
+    return f"{head} system: sophosutm: {{\"id\": \"1001\", \"severity\": \"info\", \"sys\": \"System\", \"type\": \"system\", \"msg\": \"HA sync completed\"}}"
+
+
+def sophos_xgs_line(rng, number, kind):
+    f = flow(rng)
+    head = (
+        f"<30>{syslog_stamp(number)} xgs-fw sophosxgs: device_name=\"SFW\" "
+        f"timestamp=\"{iso_stamp(number)}+0000\" log_id={10000000 + number % 89999999}"
+    )
+    if kind == "traffic":
+        return (
+            f"{head} log_type=\"Firewall\" log_component=\"Firewall Rule\" "
+            f"log_subtype=\"{rng.choice(['Allowed', 'Denied'])}\" status=\"{rng.choice(['Allow', 'Deny'])}\" "
+            f"priority=Information user_name=\"{f['user']}\" fw_rule_id={f['rule']} src_ip={f['src']} "
+            f"dst_ip={f['dst']} protocol=\"TCP\" src_port={f['sport']} dst_port={f['dport']} "
+            f"sent_bytes={f['bytes']} recv_bytes={f['bytes'] // 2} src_zone=\"LAN\" dst_zone=\"WAN\" message=\"\""
+        )
+    if kind == "threat":
+        return (
+            f"{head} log_type=\"IDP\" log_component=\"Signatures\" log_subtype=\"Drop\" priority=Critical "
+            f"idp_policy_id=1 fw_rule_id={f['rule']} signature_id=58722 signature_msg=\"SERVER-WEBAPP SQL injection\" "
+            f"classification=\"Web Application Attack\" src_ip={f['src']} dst_ip={f['dst']} protocol=\"TCP\" "
+            f"src_port={f['sport']} dst_port={f['dport']} action=\"drop\""
+        )
+    if kind == "auth":
+        return (
+            f"{head} log_type=\"Event\" log_component=\"Firewall Authentication\" log_subtype=\"Authentication\" "
+            f"status=\"Failed\" priority=Information user_name=\"{f['user']}\" src_ip={f['src']} "
+            f"auth_client=\"Web Client\" auth_mechanism=\"Local\" reason=\"Wrong credentials\""
+        )
+    if kind == "vpn":
+        return (
+            f"{head} log_type=\"Event\" log_component=\"SSL VPN\" log_subtype=\"System\" status=\"Successful\" "
+            f"priority=Information user_name=\"{f['user']}\" src_ip={f['src']} message=\"User logged in\""
+        )
+    return (
+        f"{head} log_type=\"Event\" log_component=\"Appliance\" log_subtype=\"System\" priority=Notice "
+        f"message=\"Configuration backup completed\""
+    )
+
+
+def netscaler_line(rng, number, kind):
+    f = flow(rng)
+    head = f"{syslog_stamp(number)} ns01"
+    if kind == "traffic":
+        return (
+            f"{head} TCP: CONN_TERMINATE : Source {f['src']}:{f['sport']} - Destination {f['dst']}:{f['dport']} "
+            f"src={f['src']} dst={f['dst']} sport={f['sport']} dport={f['dport']} proto=tcp bytes={f['bytes']} "
+            f"action={rng.choice(['allow', 'reset'])} sessionid={number}"
+        )
+    if kind == "threat":
+        return (
+            f"{head} APPFW: APPFW_SQL : {f['src']} -> {f['dst']} profile=appfw_prof_web "
+            f"signature=\"SQL injection check failed\" action=blocked severity=alert sessionid={number}"
+        )
+    if kind == "auth":
+        return (
+            f"{head} AAA: LOGIN_FAILED : User {f['user']} - Client_ip {f['src']} user={f['user']} "
+            f"clientip={f['src']} result=failure"
+        )
+    if kind == "vpn":
+        return (
+            f"{head} SSLVPN: LOGIN : Context {f['user']}@{f['src']} - SessionId: {number} user={f['user']} "
+            f"clientip={f['src']} action=allow"
+        )
+    return f"{head} CONFIG: CMD_EXECUTED : User nsroot - Command \"save ns config\" - Status \"Success\""
+
+
+VENDOR_LINE = {
+    "palo_alto": palo_alto_line,
+    "fortigate": fortigate_line,
+    "sonicwall": sonicwall_line,
+    "cisco_ftd": cisco_ftd_line,
+    "checkpoint": checkpoint_line,
+    "meraki": meraki_line,
+    "unifi": unifi_line,
+    "juniper": juniper_line,
+    "watchguard": watchguard_line,
+    "sophos_utm": sophos_utm_line,
+    "sophos_xgs": sophos_xgs_line,
+    "netscaler": netscaler_line,
+}
+
+
+def vendor_lines(vendor, count, seed=11, kinds=None):
+    rng = random.Random(f"{vendor}:{seed}")
+    render = VENDOR_LINE[vendor]
+    kind_rng = random.Random(seed)
+    for number in range(count):
+        kind = kinds or kind_rng.choices(KINDS, KIND_WEIGHTS)[0]
+        yield render(rng, number, kind)
+
+
+def fortigate_lines(count, seed=11):
+    return vendor_lines("fortigate", count, seed, kinds="traffic")
+
+
+def write_corpus(path, vendor, count, seed=11):
+    with open(path, "w") as fh:
+        for line in vendor_lines(vendor, count, seed):
+            fh.write(line)
+            fh.write("\n")
+    return path
+
+
+VENDOR_LINES = {
+    vendor: (lambda count, vendor=vendor: vendor_lines(vendor, count))
+    for vendor in VENDOR_LINE
+}
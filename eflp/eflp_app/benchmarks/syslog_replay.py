@@ -0,0 +1,355 @@
+import argparse
+import gzip
+import ipaddress
+import itertools
+import json
+import math
+import os
+import socket
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib import request as urllib_request
+
+from benchmarks import print_table
+from benchmarks.synthetic import VENDOR_LINE, vendor_lines
+
+
+SHAPES = ("steady", "burst", "ramp")
+MAX_SOURCE_ADDRESSES = 1024
+
+
+def load_lines(paths, vendor, pool, seed):
+    if not paths:
+        return list(vendor_lines(vendor, pool, seed))
+    lines = []
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8", errors="replace") as fh:
+            lines.extend(line.rstrip("\r\n") for line in fh if line.strip())
+    if not lines:
+        raise SystemExit("No log lines found in the given files.")
+    return lines
+
+
+def source_addresses(values):
+    addresses = []
+    for value in values or []:
+        network = ipaddress.ip_network(value, strict=False)
+        hosts = [network.network_address] if network.num_addresses == 1 else network.hosts()
+        addresses.extend(str(host) for host in itertools.islice(hosts, MAX_SOURCE_ADDRESSES))
+    return addresses[:MAX_SOURCE_ADDRESSES]
+
+
+def open_sockets(addresses):
+    if not addresses:
+        return [socket.socket(socket.AF_INET, socket.SOCK_DGRAM)]
+    sockets = []
+    for address in addresses:
+        family = socket.AF_INET6 if ":" in address else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_DGRAM)
+        try:
+            sock.bind((address, 0))
+        except OSError as exc:
+            sock.close()
+            raise SystemExit(
+                f"Cannot send from {address}: {exc}. Add it as a loopback alias "
+                f"(ip addr add {address}/32 dev lo) or run inside a network namespace that owns it."
+            )
+        sockets.append(sock)
+    return sockets
+
+
+def due_time(shape, number, rate, duration, burst_size):
+    # Seconds after the step start at which datagram `number` of this sender goes out.
+    if shape == "burst":
+        return (number // burst_size) * burst_size / rate
+    if shape == "ramp":
+        # Rate climbs linearly from zero to `rate` over the step.
+        return math.sqrt(2.0 * duration * number / rate)
+    return number / rate
+
+
+class Sender(threading.Thread):
+    def __init__(self, target, sockets, lines, offset, rate, duration, shape, burst_size, lines_per_datagram):
+        super().__init__(daemon=True)
+        self.target = target
+        self.sockets = sockets
+        self.lines = lines
+        self.offset = offset
+        self.rate = rate
+        self.duration = duration
+        self.shape = shape
+        self.burst_size = burst_size
+        self.lines_per_datagram = lines_per_datagram
+        self.sent = 0
+        self.errors = 0
+
+    def run(self):
+        lines = self.lines
+        per_datagram = self.lines_per_datagram
+        datagram_rate = self.rate / per_datagram
+        position = self.offset
+        started = time.monotonic()
+        for number in itertools.count():
+            due = due_time(self.shape, number, datagram_rate, self.duration, self.burst_size)
+            if due >= self.duration:
+                break
+            wait = started + due - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            batch = [lines[(position + index) % len(lines)] for index in range(per_datagram)]
+            position += per_datagram
+            sock = self.sockets[number % len(self.sockets)]
+            try:
+                sock.sendto("\n".join(batch).encode("utf-8"), self.target)
+                self.sent += per_datagram
+            except OSError:
+                self.errors += per_datagram
+
+
+def kernel_udp_drops(port):
+    # Per-socket drop counter of the listener (last column of /proc/net/udp),
+    # plus the host-wide receive buffer errors. Only visible when the listener
+    # runs in this host or network namespace.
+    drops = None
+    for table in ("/proc/net/udp", "/proc/net/udp6"):
+        try:
+            with open(table) as fh:
+                next(fh)
+                for row in fh:
+                    fields = row.split()
+                    if int(fields[1].rsplit(":", 1)[1], 16) == port:
+                        drops = (drops or 0) + int(fields[-1])
+        except (OSError, ValueError, IndexError, StopIteration):
+            continue
+    buffer_errors = None
+    try:
+        with open("/proc/net/snmp") as fh:
+            rows = [row.split() for row in fh if row.startswith("Udp:")]
+        if len(rows) >= 2:
+            buffer_errors = int(dict(zip(rows[0][1:], rows[1][1:])).get("RcvbufErrors", 0))
+    except (OSError, ValueError):
+        pass
+    return drops, buffer_errors
+
+
+def delta(after, before):
+    if after is None or before is None:
+        return None
+    return after - before
+
+
+def parse_received_at(value):
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class DashboardPoller(threading.Thread):
+    # Polls /api/case/<id>/live_summary and records, for each recent record
+    # seen for the first time, how long after its `received_at` the response
+    # that contained it was complete.
+    def __init__(self, base_url, case_id, interval, limit):
+        super().__init__(daemon=True)
+        self.url = f"{base_url.rstrip('/')}/api/case/{case_id}/live_summary?limit={limit}"
+        self.interval = interval
+        self.seen = set()
+        self.latencies = []
+        self.errors = 0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def fetch(self):
+        with urllib_request.urlopen(self.url, timeout=30) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def poll(self):
+        try:
+            summary = self.fetch()
+        except Exception:
+            self.errors += 1
+            return None
+        completed = time.time()
+        with self.lock:
+            # `recent` is a sliding window, so a record missing from the
+            # previous response has not been seen before.
+            keys = set()
+            for record in summary.get("recent") or []:
+                key = (record.get("received_at"), record.get("ingest_source"), record.get("message"))
+                keys.add(key)
+                if key in self.seen:
+                    continue
+                received = parse_received_at(record.get("received_at"))
+                if received is not None:
+                    self.latencies.append(completed - received)
+            self.seen = keys
+        return summary
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.poll()
+            self.stopped.wait(self.interval)
+
+    def take_latencies(self):
+        with self.lock:
+            latencies, self.latencies = self.latencies, []
+        return latencies
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def listener_counts(summary):
+    if summary is None:
+        return {}
+    listener = summary.get("listener") or {}
+    counts = {key: int(listener.get(key, 0)) for key in ("accepted", "dropped", "errors")}
+    counts["total_events"] = int(summary.get("total_events", 0))
+    return counts
+
+
+def run_step(args, target, sockets, lines, eps, poller):
+    before_kernel = kernel_udp_drops(target[1])
+    before_listener = listener_counts(poller.poll() if poller else None)
+    if poller:
+        poller.take_latencies()
+    senders = []
+    for index in range(args.concurrency):
+        owned = sockets[index::args.concurrency] or sockets
+        senders.append(Sender(
+            target, owned, lines, index * len(lines) // args.concurrency, eps / args.concurrency,
+            args.duration, args.shape, args.burst_size, args.lines_per_datagram,
+        ))
+    started = time.monotonic()
+    for sender in senders:
+        sender.start()
+    for sender in senders:
+        sender.join()
+    elapsed = time.monotonic() - started
+    time.sleep(args.settle)
+    after_kernel = kernel_udp_drops(target[1])
+    after_listener = listener_counts(poller.poll() if poller else None)
+
+    sent = sum(sender.sent for sender in senders)
+    result = {
+        "target_eps": eps,
+        "shape": args.shape,
+        "sent": sent,
+        "send_errors": sum(sender.errors for sender in senders),
+        "achieved_eps": sent / max(elapsed, args.duration),
+        "kernel_drops": delta(after_kernel[0], before_kernel[0]),
+        "rcvbuf_errors": delta(after_kernel[1], before_kernel[1]),
+    }
+    for key in ("accepted", "dropped", "errors", "total_events"):
+        result[f"listener_{key}"] = delta(after_listener.get(key), before_listener.get(key))
+    if poller:
+        latencies = poller.take_latencies()
+        result["latency_samples"] = len(latencies)
+        for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.0)):
+            result[f"latency_{name}"] = percentile(latencies, fraction)
+    return result
+
+
+def format_count(value):
+    return "n/a" if value is None else f"{value:,}"
+
+
+def format_ms(value):
+    return "n/a" if value is None else f"{value * 1000:,.0f}"
+
+
+def report(results):
+    rows = []
+    for result in results:
+        accepted = result.get("listener_accepted")
+        acceptance = f"{100.0 * accepted / result['sent']:.1f}%" if accepted is not None and result["sent"] else "n/a"
+        rows.append([
+            f"{result['target_eps']:,}",
+            result["shape"],
+            f"{result['sent']:,}",
+            f"{result['achieved_eps']:,.0f}",
+            format_count(result["send_errors"]),
+            format_count(result["kernel_drops"]),
+            format_count(result["rcvbuf_errors"]),
+            format_count(accepted),
+            format_count(result.get("listener_dropped")),
+            format_count(result.get("listener_errors")),
+            acceptance,
+            format_ms(result.get("latency_p50")),
+            format_ms(result.get("latency_p95")),
+            format_ms(result.get("latency_p99")),
+            format_count(result.get("latency_samples")),
+        ])
+    print_table(
+        [
+            "target eps", "shape", "sent", "sent eps", "send err", "kernel drops", "rcvbuf err",
+            "accepted", "dropped", "errors", "acceptance", "p50 ms", "p95 ms", "p99 ms", "samples",
+        ],
+        rows,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay logs to the UDP syslog listener at stepped target rates.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("EFLP_SYSLOG_PORT", "5514")))
+    parser.add_argument("--file", action="append", help="replay lines from this log file (.gz allowed, repeatable)")
+    parser.add_argument("--vendor", default="fortigate", choices=sorted(VENDOR_LINE), help="synthetic vendor when no --file")
+    parser.add_argument("--pool", type=int, default=50000, help="synthetic lines generated and cycled through")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--eps", action="append", type=int, help="target events/sec per step (repeatable)")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per step")
+    parser.add_argument("--settle", type=float, default=5.0, help="seconds to wait after a step before reading counters")
+    parser.add_argument("--concurrency", type=int, default=4, help="sender threads")
+    parser.add_argument("--shape", choices=SHAPES, default="steady")
+    parser.add_argument("--burst-size", type=int, default=200, help="datagrams sent back to back per burst")
+    parser.add_argument("--lines-per-datagram", type=int, default=1)
+    parser.add_argument("--source", action="append", help="source IP or CIDR to send from (repeatable)")
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="EFLP web base URL")
+    parser.add_argument("--case", help="live case id; enables listener deltas and dashboard latency")
+    parser.add_argument("--poll", type=float, default=0.5, help="dashboard poll interval in seconds")
+    parser.add_argument("--json", dest="json_path", help="also write the raw results to this file")
+    args = parser.parse_args()
+    args.concurrency = max(1, args.concurrency)
+    args.burst_size = max(1, args.burst_size)
+    args.lines_per_datagram = max(1, args.lines_per_datagram)
+
+    lines = load_lines(args.file, args.vendor, args.pool, args.seed)
+    sockets = open_sockets(source_addresses(args.source))
+    target = (args.host, args.port)
+    poller = None
+    if args.case:
+        poller = DashboardPoller(args.url, args.case, args.poll, limit=500)
+        if poller.poll() is None:
+            raise SystemExit(f"Cannot read {poller.url}; check --url and --case.")
+        poller.start()
+
+    results = []
+    try:
+        for eps in args.eps or [1000]:
+            results.append(run_step(args, target, sockets, lines, eps, poller))
+            print(f"{eps:,} eps step done", file=sys.stderr)
+    finally:
+        if poller:
+            poller.stop()
+        for sock in sockets:
+            sock.close()
+    report(results)
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import print_table
+from benchmarks.synthetic import VENDOR_LINE, write_corpus
+
+
+STAGES = ("parse", "enrich", "normalize", "aggregate", "export")
+SIZE_SUFFIXES = {"k": 1000, "m": 1000000}
+
+
+def line_count(text):
+    text = text.strip().lower()
+    if text[-1:] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+def peak_rss_mib():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(vendor, count, seed):
+    import json_codec
+    from eflp_app import PARSERS, aggregate_entity_graph, normalize_case_dataframe
+    from parsers.record import records_frame
+
+    timings = dict.fromkeys(STAGES, 0.0)
+    fd, path = tempfile.mkstemp(suffix=".log", prefix=f"eflp-bench-{vendor}-")
+    os.close(fd)
+    try:
+        write_corpus(path, vendor, count, seed)
+        baseline_rss = peak_rss_mib()
+        parser = PARSERS[vendor]()
+        enrich = parser.enrich_record
+
+        def timed_enrich(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return enrich(*args, **kwargs)
+            finally:
+                timings["enrich"] += time.perf_counter() - started
+
+        parser.enrich_record = timed_enrich
+        started = time.perf_counter()
+        records = parser.parse(path)
+        timings["parse"] = time.perf_counter() - started - timings["enrich"]
+    finally:
+        os.remove(path)
+
+    started = time.perf_counter()
+    df = normalize_case_dataframe(records_frame(records))
+    timings["normalize"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    aggregate_entity_graph("benchmark", records)
+    for column in ("severity", "log_category", "outcome", "src_ip", "dst_ip"):
+        df[column].fillna("").astype(str).value_counts().head(10)
+    timings["aggregate"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    frame = df.drop(columns=["timestamp_dt"], errors="ignore").fillna("")
+    frame.to_csv(index=False)
+    json_codec.dumps(frame.to_dict("records"), indent=2)
+    timings["export"] = time.perf_counter() - started
+
+    return {
+        "vendor": vendor,
+        "lines": count,
+        "records": len(records),
+        "stages": timings,
+        "baseline_rss_mib": baseline_rss,
+        "peak_rss_mib": peak_rss_mib(),
+    }
+
+
+def run_isolated(vendor, count, seed):
+    # One child per run, so ru_maxrss is the peak of that run alone.
+    command = [sys.executable, "-m", "benchmarks.throughput", "--worker", "--vendor", vendor, "--lines", str(count), "--seed", str(seed)]
+    with tempfile.TemporaryFile("w+") as stderr:
+        completed = subprocess.run(command, stdout=subprocess.PIPE, stderr=stderr, text=True)
+        if completed.returncode:
+            stderr.seek(0)
+            tail = stderr.read().strip().splitlines()[-15:]
+            raise RuntimeError(f"{vendor} at {count} lines failed:\n" + "\n".join(tail))
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def report(results):
+    rows = []
+    for result in results:
+        stages = result["stages"]
+        ingest = stages["parse"] + stages["enrich"]
+        total = sum(stages.values())
+        rows.append([
+            result["vendor"],
+            f"{result['lines']:,}",
+            f"{result['lines'] / ingest:,.0f}",
+            f"{result['lines'] / total:,.0f}",
+            *(f"{stages[stage]:.2f}" for stage in STAGES),
+            f"{result['peak_rss_mib']:,.0f}",
+        ])
+    print_table(
+        ["vendor", "lines", "parse lines/s", "e2e lines/s", *(f"{stage} s" for stage in STAGES), "peak RSS MiB"],
+        rows,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-vendor parse, enrich, normalize, aggregate and export throughput.")
+    parser.add_argument("--vendor", action="append", choices=sorted(VENDOR_LINE))
+    parser.add_argument("--lines", action="append", type=line_count, help="corpus size, e.g. 10k, 1m, 10m (repeatable)")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--json", dest="json_path", help="also write the raw results to this file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    vendors = args.vendor or list(VENDOR_LINE)
+    sizes = args.lines or [10000]
+
+    if args.worker:
+        print(json.dumps(measure(vendors[0], sizes[0], args.seed)))
+        return
+
+    results = []
+    for count in sizes:
+        for vendor in vendors:
+            results.append(run_isolated(vendor, count, args.seed))
+            print(f"{vendor} {count:,} lines done", file=sys.stderr)
+    report(results)
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
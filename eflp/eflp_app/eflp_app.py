@@ -1,11 +1,13 @@
 import os
-import io
 import uuid
-import base64
+import functools
 import hashlib
+import hmac
 import html
 import json
+import math
 import re
+import sys
 import ipaddress
 import queue
 import shutil
@@ -14,19 +16,23 @@ import tarfile
 import tempfile
 import threading
 import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from urllib import error as urllib_error
 from urllib import request as urllib_request
-import pytz
-import pandas as pd
-import plotly.express as px
-from flask import Flask, request, Response, jsonify, render_template_string, send_file, redirect
-from dateutil import parser as date_parser
-from elasticsearch import Elasticsearch, helpers
-from influxdb import InfluxDBClient
+from flask import Flask, request, Response, jsonify, render_template_string, send_file, redirect, g
+from flask.json.provider import DefaultJSONProvider
 from urllib.parse import urlparse
 from werkzeug.utils import secure_filename
-from neo4j import GraphDatabase
+import json_codec
+import metrics
+import profiling
+import stage_latency
+from log_templates import LogTemplateMiner
+from inverted_index import InvertedIndex
+from live_segments import LiveSegmentStore
 from parsers.palo_alto_parser import PaloAltoParser
 from parsers.fortigate_parser import FortigateParser
 from parsers.sonicwall_parser import SonicwallParser
@@ -39,8 +45,21 @@ from parsers.watchguard_parser import WatchguardParser
 from parsers.sophos_utm_parser import SophosUTMParser
 from parsers.sophos_xgs_parser import SophosXGSParser
 from parsers.netscaler_parser import NetscalerParser
+from parsers import diagnostics as parser_diagnostics
+from parsers.keyword_matcher import KeywordClassifier
+from parsers.base_parser import LineContext
+from parsers.record import PARSER_PROVENANCE, RecordBatch, compact_record, is_missing, records_frame
+
+class CodecJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        return json_codec.dumps(obj, sort_keys=kwargs.get("sort_keys", self.sort_keys), indent=kwargs.get("indent"))
+
+    def loads(self, s, **kwargs):
+        return json_codec.loads(s)
+
 
 app = Flask(__name__)
+app.json = CodecJSONProvider(app)
 app.secret_key = "REPLACE_ME"
 DIR = os.path.dirname(os.path.abspath(__file__))
 UPLOADS = os.path.join(DIR, "uploads")
@@ -56,7 +75,9 @@ OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://ollama:11434").rstrip("/")
 OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "granite4.1:8b")
 OLLAMA_TIMEOUT_SECONDS = int(os.environ.get("OLLAMA_TIMEOUT_SECONDS", "300"))
 OLLAMA_NUM_CTX = int(os.environ.get("OLLAMA_NUM_CTX", "8192"))
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+OLLAMA_EMBED_MODEL = os.environ.get("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+NEO4J_DRIVER = None
+NEO4J_DRIVER_LOCK = threading.Lock()
 PARSERS = {
     "palo_alto": PaloAltoParser,
     "fortigate": FortigateParser,
@@ -87,7 +108,14 @@ VENDOR_LABELS = {
 }
 CASE_PARSE_STATUS = {}
 CASE_DATA_CACHE = {}
+LIVE_PARTITION_INDEX = {}
+LIVE_SEGMENT_STORES = {}
+LIVE_TAIL_STATE = {}
 CASE_STATE_LOCK = threading.RLock()
+CASE_METADATA_TTL = max(0.0, float(os.environ.get("EFLP_CASE_CACHE_TTL", "60")))
+CASE_METADATA_CACHE = {}
+CASE_METADATA_LOADED = 0.0
+CASE_METADATA_LOCK = threading.Lock()
 PLOTLY_DIV_ID_RE = re.compile(r'<div id="([^"]+)" class="plotly-graph-div"')
 CASE_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
 SEVERITY_SORT = {"CRITICAL": 1, "HIGH": 2, "MEDIUM": 3, "LOW": 4, "INFO": 5}
@@ -292,13 +320,71 @@ SYSLOG_ENABLED = os.environ.get("EFLP_SYSLOG_ENABLED", "true").strip().lower() n
 SYSLOG_BIND_HOST = os.environ.get("EFLP_SYSLOG_HOST", "0.0.0.0")
 SYSLOG_PORT = int(os.environ.get("EFLP_SYSLOG_PORT", "5514"))
 SYSLOG_PACKET_BYTES = int(os.environ.get("EFLP_SYSLOG_PACKET_BYTES", "65535"))
+LIVE_LATENCY_SAMPLE_EVERY = max(0, int(os.environ.get("EFLP_LIVE_LATENCY_SAMPLE_EVERY", "100")))
+RAG_LAG_ALERT_SECONDS = float(os.environ.get("EFLP_RAG_LAG_ALERT_SECONDS", "60"))
 LIVE_CASE_CACHE_LIMIT = int(os.environ.get("EFLP_LIVE_CASE_CACHE_LIMIT", "100000"))
+LIVE_SEGMENT_MAX_BYTES = max(1, int(float(os.environ.get("EFLP_LIVE_SEGMENT_MAX_MB", "256")) * 1024 * 1024))
+LIVE_SEGMENT_MAX_SECONDS = max(60.0, float(os.environ.get("EFLP_LIVE_SEGMENT_MAX_HOURS", "24")) * 3600)
+LIVE_SEGMENT_COMPRESSION = os.environ.get("EFLP_LIVE_SEGMENT_COMPRESSION", "gzip").strip().lower()
+LIVE_RETENTION_SECONDS = max(0.0, float(os.environ.get("EFLP_LIVE_RETENTION_DAYS", "0")) * 86400)
+LIVE_RETENTION_BYTES = max(0, int(float(os.environ.get("EFLP_LIVE_RETENTION_GB", "0")) * 1024 * 1024 * 1024))
+PARTITION_MINUTES = max(1, min(int(os.environ.get("EFLP_PARTITION_MINUTES", "60")), 1440))
+PARTITION_MAX_ROWS = max(1000, int(os.environ.get("EFLP_PARTITION_MAX_ROWS", "50000")))
+PARTITION_MIN_ROWS = 1000
+LIVE_PARTITION_FLUSH_SECONDS = 5.0
+CANONICAL_TIMESTAMP_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2})(?:\.\d+)?(Z|[+-]\d{2}:?\d{2})?$")
 LIVE_DASHBOARD_WINDOW = int(os.environ.get("EFLP_LIVE_DASHBOARD_WINDOW", "5000"))
 LIVE_RECENT_LIMIT = int(os.environ.get("EFLP_LIVE_RECENT_LIMIT", "50"))
 RAG_ENABLED = os.environ.get("EFLP_RAG_ENABLED", "true").strip().lower() not in {"0", "false", "no", "off"}
 RAG_TOP_K = max(1, min(int(os.environ.get("EFLP_RAG_TOP_K", "8")), 25))
-RAG_CONTEXT_CHARS = max(2000, int(os.environ.get("EFLP_RAG_CONTEXT_CHARS", "16000")))
+RAG_CONTEXT_CHARS = int(os.environ.get("EFLP_RAG_CONTEXT_CHARS", "0"))
+RAG_CONTEXT_CHARS = max(2000, RAG_CONTEXT_CHARS) if RAG_CONTEXT_CHARS > 0 else 0
+RAG_CONTEXT_TOKENS = max(0, int(os.environ.get("EFLP_RAG_CONTEXT_TOKENS", "0")))
+RAG_ANSWER_RESERVE_TOKENS = max(128, int(os.environ.get("EFLP_RAG_ANSWER_RESERVE_TOKENS", "1024")))
+RAG_RECORD_MAX_TOKENS = max(32, int(os.environ.get("EFLP_RAG_RECORD_MAX_TOKENS", "192")))
+RAG_TOKEN_PIECE_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+RAG_CONTEXT_IPV4_RE = re.compile(r"\b((?:\d{1,3}\.){2}\d{1,3})\.(\d{1,3})\b")
 RAG_QUEUE_SIZE = max(100, int(os.environ.get("EFLP_RAG_QUEUE_SIZE", "10000")))
+RAG_VECTOR_ENABLED = os.environ.get("EFLP_RAG_VECTOR_ENABLED", "true").strip().lower() not in {"0", "false", "no", "off"}
+RAG_EMBEDDING_BACKEND = os.environ.get("EFLP_RAG_EMBEDDING_BACKEND", "hashed").strip().lower()
+RAG_EMBEDDING_DIMS = max(32, min(int(os.environ.get("EFLP_RAG_EMBEDDING_DIMS", "384")), 4096))
+RAG_EMBEDDING_BATCH = max(1, int(os.environ.get("EFLP_RAG_EMBEDDING_BATCH", "256")))
+RAG_KNN_CANDIDATES = max(10, int(os.environ.get("EFLP_RAG_KNN_CANDIDATES", "100")))
+RAG_RRF_K = max(1, int(os.environ.get("EFLP_RAG_RRF_K", "60")))
+RAG_EMBEDDING_TOKEN_RE = re.compile(r"[a-z0-9_]+(?:[.:/-][a-z0-9_]+)*")
+RAG_TEMPLATES_ENABLED = os.environ.get("EFLP_RAG_TEMPLATES_ENABLED", "true").strip().lower() not in {"0", "false", "no", "off"}
+RAG_TEMPLATE_BUCKET_MINUTES = max(1, int(os.environ.get("EFLP_RAG_TEMPLATE_BUCKET_MINUTES", "60")))
+RAG_TEMPLATE_SIMILARITY = min(1.0, max(0.1, float(os.environ.get("EFLP_RAG_TEMPLATE_SIMILARITY", "0.5"))))
+RAG_TEMPLATE_MAX_CLUSTERS = max(10, int(os.environ.get("EFLP_RAG_TEMPLATE_MAX_CLUSTERS", "5000")))
+RAG_TEMPLATE_SAMPLE_IPS = max(1, int(os.environ.get("EFLP_RAG_TEMPLATE_SAMPLE_IPS", "5")))
+RAG_TEMPLATE_MINER_CASES = max(1, int(os.environ.get("EFLP_RAG_TEMPLATE_MINER_CASES", "32")))
+RAG_ISO_TIMESTAMP_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$")
+RAG_SYNC_WORKERS = max(1, min(int(os.environ.get("EFLP_RAG_SYNC_WORKERS", "2")), 16))
+RAG_SYNC_CHUNK_RECORDS = max(100, int(os.environ.get("EFLP_RAG_SYNC_CHUNK_RECORDS", "5000")))
+RAG_WATERMARK_FLUSH_SECONDS = max(1.0, float(os.environ.get("EFLP_RAG_WATERMARK_FLUSH_SECONDS", "5")))
+RAG_NORMALIZATION_VERSION = 3
+ENTITY_GRAPH_ENABLED = os.environ.get("EFLP_ENTITY_GRAPH_ENABLED", "true").strip().lower() not in {"0", "false", "no", "off"}
+ENTITY_GRAPH_BATCH = max(100, int(os.environ.get("EFLP_ENTITY_GRAPH_BATCH", "1000")))
+ENTITY_GRAPH_FLUSH_SECONDS = max(1.0, float(os.environ.get("EFLP_ENTITY_GRAPH_FLUSH_SECONDS", "10")))
+SEARCH_INDEX_ENABLED = os.environ.get("EFLP_SEARCH_INDEX_ENABLED", "true").strip().lower() not in {"0", "false", "no", "off"}
+SEARCH_INDEX_FLUSH_RECORDS = max(100, int(os.environ.get("EFLP_SEARCH_INDEX_FLUSH_RECORDS", "5000")))
+SEARCH_INDEX_FLUSH_SECONDS = max(1.0, float(os.environ.get("EFLP_SEARCH_INDEX_FLUSH_SECONDS", "30")))
+SEARCH_INDEX_MERGE_FACTOR = max(2, int(os.environ.get("EFLP_SEARCH_INDEX_MERGE_FACTOR", "8")))
+SEARCH_INDEX_FIELDS = ("src_ip", "dst_ip", "user", "signature", "rule", "event_id")
+METRICS_ENABLED = os.environ.get("EFLP_METRICS_ENABLED", "false").strip().lower() in {"1", "true", "yes", "on"}
+METRICS_TOKEN = os.environ.get("EFLP_METRICS_TOKEN", "").strip()
+TRUST_PARSER_FIELDS = os.environ.get("EFLP_TRUST_PARSER_FIELDS", "false").strip().lower() in {"1", "true", "yes", "on"}
+CACHE_SIZE_SAMPLE = 64
+PROFILING_TOKEN = os.environ.get("EFLP_PROFILING_TOKEN", "").strip()
+SEARCH_QUERY_FIELDS = {
+    "ip": ("src_ip", "dst_ip"),
+    "src_ip": ("src_ip",),
+    "dst_ip": ("dst_ip",),
+    "user": ("user",),
+    "signature": ("signature",),
+    "rule": ("rule",),
+    "event_id": ("event_id",),
+}
 SYSLOG_ROUTES = []
 SYSLOG_ROUTE_LOCK = threading.Lock()
 SYSLOG_LISTENER_THREAD = None
@@ -311,10 +397,98 @@ SYSLOG_LISTENER_STATE = {
     "updated": time.time(),
 }
 PARSER_INSTANCES = {}
+LIVE_LATENCY = stage_latency.StageLatency(LIVE_LATENCY_SAMPLE_EVERY, observe=metrics.LIVE_STAGE_SECONDS.observe)
 RAG_INDEX_QUEUE = queue.Queue(maxsize=RAG_QUEUE_SIZE)
 RAG_INDEX_THREAD = None
 RAG_REINDEX_THREAD = None
 RAG_STATE_LOCK = threading.Lock()
+RAG_INDEX_MAPPING_READY = False
+# case_id -> LogTemplateMiner for live cases, least recently used first.
+RAG_TEMPLATE_MINERS = OrderedDict()
+RAG_TEMPLATE_LOCK = threading.Lock()
+# case_id -> whether another sync was requested while one is running.
+RAG_SYNC_ACTIVE = {}
+RAG_SYNC_LOCK = threading.Lock()
+SEARCH_INDEX = InvertedIndex(
+    os.path.join(UPLOADS, "index"),
+    SEARCH_INDEX_FIELDS,
+    skip_values=UNKNOWN_VALUE_TOKENS,
+    flush_records=SEARCH_INDEX_FLUSH_RECORDS,
+    flush_seconds=SEARCH_INDEX_FLUSH_SECONDS,
+    merge_factor=SEARCH_INDEX_MERGE_FACTOR,
+)
+ENTITY_GRAPH_PENDING = {"connected": {}, "entities": {}}
+ENTITY_GRAPH_LOCK = threading.Lock()
+ENTITY_GRAPH_THREAD = None
+ENTITY_GRAPH_SCHEMA_READY = False
+ENTITY_GRAPH_SCHEMA = [
+    "CREATE CONSTRAINT eflp_ip_address IF NOT EXISTS FOR (i:IP) REQUIRE i.address IS UNIQUE",
+    "CREATE CONSTRAINT eflp_user_name IF NOT EXISTS FOR (u:User) REQUIRE u.name IS UNIQUE",
+    "CREATE CONSTRAINT eflp_rule_name IF NOT EXISTS FOR (r:Rule) REQUIRE r.name IS UNIQUE",
+    "CREATE INDEX eflp_case_sid IF NOT EXISTS FOR (c:Case) ON (c.sid)",
+    "CREATE INDEX eflp_connected_case IF NOT EXISTS FOR ()-[r:CONNECTED]-() ON (r.case_id)",
+]
+ENTITY_CONNECTED_CYPHER = """
+UNWIND $rows AS row
+MERGE (s:IP {address: row.src})
+MERGE (d:IP {address: row.dst})
+MERGE (s)-[r:CONNECTED {case_id: row.case_id}]->(d)
+ON CREATE SET r.count = row.count, r.bytes = row.bytes, r.first = row.first, r.last = row.last
+ON MATCH SET r.count = r.count + row.count,
+             r.bytes = r.bytes + row.bytes,
+             r.first = CASE WHEN row.first <> '' AND (r.first = '' OR row.first < r.first) THEN row.first ELSE r.first END,
+             r.last = CASE WHEN row.last > r.last THEN row.last ELSE r.last END
+"""
+ENTITY_LINK_CYPHER = {
+    "IP": ("address", "SEEN_IN"),
+    "User": ("name", "SEEN_IN"),
+    "Rule": ("name", "MATCHED"),
+}
+RAG_WATERMARKS = {}
+RAG_WATERMARK_LOCK = threading.RLock()
+RAG_SYNC_CHECKPOINT_PATH = os.path.join(UPLOADS, "rag_sync.checkpoint.json")
+RAG_SYSTEM_PROMPT = (
+    "You are the EFLP forensic analysis assistant. Answer concisely and distinguish observed log facts "
+    "from hypotheses. Use the retrieved EFLP records below when relevant and cite them with bracketed "
+    "source numbers such as [1]. If the records do not support a claim, say so. RAG retrieval updates "
+    "the context but does not retrain your model weights. Records use the legend aliases shown first; "
+    "count is the number of matching events between ts and last.\n\nRetrieved records:\n"
+)
+RAG_TEXT_FIELDS = [
+    "case_label", "vendor", "timestamp", "severity", "log_category", "event",
+    "action", "outcome", "src_ip", "src_port", "dst_ip", "dst_port", "protocol",
+    "user", "rule", "signature", "template", "message", "raw_message",
+]
+# Sync chunks carry a key for their record or byte range. Chunks are sent in
+# order and only the latest one can be re-sent (a retry, or a crash before the
+# watermark was saved), so a document that already applied that key skips it
+# instead of adding its occurrences twice.
+RAG_TEMPLATE_UPDATE_SCRIPT = """
+if (params.chunk != null) {
+  if (params.chunk.equals(ctx._source.applied_chunk)) { ctx.op = 'noop'; }
+  ctx._source.applied_chunk = params.chunk;
+}
+ctx._source.occurrences = (ctx._source.occurrences == null ? 0 : ctx._source.occurrences) + params.count;
+if (params.first_seen != null && (ctx._source.first_seen == null || params.first_seen.compareTo(ctx._source.first_seen) < 0)) {
+  ctx._source.first_seen = params.first_seen;
+}
+if (params.last_seen != null && (ctx._source.last_seen == null || params.last_seen.compareTo(ctx._source.last_seen) > 0)) {
+  ctx._source.last_seen = params.last_seen;
+}
+for (String field : ['sample_src_ips', 'sample_dst_ips']) {
+  def current = ctx._source[field];
+  if (current == null) { current = new ArrayList(); ctx._source[field] = current; }
+  for (def ip : params[field]) {
+    if (current.size() >= params.sample_limit) { break; }
+    if (!current.contains(ip)) { current.add(ip); }
+  }
+}
+ctx._source.template = params.template;
+ctx._source.rag_text = params.rag_text;
+ctx._source.indexed_at = params.indexed_at;
+// A null vector means embedding failed for this batch; keep the stored one.
+if (params.rag_vector != null) { ctx._source.rag_vector = params.rag_vector; }
+"""
 RAG_STATE = {
     "enabled": RAG_ENABLED,
     "status": "idle" if RAG_ENABLED else "disabled",
@@ -497,6 +671,11 @@ BASE_TEMPLATE = """
       color: var(--accent-strong);
       background: color-mix(in srgb, var(--accent) 16%, transparent);
     }
+    .badge.alert {
+      border-color: #dc2626;
+      color: #dc2626;
+      background: color-mix(in srgb, #dc2626 12%, transparent);
+    }
     .form-grid {
       display: grid;
       grid-template-columns: repeat(auto-fit, minmax(240px, 1fr));
@@ -951,7 +1130,7 @@ def resolve_case_artifact_path(case_id, sidecar_name, extension="json"):
     return safe_case_id, artifact_path
 
 
-def set_case_parse_status(case_id, status, message="", records=0):
+def set_case_parse_status(case_id, status, message="", records=0, profiles=None, diagnostics=None):
     safe_case_id, status_path = resolve_case_sidecar_path(case_id, "status")
     if not safe_case_id:
         return
@@ -962,6 +1141,13 @@ def set_case_parse_status(case_id, status, message="", records=0):
         "updated": time.time(),
     }
     with CASE_STATE_LOCK:
+        previous = CASE_PARSE_STATUS.get(safe_case_id) or {}
+        profiles = profiles if profiles is not None else previous.get("profiles")
+        if profiles:
+            state["profiles"] = profiles
+        diagnostics = diagnostics if diagnostics is not None else previous.get("diagnostics")
+        if diagnostics:
+            state["diagnostics"] = diagnostics
         CASE_PARSE_STATUS[safe_case_id] = state
     try:
         with open(status_path, "w", encoding="utf-8") as fh:
@@ -991,15 +1177,153 @@ def get_case_parse_status(case_id):
     return None
 
 
+def canonical_utc_timestamp(value):
+    text = str(value or "").strip()
+    match = CANONICAL_TIMESTAMP_RE.match(text)
+    if match:
+        zone = match.group(3)
+        if not zone or zone in {"Z", "+00:00", "-00:00", "+0000", "-0000"}:
+            return f"{match.group(1)}T{match.group(2)}Z"
+        try:
+            parsed = datetime.fromisoformat(f"{match.group(1)}T{match.group(2)}{zone[:3]}:{zone[-2:]}")
+            return parsed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        except ValueError:
+            return ""
+    if not text or text.lower() in UNKNOWN_VALUE_TOKENS:
+        return ""
+    import pandas as pd
+
+    parsed = normalize_timestamp_value(text)
+    if pd.isna(parsed) or parsed.year < 1970:
+        return ""
+    return parsed.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def partition_bucket(timestamp):
+    if not timestamp:
+        return ""
+    minute = int(timestamp[11:13]) * 60 + int(timestamp[14:16])
+    return f"{timestamp[:10]}/{minute // PARTITION_MINUTES * PARTITION_MINUTES:04d}"
+
+
+def partition_overlaps(partition, start="", end=""):
+    if partition.get("unindexed"):
+        return True
+    if not start and not end:
+        return True
+    if not partition.get("min_ts"):
+        return False
+    return (not end or partition["min_ts"] <= end) and (not start or partition["max_ts"] >= start)
+
+
+def record_in_time_range(record, start="", end=""):
+    if not start and not end:
+        return True
+    timestamp = canonical_utc_timestamp(record.get("timestamp"))
+    return bool(timestamp) and (not start or timestamp >= start) and (not end or timestamp <= end)
+
+
+def track_partition_timestamp(partition, timestamp):
+    if not timestamp:
+        return
+    if not partition["min_ts"] or timestamp < partition["min_ts"]:
+        partition["min_ts"] = timestamp
+    if timestamp > partition["max_ts"]:
+        partition["max_ts"] = timestamp
+
+
+def split_record_partitions(records):
+    partitions = []
+    current = None
+    for row, record in enumerate(records):
+        timestamp = canonical_utc_timestamp(record.get("timestamp"))
+        bucket = partition_bucket(timestamp)
+        if (
+            current is None
+            or current["rows"] >= PARTITION_MAX_ROWS
+            or (bucket and current["bucket"] and bucket != current["bucket"] and current["rows"] >= PARTITION_MIN_ROWS)
+        ):
+            current = {"first_row": row, "rows": 0, "bucket": bucket, "min_ts": "", "max_ts": ""}
+            partitions.append(current)
+        current["bucket"] = current["bucket"] or bucket
+        current["rows"] += 1
+        track_partition_timestamp(current, timestamp)
+    return partitions
+
+
+def resolve_case_partition_paths(case_id):
+    safe_case_id, manifest_path = resolve_case_sidecar_path(case_id, "partitions")
+    if not safe_case_id:
+        return None, None, None
+    _, partition_dir = resolve_case_artifact_path(safe_case_id, "partitions", "d")
+    return safe_case_id, manifest_path, partition_dir
+
+
+def write_case_partitions(case_id, records):
+    safe_case_id, manifest_path, partition_dir = resolve_case_partition_paths(case_id)
+    if not safe_case_id:
+        return None
+    temp_dir = f"{partition_dir}.tmp"
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    os.makedirs(temp_dir)
+    partitions = split_record_partitions(records)
+    for number, partition in enumerate(partitions):
+        partition["file"] = f"{number:06d}.jsonl"
+        first_row = partition["first_row"]
+        with open(os.path.join(temp_dir, partition["file"]), "wb") as fh:
+            for record in records[first_row:first_row + partition["rows"]]:
+                fh.write(json_codec.dump_line(record))
+    manifest = {"rows": len(records), "bucket_minutes": PARTITION_MINUTES, "partitions": partitions}
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    shutil.rmtree(partition_dir, ignore_errors=True)
+    os.replace(temp_dir, partition_dir)
+    with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    return manifest
+
+
+def load_case_partition_manifest(case_id):
+    safe_case_id, manifest_path, _ = resolve_case_partition_paths(case_id)
+    if not safe_case_id or not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as fh:
+            manifest = json.load(fh)
+        return manifest if isinstance(manifest, dict) else None
+    except Exception:
+        return None
+
+
+def read_case_partitions(case_id, start="", end="", manifest=None):
+    safe_case_id, _, partition_dir = resolve_case_partition_paths(case_id)
+    manifest = manifest or load_case_partition_manifest(case_id)
+    if not safe_case_id or manifest is None:
+        return None
+    records = RecordBatch()
+    for partition in manifest.get("partitions", []):
+        if not partition_overlaps(partition, start, end):
+            continue
+        with open(os.path.join(partition_dir, partition["file"]), "rb") as fh:
+            for line in fh:
+                record = json_codec.loads(line)
+                if record_in_time_range(record, start, end):
+                    records.append(record)
+    return records
+
+
 def set_cached_case_data(case_id, parsed_data):
     safe_case_id, cache_path = resolve_case_sidecar_path(case_id, "parsed")
     if not safe_case_id:
         return
+    parsed_data = RecordBatch.from_records(parsed_data)
     with CASE_STATE_LOCK:
         CASE_DATA_CACHE[safe_case_id] = parsed_data
     try:
-        with open(cache_path, "w", encoding="utf-8") as fh:
-            json.dump(parsed_data, fh, default=str)
+        write_case_partitions(safe_case_id, parsed_data)
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
     except Exception:
         pass
 
@@ -1011,61 +1335,272 @@ def get_cached_case_data(case_id):
     with CASE_STATE_LOCK:
         cached = CASE_DATA_CACHE.get(safe_case_id)
     if cached is not None:
+        metrics.CASE_CACHE_REQUESTS.inc("hit")
         return cached
-    if os.path.exists(cache_path):
+    metrics.CASE_CACHE_REQUESTS.inc("miss")
+    try:
+        loaded = read_case_partitions(safe_case_id)
+    except Exception:
+        loaded = None
+    if loaded is None and os.path.exists(cache_path):
         try:
             with open(cache_path, "r", encoding="utf-8") as fh:
                 loaded = json.load(fh)
-            with CASE_STATE_LOCK:
-                CASE_DATA_CACHE[safe_case_id] = loaded
-            return loaded
         except Exception:
             return None
-    return None
+    if loaded is not None:
+        loaded = RecordBatch.from_records(loaded)
+        with CASE_STATE_LOCK:
+            CASE_DATA_CACHE[safe_case_id] = loaded
+    return loaded
+
+
+def get_case_records_in_range(case, start="", end=""):
+    case_id = str(case.get("sid", ""))
+    if is_live_case(case):
+        return read_live_case_range(case_id, start, end)
+    manifest = load_case_partition_manifest(case_id)
+    with CASE_STATE_LOCK:
+        cached = CASE_DATA_CACHE.get(case_id)
+    if manifest is not None and cached is not None and len(cached) == manifest.get("rows"):
+        cached = RecordBatch.from_records(cached)
+        timestamps = cached.column("timestamp")
+        rows = []
+        for partition in manifest.get("partitions", []):
+            if not partition_overlaps(partition, start, end):
+                continue
+            for row in range(partition["first_row"], partition["first_row"] + partition["rows"]):
+                timestamp = canonical_utc_timestamp(timestamps[row])
+                if timestamp and (not start or timestamp >= start) and (not end or timestamp <= end):
+                    rows.append(row)
+        return cached.take(rows)
+    if manifest is not None:
+        return read_case_partitions(case_id, start, end, manifest=manifest)
+    _, records = load_case_data(case_id)
+    if not isinstance(records, (list, RecordBatch)):
+        return []
+    try:
+        write_case_partitions(case_id, records)
+    except Exception:
+        pass
+    return [record for record in records if record_in_time_range(record, start, end)]
+
+
+def parse_time_bound(value):
+    text = str(value or "").strip()
+    if not text:
+        return ""
+    timestamp = canonical_utc_timestamp(text)
+    if not timestamp:
+        raise ValueError(f"Invalid time bound '{text}'.")
+    return timestamp
+
+
+def request_time_range():
+    start = parse_time_bound(request.values.get("start"))
+    end = parse_time_bound(request.values.get("end"))
+    if start and end and start > end:
+        raise ValueError("The start of the time range is after its end.")
+    return start, end
+
+
+def get_live_segment_store(case_id, create=False):
+    safe_case_id, segment_dir = resolve_case_artifact_path(case_id, "live", "d")
+    if not safe_case_id:
+        return None
+    with CASE_STATE_LOCK:
+        store = LIVE_SEGMENT_STORES.get(safe_case_id)
+        if store is not None:
+            return store
+        _, legacy_path = resolve_case_artifact_path(safe_case_id, "live", "jsonl")
+        if not create and not os.path.isdir(segment_dir) and not os.path.exists(legacy_path):
+            return None
+        store = LiveSegmentStore(
+            segment_dir,
+            legacy_path=legacy_path,
+            max_bytes=LIVE_SEGMENT_MAX_BYTES,
+            max_seconds=LIVE_SEGMENT_MAX_SECONDS,
+            compression=LIVE_SEGMENT_COMPRESSION,
+            retention_seconds=LIVE_RETENTION_SECONDS,
+            retention_bytes=LIVE_RETENTION_BYTES,
+        )
+        LIVE_SEGMENT_STORES[safe_case_id] = store
+        return store
+
+
+def load_live_tail_checkpoint(case_id):
+    safe_case_id, checkpoint_path = resolve_case_sidecar_path(case_id, "live_tail")
+    if not safe_case_id or not os.path.exists(checkpoint_path):
+        return None
+    try:
+        with open(checkpoint_path, "r", encoding="utf-8") as fh:
+            checkpoint = json.load(fh)
+        return checkpoint if isinstance(checkpoint, dict) else None
+    except Exception:
+        return None
+
+
+def save_live_tail_checkpoint_locked(case_id, store, state):
+    _, checkpoint_path = resolve_case_sidecar_path(case_id, "live_tail")
+    size = store.size()
+    checkpoint = {"offset": state["offsets"][0] if state["offsets"] else size, "size": size}
+    try:
+        with open(f"{checkpoint_path}.tmp", "w", encoding="utf-8") as fh:
+            json.dump(checkpoint, fh)
+        os.replace(f"{checkpoint_path}.tmp", checkpoint_path)
+        state["saved"] = time.time()
+    except Exception:
+        pass
+
+
+def read_live_tail_lines(case_id, store):
+    # The checkpoint is the offset of the oldest cached record at the last
+    # flush. Reading forward from it is cheaper than a reverse scan as long
+    # as less data arrived since then than the cached tail itself spans.
+    checkpoint = load_live_tail_checkpoint(case_id)
+    size = store.size()
+    if checkpoint:
+        offset = int(checkpoint.get("offset", -1))
+        checkpoint_size = int(checkpoint.get("size", -1))
+        if store.first_offset() <= offset <= checkpoint_size <= size and size - checkpoint_size <= checkpoint_size - offset:
+            return deque(store.iter_lines(offset, size), maxlen=LIVE_CASE_CACHE_LIMIT)
+    return store.tail_lines(LIVE_CASE_CACHE_LIMIT)
 
 
 def get_live_case_records(case_id, limit=None):
-    safe_case_id, live_path = resolve_case_artifact_path(case_id, "live", "jsonl")
+    safe_case_id, _ = resolve_case_artifact_path(case_id, "live", "jsonl")
     if not safe_case_id:
         return []
     with CASE_STATE_LOCK:
         cached = CASE_DATA_CACHE.get(safe_case_id)
         if isinstance(cached, list):
+            metrics.CASE_CACHE_REQUESTS.inc("hit")
             if limit is None:
                 return list(cached)
             return list(cached[-int(limit):])
+    metrics.CASE_CACHE_REQUESTS.inc("miss")
 
     records = []
-    if os.path.exists(live_path):
+    offsets = []
+    store = get_live_segment_store(safe_case_id)
+    if store is not None:
         try:
-            with open(live_path, "r", encoding="utf-8") as fh:
-                for line in fh:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        item = json.loads(line)
-                    except json.JSONDecodeError:
-                        continue
-                    if isinstance(item, dict):
-                        records.append(item)
+            for offset, line in read_live_tail_lines(safe_case_id, store):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    item = json_codec.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(item, dict):
+                    records.append(compact_record(item))
+                    offsets.append(offset)
         except Exception:
             records = []
+            offsets = []
 
     if len(records) > LIVE_CASE_CACHE_LIMIT:
         records = records[-LIVE_CASE_CACHE_LIMIT:]
     with CASE_STATE_LOCK:
         CASE_DATA_CACHE[safe_case_id] = list(records)
+        if store is not None:
+            state = {"offsets": deque(offsets, maxlen=LIVE_CASE_CACHE_LIMIT), "saved": 0.0}
+            LIVE_TAIL_STATE[safe_case_id] = state
+            save_live_tail_checkpoint_locked(safe_case_id, store, state)
     if limit is None:
         return records
     return records[-int(limit):]
 
 
+def load_live_partition_index_locked(case_id, store):
+    index = LIVE_PARTITION_INDEX.get(case_id)
+    if index is not None:
+        first = store.first_offset()
+        if index["partitions"] and index["partitions"][0]["end"] <= first:
+            index["partitions"] = [partition for partition in index["partitions"] if partition["end"] > first]
+        return index
+    _, index_path = resolve_case_sidecar_path(case_id, "live_partitions")
+    partitions = []
+    if os.path.exists(index_path):
+        try:
+            with open(index_path, "r", encoding="utf-8") as fh:
+                partitions = json.load(fh).get("partitions", [])
+        except Exception:
+            partitions = []
+    size = store.size()
+    partitions = [partition for partition in partitions if partition["end"] > store.first_offset()]
+    covered = partitions[-1]["end"] if partitions else store.first_offset()
+    if covered > size:
+        partitions = []
+        covered = store.first_offset()
+    if size > covered:
+        # Bytes written before the index existed (or after its last flush)
+        # are kept as an unindexed partition that every range query scans.
+        partitions.append({"start": covered, "end": size, "rows": 0, "bucket": "", "min_ts": "", "max_ts": "", "unindexed": True})
+    index = {"path": index_path, "partitions": partitions, "persisted": 0.0}
+    LIVE_PARTITION_INDEX[case_id] = index
+    return index
+
+
+def persist_live_partition_index_locked(index):
+    try:
+        with open(f"{index['path']}.tmp", "w", encoding="utf-8") as fh:
+            json.dump({"bucket_minutes": PARTITION_MINUTES, "partitions": index["partitions"]}, fh)
+        os.replace(f"{index['path']}.tmp", index["path"])
+        index["persisted"] = time.time()
+    except Exception:
+        pass
+
+
+def track_live_partition_locked(case_id, store, record, start, end):
+    index = load_live_partition_index_locked(case_id, store)
+    partitions = index["partitions"]
+    timestamp = canonical_utc_timestamp(record.get("timestamp"))
+    bucket = partition_bucket(timestamp)
+    current = partitions[-1] if partitions else None
+    closed = (
+        current is None
+        or current.get("unindexed")
+        or current["end"] != start
+        or current["rows"] >= PARTITION_MAX_ROWS
+        or (bucket and current["bucket"] and bucket != current["bucket"])
+    )
+    if closed:
+        current = {"start": start, "end": start, "rows": 0, "bucket": bucket, "min_ts": "", "max_ts": ""}
+        partitions.append(current)
+    current["bucket"] = current["bucket"] or bucket
+    current["rows"] += 1
+    current["end"] = end
+    track_partition_timestamp(current, timestamp)
+    if closed or time.time() - index["persisted"] >= LIVE_PARTITION_FLUSH_SECONDS:
+        persist_live_partition_index_locked(index)
+
+
+def read_live_case_range(case_id, start="", end=""):
+    store = get_live_segment_store(case_id)
+    if store is None:
+        return []
+    with CASE_STATE_LOCK:
+        index = load_live_partition_index_locked(str(case_id), store)
+        partitions = [dict(partition) for partition in index["partitions"] if partition_overlaps(partition, start, end)]
+    records = RecordBatch()
+    for partition in partitions:
+        for line in store.read_range(partition["start"], partition["end"]).splitlines():
+            try:
+                record = json_codec.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and record_in_time_range(record, start, end):
+                records.append(record)
+    return records
+
+
 def append_live_case_record(case_id, record):
-    safe_case_id, live_path = resolve_case_artifact_path(case_id, "live", "jsonl")
+    safe_case_id, _ = resolve_case_artifact_path(case_id, "live", "jsonl")
     if not safe_case_id:
-        return 0
-    payload = dict(record or {})
+        return 0, None
+    payload = compact_record(record)
     with CASE_STATE_LOCK:
         records = CASE_DATA_CACHE.get(safe_case_id)
         if not isinstance(records, list):
@@ -1075,16 +1610,48 @@ def append_live_case_record(case_id, record):
             records = records[-LIVE_CASE_CACHE_LIMIT:]
         CASE_DATA_CACHE[safe_case_id] = records
         count = len(records)
-        with open(live_path, "a", encoding="utf-8") as fh:
-            fh.write(json.dumps(payload, ensure_ascii=False, default=str) + "\n")
+        store = get_live_segment_store(safe_case_id, create=True)
+        load_live_partition_index_locked(safe_case_id, store)
+        start, end = store.append(json_codec.dump_line(payload))
+        track_live_partition_locked(safe_case_id, store, payload, start, end)
+        state = LIVE_TAIL_STATE.setdefault(safe_case_id, {"offsets": deque(maxlen=LIVE_CASE_CACHE_LIMIT), "saved": 0.0})
+        state["offsets"].append(start)
+        if time.time() - state["saved"] >= LIVE_PARTITION_FLUSH_SECONDS:
+            save_live_tail_checkpoint_locked(safe_case_id, store, state)
     set_case_parse_status(safe_case_id, "ready", "Live syslog ingestion active.", records=count)
-    return count
+    return count, (start, end)
+
+
+def write_parser_trace(case_id, collector):
+    _, artifact_path = resolve_case_artifact_path(case_id, "parser_trace", "log")
+    if not artifact_path:
+        return ""
+    try:
+        with open(artifact_path, "w", encoding="utf-8") as fh:
+            fh.writelines(collector.trace_lines())
+    except OSError:
+        return ""
+    return os.path.basename(artifact_path)
 
 
-def parse_case_background(case_id, file_path, vendor):
+def finish_parse_diagnostics(case_id, collector, trace):
+    collector.close()
+    summary = collector.summary()
+    if trace:
+        summary["trace"] = write_parser_trace(case_id, collector)
+    return summary
+
+
+def parse_case_background(case_id, file_path, vendor, trace=False):
     set_case_parse_status(case_id, "parsing", "Parsing uploaded log file...")
+    collector = parser_diagnostics.Diagnostics(trace=trace)
     try:
-        parsed = parse_uploaded_file(file_path, vendor)
+        with metrics.PARSE_JOB_SECONDS.time(vendor), parser_diagnostics.activate(collector):
+            parsed = parse_uploaded_file(file_path, vendor)
+        summary = finish_parse_diagnostics(case_id, collector, trace)
+        # Recorded before the cache is filled, as upload_status answers from the cache.
+        set_case_parse_status(case_id, "parsing", "Finalizing parsed records...", records=len(parsed), diagnostics=summary)
+        metrics.INGEST_EVENTS.inc("upload", vendor, amount=len(parsed))
         set_cached_case_data(case_id, parsed)
         case = get_case_by_sid(case_id) or {
             "sid": case_id,
@@ -1092,16 +1659,99 @@ def parse_case_background(case_id, file_path, vendor):
             "vendor": vendor,
             "ingestion_mode": "upload",
         }
-        queued = enqueue_rag_records(case, parsed)
+        queued = enqueue_rag_case_sync(case)
         message = "Parsing complete; RAG indexing queued." if queued else "Parsing complete."
         set_case_parse_status(case_id, "ready", message, records=len(parsed))
     except Exception as e:
-        set_case_parse_status(case_id, "error", f"{e}", records=0)
+        metrics.INGEST_REJECTED.inc("upload", "error")
+        set_case_parse_status(case_id, "error", f"{e}", records=0, diagnostics=finish_parse_diagnostics(case_id, collector, trace))
+        return
+    try:
+        if SEARCH_INDEX_ENABLED:
+            SEARCH_INDEX.write_case(case_id, parsed)
+    except Exception as e:
+        message = f"{message} Search index update failed: {e}"
+        set_case_parse_status(case_id, "ready", message, records=len(parsed))
+    try:
+        write_case_entity_graph(case_id, parsed)
+    except Exception as e:
+        set_case_parse_status(case_id, "ready", f"{message} Entity graph update failed: {e}", records=len(parsed))
+
+
+def requested_profile_mode(values):
+    mode = profiling.normalize_mode(values.get("profile"))
+    if not mode:
+        raise ValueError(f"Unknown profile mode; use one of: {', '.join(profiling.MODES)}.")
+    if not profiling_token_valid(values):
+        raise PermissionError("Profiling requires a valid EFLP_PROFILING_TOKEN.")
+    return mode
+
+
+def profiling_token_valid(values):
+    token = request.headers.get("X-EFLP-Profile-Token") or values.get("profile_token", "")
+    return hmac.compare_digest(str(token), PROFILING_TOKEN)
+
+
+def record_case_profile(case_id, target, summary):
+    state = get_case_parse_status(case_id) or {}
+    profiles = dict(state.get("profiles") or {})
+    profiles[target] = summary
+    set_case_parse_status(
+        case_id,
+        state.get("status", "ready"),
+        state.get("message", ""),
+        records=state.get("records", 0),
+        profiles=profiles,
+    )
+
+
+def profiled_case_call(case_id, target, mode, func, *args):
+    _, artifact_path = resolve_case_artifact_path(case_id, f"profile_{target}", profiling.ARTIFACT_EXTENSIONS[mode])
+    if not artifact_path:
+        return func(*args)
+    run = profiling.ProfileRun(mode, artifact_path)
+    try:
+        with run:
+            return func(*args)
+    finally:
+        record_case_profile(case_id, target, run.summary)
+
+
+def profiled_case_view(target):
+    # Case pages accept ?profile=sampling|deterministic plus the profiling
+    # token. Without EFLP_PROFILING_TOKEN the view is returned undecorated.
+    def decorator(view):
+        if not PROFILING_TOKEN:
+            return view
+
+        @functools.wraps(view)
+        def wrapper(case_id, *args, **kwargs):
+            if "profile" not in request.args:
+                return view(case_id, *args, **kwargs)
+            try:
+                mode = requested_profile_mode(request.args)
+            except PermissionError as exc:
+                return render_page("Error", "Error", html.escape(str(exc))), 403
+            except ValueError as exc:
+                return render_page("Error", "Error", html.escape(str(exc))), 400
+            response = app.make_response(
+                profiled_case_call(case_id, target, mode, lambda: view(case_id, *args, **kwargs))
+            )
+            response.headers["X-EFLP-Profile"] = f"profile_{target}.{profiling.ARTIFACT_EXTENSIONS[mode]}"
+            return response
+        return wrapper
+    return decorator
 
 
-def start_case_parse_job(case_id, file_path, vendor):
+def start_case_parse_job(case_id, file_path, vendor, profile="", trace=False):
     set_case_parse_status(case_id, "queued", "Queued for parsing...")
-    worker = threading.Thread(target=parse_case_background, args=(case_id, file_path, vendor), daemon=True)
+    if profile:
+        target = profiled_case_call
+        args = (case_id, "parse", profile, parse_case_background, case_id, file_path, vendor, trace)
+    else:
+        target = parse_case_background
+        args = (case_id, file_path, vendor, trace)
+    worker = threading.Thread(target=target, args=args, daemon=True)
     worker.start()
 
 
@@ -1175,9 +1825,40 @@ def render_case_loading_page(case_id, label, vendor):
     """
     return render_page("Parsing Upload", "Case Loading", content)
 
+def case_metadata_summary(case):
+    return {
+        "sid": case.get("sid"),
+        "label": case.get("label"),
+        "vendor": case.get("vendor"),
+        "path": case.get("path"),
+        "ingestion_mode": case.get("ingestion_mode") or "upload",
+        "source_match": case.get("source_match") or "",
+        "live_enabled": bool(case.get("live_enabled") or False),
+    }
+
+
+def cache_case_metadata(case):
+    case = dict(case or {})
+    if not case.get("sid"):
+        return
+    with CASE_METADATA_LOCK:
+        CASE_METADATA_CACHE[case["sid"]] = {"case": case, "loaded": time.time()}
+
+
+def neo4j_driver():
+    global NEO4J_DRIVER
+    if NEO4J_DRIVER is None:
+        with NEO4J_DRIVER_LOCK:
+            if NEO4J_DRIVER is None:
+                from neo4j import GraphDatabase
+
+                NEO4J_DRIVER = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    return NEO4J_DRIVER
+
+
 def store_case(case_id, label, vendor, path, ingestion_mode="upload", source_match="", syslog_port=None):
-    with driver.session() as session:
-        session.run(
+    with metrics.backend_call("neo4j", "store_case"), neo4j_driver().session() as session:
+        record = session.run(
             """
             CREATE (c:Case {
                 sid: $sid,
@@ -1190,6 +1871,7 @@ def store_case(case_id, label, vendor, path, ingestion_mode="upload", source_mat
                 live_enabled: $live_enabled,
                 created: timestamp()
             })
+            RETURN properties(c) AS case
             """,
             sid=case_id,
             label=label,
@@ -1199,31 +1881,199 @@ def store_case(case_id, label, vendor, path, ingestion_mode="upload", source_mat
             source_match=source_match,
             syslog_port=syslog_port,
             live_enabled=(ingestion_mode == "syslog"),
-        )
+        ).single()
+    if record:
+        cache_case_metadata(record["case"])
 
 def get_all_cases():
-    with driver.session() as session:
-        result = session.run(
+    global CASE_METADATA_LOADED
+    now = time.time()
+    with CASE_METADATA_LOCK:
+        if CASE_METADATA_TTL and now - CASE_METADATA_LOADED < CASE_METADATA_TTL:
+            cases = sorted(
+                (entry["case"] for entry in CASE_METADATA_CACHE.values()),
+                key=lambda case: case.get("created") or 0,
+                reverse=True,
+            )
+            return [case_metadata_summary(case) for case in cases]
+    with metrics.backend_call("neo4j", "get_all_cases"), neo4j_driver().session() as session:
+        rows = session.run(
             """
             MATCH (c:Case)
-            RETURN c.sid AS sid,
-                   c.label AS label,
-                   c.vendor AS vendor,
-                   c.path AS path,
-                   coalesce(c.ingestion_mode, 'upload') AS ingestion_mode,
-                   coalesce(c.source_match, '') AS source_match,
-                   coalesce(c.live_enabled, false) AS live_enabled
+            RETURN properties(c) AS case
             ORDER BY c.created DESC
             """
-        )
-        return result.data()
+        ).data()
+    cases = [dict(row["case"]) for row in rows if row.get("case")]
+    with CASE_METADATA_LOCK:
+        CASE_METADATA_CACHE.clear()
+        CASE_METADATA_CACHE.update({case["sid"]: {"case": case, "loaded": now} for case in cases if case.get("sid")})
+        CASE_METADATA_LOADED = now
+    return [case_metadata_summary(case) for case in cases]
 
 def get_case_by_sid(case_id):
-    with driver.session() as session:
+    with CASE_METADATA_LOCK:
+        entry = CASE_METADATA_CACHE.get(case_id)
+        if entry and CASE_METADATA_TTL and time.time() - entry["loaded"] < CASE_METADATA_TTL:
+            return dict(entry["case"])
+    with metrics.backend_call("neo4j", "get_case_by_sid"), neo4j_driver().session() as session:
         record = session.run(
             "MATCH (c:Case {sid: $sid}) RETURN c LIMIT 1", sid=case_id
         ).single()
-        return record["c"] if record else None
+    if not record:
+        return None
+    case = dict(record["c"])
+    cache_case_metadata(case)
+    return dict(case)
+
+
+def entity_graph_value(value):
+    text = str(value or "").strip()
+    return "" if text.lower() in UNKNOWN_VALUE_TOKENS else text
+
+
+def aggregate_entity_graph(case_id, records, graph=None):
+    graph = graph if graph is not None else {"connected": {}, "entities": {}}
+    connected = graph["connected"]
+    entities = graph["entities"]
+    for record in records:
+        src_ip = entity_graph_value(record.get("src_ip"))
+        dst_ip = entity_graph_value(record.get("dst_ip"))
+        if src_ip and dst_ip:
+            timestamp = canonical_utc_timestamp(record.get("timestamp"))
+            edge = connected.get((case_id, src_ip, dst_ip))
+            if edge is None:
+                edge = {"count": 0, "bytes": 0, "first": "", "last": ""}
+                connected[(case_id, src_ip, dst_ip)] = edge
+            edge["count"] += 1
+            edge["bytes"] += traffic_amount_from_row(record)
+            if timestamp:
+                if not edge["first"] or timestamp < edge["first"]:
+                    edge["first"] = timestamp
+                if timestamp > edge["last"]:
+                    edge["last"] = timestamp
+        for label, value in (
+            ("IP", src_ip),
+            ("IP", dst_ip),
+            ("User", entity_graph_value(record.get("user"))),
+            ("Rule", entity_graph_value(record.get("rule"))),
+        ):
+            if value:
+                key = (label, case_id, value)
+                entities[key] = entities.get(key, 0) + 1
+    return graph
+
+
+def ensure_entity_graph_schema(session):
+    global ENTITY_GRAPH_SCHEMA_READY
+    if ENTITY_GRAPH_SCHEMA_READY:
+        return
+    for statement in ENTITY_GRAPH_SCHEMA:
+        session.run(statement).consume()
+    ENTITY_GRAPH_SCHEMA_READY = True
+
+
+def write_entity_graph_rows(session, cypher, rows):
+    for start in range(0, len(rows), ENTITY_GRAPH_BATCH):
+        chunk = rows[start:start + ENTITY_GRAPH_BATCH]
+        session.execute_write(lambda tx: tx.run(cypher, rows=chunk).consume())
+
+
+def write_entity_graph(graph):
+    if not graph["connected"] and not graph["entities"]:
+        return 0
+    connected_rows = [
+        {"case_id": case_id, "src": src_ip, "dst": dst_ip, **edge}
+        for (case_id, src_ip, dst_ip), edge in graph["connected"].items()
+    ]
+    link_rows = {}
+    for (label, case_id, value), count in graph["entities"].items():
+        link_rows.setdefault(label, []).append({"case_id": case_id, "value": value, "count": count})
+    with metrics.backend_call("neo4j", "write_entity_graph"), neo4j_driver().session() as session:
+        ensure_entity_graph_schema(session)
+        write_entity_graph_rows(session, ENTITY_CONNECTED_CYPHER, connected_rows)
+        for label, rows in link_rows.items():
+            key, relationship = ENTITY_LINK_CYPHER[label]
+            write_entity_graph_rows(session, f"""
+                UNWIND $rows AS row
+                MATCH (c:Case {{sid: row.case_id}})
+                MERGE (e:{label} {{{key}: row.value}})
+                MERGE (e)-[r:{relationship}]->(c)
+                ON CREATE SET r.count = row.count
+                ON MATCH SET r.count = r.count + row.count
+            """, rows)
+    return len(connected_rows) + sum(len(rows) for rows in link_rows.values())
+
+
+def write_case_entity_graph(case_id, records):
+    if not ENTITY_GRAPH_ENABLED or not records:
+        return 0
+    return write_entity_graph(aggregate_entity_graph(str(case_id), records))
+
+
+def merge_entity_graph(target, graph):
+    for key, edge in graph["connected"].items():
+        current = target["connected"].get(key)
+        if current is None:
+            target["connected"][key] = dict(edge)
+            continue
+        current["count"] += edge["count"]
+        current["bytes"] += edge["bytes"]
+        if edge["first"] and (not current["first"] or edge["first"] < current["first"]):
+            current["first"] = edge["first"]
+        current["last"] = max(current["last"], edge["last"])
+    for key, count in graph["entities"].items():
+        target["entities"][key] = target["entities"].get(key, 0) + count
+
+
+def entity_graph_flush_loop():
+    global ENTITY_GRAPH_PENDING
+    while True:
+        time.sleep(ENTITY_GRAPH_FLUSH_SECONDS)
+        with ENTITY_GRAPH_LOCK:
+            graph = ENTITY_GRAPH_PENDING
+            ENTITY_GRAPH_PENDING = {"connected": {}, "entities": {}}
+        try:
+            write_entity_graph(graph)
+        except Exception:
+            with ENTITY_GRAPH_LOCK:
+                merge_entity_graph(ENTITY_GRAPH_PENDING, graph)
+
+
+def queue_live_entity_records(case_id, records):
+    global ENTITY_GRAPH_THREAD
+    if not ENTITY_GRAPH_ENABLED or not records:
+        return
+    with ENTITY_GRAPH_LOCK:
+        aggregate_entity_graph(str(case_id), records, ENTITY_GRAPH_PENDING)
+        if ENTITY_GRAPH_THREAD and ENTITY_GRAPH_THREAD.is_alive():
+            return
+        ENTITY_GRAPH_THREAD = threading.Thread(target=entity_graph_flush_loop, daemon=True)
+        ENTITY_GRAPH_THREAD.start()
+
+
+def get_related_cases(case_id, limit=50):
+    with metrics.backend_call("neo4j", "get_related_cases"), neo4j_driver().session() as session:
+        return session.run(
+            """
+            MATCH (c:Case {sid: $sid})<-[:SEEN_IN|MATCHED]-(e)-[:SEEN_IN|MATCHED]->(other:Case)
+            WHERE other.sid <> c.sid
+            WITH other, e
+            ORDER BY e.address, e.name
+            WITH other,
+                 count(DISTINCT e) AS shared_count,
+                 collect(DISTINCT labels(e)[0] + ':' + coalesce(e.address, e.name))[..20] AS shared
+            RETURN other.sid AS sid,
+                   other.label AS label,
+                   other.vendor AS vendor,
+                   shared_count,
+                   shared
+            ORDER BY shared_count DESC
+            LIMIT $limit
+            """,
+            sid=case_id,
+            limit=int(limit),
+        ).data()
 
 
 def is_live_case(case):
@@ -1264,7 +2114,7 @@ def extract_tgz_members_safely(archive_path, extract_root):
 
 
 def parse_tgz_archive(archive_path, vendor):
-    all_records = []
+    all_records = RecordBatch()
     errors = []
     with tempfile.TemporaryDirectory(prefix="eflp_tgz_", dir=UPLOADS) as extract_root:
         extracted_files = extract_tgz_members_safely(archive_path, extract_root)
@@ -1306,8 +2156,10 @@ def parse_uploaded_file(file_path, vendor):
     if ext in [".csv", ".tsv"]:
         sep = "," if ext == ".csv" else "\t"
         try:
+            import pandas as pd
+
             df = pd.read_csv(file_path, sep=sep, dtype=str, keep_default_na=False)
-            return df.to_dict("records")
+            return RecordBatch.from_frame(df)
         except Exception as e:
             raise Exception(f"Error parsing CSV/TSV file: {e}")
     else:
@@ -1398,7 +2250,7 @@ def register_syslog_route(case_id, label, vendor, source_match=""):
 
 def refresh_syslog_routes_from_db():
     try:
-        with driver.session() as session:
+        with metrics.backend_call("neo4j", "refresh_syslog_routes"), neo4j_driver().session() as session:
             rows = session.run(
                 """
                 MATCH (c:Case)
@@ -1441,208 +2293,41 @@ def find_syslog_route(source_ip):
     return best_route if best_score >= 0 else None
 
 
-def category_from_parser_hint(parser, raw_fields, payload, vendor):
-    if vendor == "netscaler" and hasattr(parser, "_category_from_tag"):
-        tag = raw_fields.get("tag") or raw_fields.get("module") or raw_fields.get("event")
-        return parser._category_from_tag(tag, payload)
-
-    type_map = getattr(parser, "TYPE_TO_CATEGORY", {}) or {}
-    candidates = [
-        raw_fields.get("type"),
-        raw_fields.get("log_type"),
-        raw_fields.get("subtype"),
-        raw_fields.get("eventtype"),
-        raw_fields.get("category"),
-        raw_fields.get("cat"),
-        raw_fields.get("c"),
-        raw_fields.get("module"),
-        raw_fields.get("service"),
-    ]
-    for candidate in candidates:
-        value = str(candidate or "").strip()
-        if not value:
-            continue
-        if value in type_map:
-            return type_map[value]
-        if value.lower() in type_map:
-            return type_map[value.lower()]
-        if value.upper() in type_map:
-            return type_map[value.upper()]
-    return infer_log_category_from_text(f"{payload} {' '.join(str(v or '') for v in candidates)}")
+def live_line_context(source_ip=""):
+    return LineContext(received_at=utc_now_iso(), ingestion_mode="syslog", ingest_source=source_ip)
 
 
-def parse_live_syslog_line(line, vendor, source_ip=""):
+def parse_live_syslog_line(line, vendor, source_ip="", context=None):
+    # Same parse_line as uploads; only the live bookkeeping fields are added here.
     parser = get_parser_instance(vendor)
     if not parser:
         raise ValueError(f"Unsupported vendor '{vendor}'.")
+    if context is None:
+        context = live_line_context(source_ip)
 
     text = str(line or "").strip()
-    meta = parser.parse_syslog_prefix(text) or {}
-    payload = meta.get("payload") or text
-    raw_fields = {}
-    raw_fields.update(parser.parse_kv_pairs(payload))
-    raw_fields.update(parser.parse_json_line(payload))
-
-    if vendor == "cisco_ftd" and hasattr(parser, "_parse_name_values"):
-        raw_fields.update(parser._parse_name_values(payload))
-
-    tagged = None
-    if vendor == "netscaler" and hasattr(parser, "SYSLOG_RE"):
-        tagged = parser.SYSLOG_RE.match(text)
-        if tagged:
-            raw_fields.setdefault("tag", tagged.group("tag") or "")
-            payload = tagged.group("msg") or payload
-            meta.setdefault("timestamp", tagged.group("ts") or "")
-            meta.setdefault("host", tagged.group("host") or "")
-
-    palo_fields = []
-    palo_type = ""
-    palo_subtype = ""
-    palo_src_ip = ""
-    palo_dst_ip = ""
-    palo_src_port = None
-    palo_dst_port = None
-    palo_action = ""
-    palo_rule = ""
-    palo_bytes_in = None
-    palo_bytes_out = None
-    palo_bytes_total = None
-    if vendor == "palo_alto" and hasattr(parser, "_parse_csv_fields"):
-        palo_fields = parser._parse_csv_fields(payload)
-        if palo_fields:
-            palo_type, palo_subtype = parser._extract_type_subtype(palo_fields, raw_fields)
-            palo_action = parser._extract_action(palo_fields, raw_fields, payload)
-            palo_src_ip, palo_dst_ip, palo_src_port, palo_dst_port = parser._extract_network_tuple(palo_fields, raw_fields)
-            if len(palo_fields) > 31 and palo_type == "TRAFFIC":
-                palo_rule = palo_fields[10]
-                palo_bytes_total = traffic_int_value(palo_fields[29])
-                palo_bytes_out = traffic_int_value(palo_fields[30])
-                palo_bytes_in = traffic_int_value(palo_fields[31])
-            if palo_type:
-                raw_fields.setdefault("type", palo_type)
-            if palo_subtype:
-                raw_fields.setdefault("subtype", palo_subtype)
-            if palo_rule:
-                raw_fields.setdefault("rule", palo_rule)
-            if palo_bytes_total is not None:
-                raw_fields.setdefault("bytes", palo_bytes_total)
-            if palo_bytes_out is not None:
-                raw_fields.setdefault("bytes_sent", palo_bytes_out)
-            if palo_bytes_in is not None:
-                raw_fields.setdefault("bytes_received", palo_bytes_in)
-
-    cisco_src_ip = ""
-    cisco_dst_ip = ""
-    cisco_src_port = None
-    cisco_dst_port = None
-    cisco_msg_id = ""
-    cisco_sev = ""
-    if vendor == "cisco_ftd" and hasattr(parser, "MSG_ID_REGEX"):
-        msg_match = parser.MSG_ID_REGEX.search(payload)
-        if msg_match:
-            cisco_msg_id = msg_match.group("msg_id") or ""
-            cisco_sev = msg_match.group("sev") or ""
-        if hasattr(parser, "_extract_asa_network_tuple"):
-            cisco_src_ip, cisco_src_port, cisco_dst_ip, cisco_dst_port = parser._extract_asa_network_tuple(payload)
-
-    received_at = utc_now_iso()
-    date_part = parser.dict_first(raw_fields, ["date", "logdate", "eventdate", "devdate"])
-    time_part = parser.dict_first(raw_fields, ["time", "eventtime", "devtime"])
-    compound_ts = f"{date_part} {time_part}".strip() if date_part or time_part else ""
-    category = category_from_parser_hint(parser, raw_fields, payload, vendor)
-    action = parser.normalize_action(
-        parser.first_value(
-            raw_fields.get("action"),
-            raw_fields.get("act"),
-            raw_fields.get("result"),
-            raw_fields.get("status"),
-            raw_fields.get("disposition"),
-            palo_action,
-        ),
-        payload,
-    )
-    bytes_in = traffic_first_value({"raw_fields": raw_fields}, TRAFFIC_IN_BYTE_FIELDS)
-    bytes_out = traffic_first_value({"raw_fields": raw_fields}, TRAFFIC_OUT_BYTE_FIELDS)
-    bytes_total = traffic_first_value({"raw_fields": raw_fields}, TRAFFIC_TOTAL_BYTE_FIELDS)
+    record = parser.parse_line(text, context)
+    if record is None:
+        record = parser.enrich_record({"message": text, "raw_fields": {}}, vendor=vendor, context=context)
+    record["raw_message"] = text
+    # Byte counters come from raw_fields only; probing every name variant on
+    # the record itself costs more than the parse.
+    counters = {"raw_fields": record.get("raw_fields")}
+    bytes_in = traffic_first_value(counters, TRAFFIC_IN_BYTE_FIELDS)
+    bytes_out = traffic_first_value(counters, TRAFFIC_OUT_BYTE_FIELDS)
+    bytes_total = traffic_first_value(counters, TRAFFIC_TOTAL_BYTE_FIELDS)
     traffic_bytes = bytes_total if bytes_total is not None else int((bytes_in or 0) + (bytes_out or 0))
     if traffic_bytes <= 0:
-        traffic_bytes = traffic_amount_from_text(payload, text) or 0
-
-    record = {
-        "vendor": vendor,
-        "timestamp": parser.first_value(
-            raw_fields.get("@timestamp"),
-            raw_fields.get("timestamp"),
-            raw_fields.get("event_time"),
-            raw_fields.get("generated_time"),
-            raw_fields.get("receive_time"),
-            raw_fields.get("eventtime"),
-            compound_ts,
-            meta.get("timestamp"),
-            received_at,
-        ),
-        "received_at": received_at,
-        "ingestion_mode": "syslog",
-        "ingest_source": source_ip,
-        "host": parser.first_value(
-            meta.get("host"),
-            raw_fields.get("host"),
-            raw_fields.get("hostname"),
-            raw_fields.get("device"),
-            raw_fields.get("devname"),
-        ),
-        "severity": parser.first_value(
-            raw_fields.get("severity"),
-            raw_fields.get("level"),
-            raw_fields.get("risk"),
-            raw_fields.get("priority"),
-            raw_fields.get("pri"),
-            cisco_sev,
-            meta.get("priority"),
-        ),
-        "message": parser.first_value(
-            raw_fields.get("msg"),
-            raw_fields.get("message"),
-            raw_fields.get("description"),
-            raw_fields.get("reason"),
-            payload,
-        ),
-        "event": parser.first_value(
-            raw_fields.get("event"),
-            raw_fields.get("event_type"),
-            raw_fields.get("eventtype"),
-            raw_fields.get("subtype"),
-            raw_fields.get("log_type"),
-            raw_fields.get("signature"),
-            raw_fields.get("msgid"),
-            cisco_msg_id,
-            palo_subtype,
-            palo_type,
-        ),
-        "event_id": parser.first_value(raw_fields.get("eventid"), raw_fields.get("event_id"), raw_fields.get("id"), raw_fields.get("logid"), raw_fields.get("msgid"), cisco_msg_id),
-        "action": action,
-        "log_category": category,
-        "src_ip": parser.first_value(raw_fields.get("src_ip"), raw_fields.get("srcip"), raw_fields.get("src"), raw_fields.get("source_ip"), raw_fields.get("source"), raw_fields.get("sip"), raw_fields.get("clientip"), palo_src_ip, cisco_src_ip),
-        "dst_ip": parser.first_value(raw_fields.get("dst_ip"), raw_fields.get("dstip"), raw_fields.get("dst"), raw_fields.get("destination_ip"), raw_fields.get("destination"), raw_fields.get("dip"), raw_fields.get("serverip"), palo_dst_ip, cisco_dst_ip),
-        "src_port": parser.first_value(raw_fields.get("src_port"), raw_fields.get("srcport"), raw_fields.get("sport"), raw_fields.get("spt"), palo_src_port, cisco_src_port),
-        "dst_port": parser.first_value(raw_fields.get("dst_port"), raw_fields.get("dstport"), raw_fields.get("dport"), raw_fields.get("dpt"), palo_dst_port, cisco_dst_port),
-        "protocol": parser.first_value(raw_fields.get("protocol"), raw_fields.get("proto"), raw_fields.get("service"), raw_fields.get("transport")),
-        "rule": parser.first_value(raw_fields.get("rule"), raw_fields.get("rulename"), raw_fields.get("policy"), raw_fields.get("policyid"), raw_fields.get("policyname"), raw_fields.get("acl"), palo_rule),
-        "user": parser.first_value(raw_fields.get("user"), raw_fields.get("username"), raw_fields.get("srcuser"), raw_fields.get("dstuser"), raw_fields.get("account"), raw_fields.get("userid")),
-        "signature": parser.first_value(raw_fields.get("signature"), raw_fields.get("attack"), raw_fields.get("threat"), raw_fields.get("sig"), raw_fields.get("sig_name")),
-        "session_id": parser.first_value(raw_fields.get("session_id"), raw_fields.get("sessionid"), raw_fields.get("sid"), raw_fields.get("connid"), raw_fields.get("flowid")),
-        "bytes_in": bytes_in,
-        "bytes_out": bytes_out,
-        "bytes_total": bytes_total,
-        "traffic_bytes": traffic_bytes,
-        "raw_message": text,
-        "raw_fields": raw_fields,
-        "syslog_priority": meta.get("priority"),
-    }
-    return parser.enrich_record(record, vendor=vendor, default_category=category)
+        traffic_bytes = traffic_amount_from_text(record.get("message"), text) or 0
+    record["bytes_in"] = bytes_in
+    record["bytes_out"] = bytes_out
+    record["bytes_total"] = bytes_total
+    record["traffic_bytes"] = traffic_bytes
+    return record
 
 
 def handle_syslog_datagram(data, addr):
+    received = time.monotonic()
     source_ip = addr[0] if addr else ""
     raw_text = data.decode("utf-8", errors="replace")
     lines = [line.strip("\x00\r ") for line in raw_text.splitlines() if line.strip("\x00\r ")]
@@ -1652,15 +2337,26 @@ def handle_syslog_datagram(data, addr):
     accepted = 0
     dropped = 0
     errors = 0
+    context = live_line_context(source_ip)
     for line in lines:
         route = find_syslog_route(source_ip)
         if not route:
             dropped += 1
             continue
+        sample = LIVE_LATENCY.start(route["case_id"], received)
         try:
-            record = parse_live_syslog_line(line, route["vendor"], source_ip=source_ip)
-            append_live_case_record(route["case_id"], record)
-            enqueue_rag_records(
+            with metrics.PARSE_SECONDS.time(route["vendor"]):
+                record = parse_live_syslog_line(line, route["vendor"], source_ip=source_ip, context=context)
+            LIVE_LATENCY.stamp(sample, "parsed")
+            with metrics.LIVE_APPEND_SECONDS.time():
+                _, live_range = append_live_case_record(route["case_id"], record)
+            LIVE_LATENCY.stamp(sample, "appended")
+            queue_live_entity_records(route["case_id"], [record])
+            if SEARCH_INDEX_ENABLED and live_range:
+                SEARCH_INDEX.append(route["case_id"], record, live_range[0])
+            samples = [sample] if sample is not None else []
+            LIVE_LATENCY.await_index(samples)
+            queued = enqueue_rag_records(
                 {
                     "sid": route["case_id"],
                     "label": route.get("label", "Live Syslog"),
@@ -1668,11 +2364,21 @@ def handle_syslog_datagram(data, addr):
                     "ingestion_mode": "syslog",
                 },
                 [record],
+                incremental=True,
+                live_range=live_range,
+                latency=samples,
             )
+            if not queued:
+                LIVE_LATENCY.abandon(samples)
             accepted += 1
+            metrics.INGEST_EVENTS.inc("syslog", route["vendor"])
         except Exception:
             errors += 1
 
+    if dropped:
+        metrics.INGEST_REJECTED.inc("syslog", "unrouted", amount=dropped)
+    if errors:
+        metrics.INGEST_REJECTED.inc("syslog", "error", amount=errors)
     state = get_syslog_listener_state()
     set_syslog_listener_state(
         state.get("status", "listening"),
@@ -1689,7 +2395,6 @@ def syslog_listener_loop():
     if not SYSLOG_ENABLED:
         set_syslog_listener_state("disabled", "Set EFLP_SYSLOG_ENABLED=true to enable UDP syslog ingestion.")
         return
-    refresh_syslog_routes_from_db()
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -1703,7 +2408,12 @@ def syslog_listener_loop():
             pass
         return
 
-    set_syslog_listener_state("listening", f"Listening for UDP syslog on {SYSLOG_BIND_HOST}:{SYSLOG_PORT}.")
+    # Bound before the route table is loaded: datagrams that arrive meanwhile
+    # wait in the socket buffer instead of being refused.
+    set_syslog_listener_state("starting", f"Bound UDP syslog on {SYSLOG_BIND_HOST}:{SYSLOG_PORT}; loading routes.")
+    refresh_syslog_routes_from_db()
+    if get_syslog_listener_state().get("status") == "starting":
+        set_syslog_listener_state("listening", f"Listening for UDP syslog on {SYSLOG_BIND_HOST}:{SYSLOG_PORT}.")
     last_refresh = time.time()
     while True:
         try:
@@ -1730,10 +2440,12 @@ def ensure_syslog_listener_started():
     SYSLOG_LISTENER_THREAD.start()
 
 
-def load_case_data(case_id):
+def load_case_data(case_id, start="", end=""):
     case = get_case_by_sid(case_id)
     if not case:
         return None, "Case not found."
+    if start or end:
+        return case, get_case_records_in_range(case, start, end)
     cached = get_cached_case_data(case_id)
     if cached is not None:
         return case, cached
@@ -1798,25 +2510,80 @@ def build_case_export_target(vendor, case_id):
     return f"{safe_vendor}_{safe_case[:16]}_logs"
 
 
-def normalized_records_for_case(case, parsed_data):
-    df = pd.DataFrame(parsed_data)
+def normalized_frame_for_case(case, parsed_data):
+    df = records_frame(parsed_data)
     if df.empty:
-        return []
+        return df
     norm_df = normalize_case_dataframe(df).drop(columns=["timestamp_dt"], errors="ignore")
     norm_df["case_id"] = case.get("sid", "")
     norm_df["case_label"] = case.get("label", "")
-    return norm_df.fillna("").to_dict("records")
+    return norm_df.fillna("")
+
+
+def normalized_records_for_case(case, parsed_data):
+    norm_df = normalized_frame_for_case(case, parsed_data)
+    return [] if norm_df.empty else norm_df.to_dict("records")
+
+
+@functools.lru_cache(maxsize=None)
+def codec_elasticsearch_serializers():
+    # Built on first use so the elasticsearch package is not imported at boot.
+    # helpers.bulk sends its body as NDJSON, so the NDJSON mimetypes (and the
+    # compatibility-mode variants of both) need the codec as well.
+    from elasticsearch.serializer import JSONSerializer, NdjsonSerializer
+
+    class CodecElasticsearchSerializer(JSONSerializer):
+        def dumps(self, data):
+            if isinstance(data, str):
+                return data.encode("utf-8", "surrogatepass")
+            if isinstance(data, bytes):
+                return data
+            return json_codec.dumpb(data)
+
+        def loads(self, data):
+            if data == b"":
+                return None
+            return json_codec.loads(data)
+
+    class CodecNdjsonSerializer(NdjsonSerializer):
+        def dumps(self, data):
+            if isinstance(data, (bytes, str)):
+                data = (data,)
+            buffer = bytearray()
+            for line in data:
+                if isinstance(line, str):
+                    line = line.encode("utf-8", "surrogatepass")
+                elif not isinstance(line, bytes):
+                    line = json_codec.dumpb(line)
+                buffer += line
+                if not line.endswith(b"\n"):
+                    buffer += b"\n"
+            return bytes(buffer)
+
+        def loads(self, data):
+            return [json_codec.loads(line) for line in re.split(rb"[\n\r]", data) if line]
+
+    json_serializer = CodecElasticsearchSerializer()
+    ndjson_serializer = CodecNdjsonSerializer()
+    return {
+        "application/json": json_serializer,
+        "application/vnd.elasticsearch+json": json_serializer,
+        "application/x-ndjson": ndjson_serializer,
+        "application/vnd.elasticsearch+x-ndjson": ndjson_serializer,
+    }
 
 
 def create_elasticsearch_client(url=None, username="", password=""):
+    from elasticsearch import Elasticsearch
+
     kwargs = {"request_timeout": 30}
     if username and password:
         kwargs["basic_auth"] = (username, password)
-    return Elasticsearch(url or ELASTICSEARCH_URL, **kwargs)
+    return Elasticsearch(url or ELASTICSEARCH_URL, serializers=codec_elasticsearch_serializers(), **kwargs)
 
 
 def sanitize_elasticsearch_export_record(record):
-    cleaned = json.loads(json.dumps(record, default=str))
+    cleaned = dict(record)
     typed_fields = {
         "timestamp", "severity_int", "src_ip", "dst_ip", "src_port", "dst_port",
         "srcip", "dstip", "srcport", "dstport",
@@ -1830,7 +2597,7 @@ def sanitize_elasticsearch_export_record(record):
 
 
 def rag_index_mapping():
-    return {
+    mapping = {
         "mappings": {
             "dynamic": False,
             "properties": {
@@ -1859,9 +2626,61 @@ def rag_index_mapping():
                 "record_id": {"type": "keyword"},
                 "event_id": {"type": "keyword"},
                 "rag_text": {"type": "text"},
+                "template": {"type": "text"},
+                "template_id": {"type": "keyword"},
+                "occurrences": {"type": "long"},
+                "first_seen": {"type": "date", "ignore_malformed": True},
+                "last_seen": {"type": "date", "ignore_malformed": True},
+                "bucket_start": {"type": "date", "ignore_malformed": True},
+                "sample_src_ips": {"type": "keyword"},
+                "sample_dst_ips": {"type": "keyword"},
             },
         }
     }
+    if RAG_VECTOR_ENABLED:
+        # The vector stays in _source: scripted template upserts rebuild the
+        # document from it, and one sent without a vector (embedding failed)
+        # keeps the stored one. Searches exclude it from hits instead.
+        mapping["mappings"]["properties"]["rag_vector"] = rag_vector_field_mapping()
+    return mapping
+
+
+def rag_vector_field_mapping():
+    return {
+        "type": "dense_vector",
+        "dims": RAG_EMBEDDING_DIMS,
+        "index": True,
+        "similarity": "cosine",
+    }
+
+
+def ensure_rag_index(client):
+    with metrics.backend_call("elasticsearch", "ensure_index"):
+        ensure_rag_index_mapping(client)
+
+
+def ensure_rag_index_mapping(client):
+    global RAG_INDEX_MAPPING_READY
+    if not client.indices.exists(index=ELASTICSEARCH_INDEX):
+        client.indices.create(index=ELASTICSEARCH_INDEX, body=rag_index_mapping())
+        RAG_INDEX_MAPPING_READY = True
+        return
+    if RAG_INDEX_MAPPING_READY:
+        return
+    current = client.indices.get_mapping(index=ELASTICSEARCH_INDEX)
+    properties = {}
+    excluded = set()
+    for index_mapping in dict(current).values():
+        properties.update(index_mapping.get("mappings", {}).get("properties", {}))
+        excluded.update(index_mapping.get("mappings", {}).get("_source", {}).get("excludes", []))
+    if "rag_vector" in excluded:
+        # _source excludes cannot be changed on an existing index.
+        update_rag_state(last_error=f"{ELASTICSEARCH_INDEX} excludes rag_vector from _source; template updates drop vectors until the index is recreated.")
+    expected = rag_index_mapping()["mappings"]["properties"]
+    missing = {name: spec for name, spec in expected.items() if name not in properties}
+    if missing:
+        client.indices.put_mapping(index=ELASTICSEARCH_INDEX, properties=missing)
+    RAG_INDEX_MAPPING_READY = True
 
 
 def update_rag_state(status=None, message=None, indexed_delta=0, failed_delta=0, **extra):
@@ -1890,33 +2709,280 @@ def get_rag_state():
 
 
 def rag_text_for_record(record):
-    fields = [
-        "case_label", "vendor", "timestamp", "severity", "log_category", "event",
-        "action", "outcome", "src_ip", "src_port", "dst_ip", "dst_port", "protocol",
-        "user", "rule", "signature", "message", "raw_message",
-    ]
     chunks = []
-    for field in fields:
+    for field in RAG_TEXT_FIELDS:
         value = record.get(field, "")
         if value not in (None, ""):
             chunks.append(f"{field}: {value}")
     return " | ".join(chunks)
 
 
-def prepare_rag_documents(case, records):
+def rag_embedding_text(record):
+    return " ".join(
+        str(record.get(field, ""))
+        for field in RAG_TEXT_FIELDS
+        if field != "timestamp" and record.get(field, "") not in (None, "")
+    )
+
+
+def rag_embedding_features(text):
+    features = {}
+    previous = ""
+    for token in RAG_EMBEDDING_TOKEN_RE.findall(str(text or "").lower()[:4000]):
+        features[token] = features.get(token, 0.0) + 1.0
+        if IPV4_TEXT_REGEX.fullmatch(token):
+            subnet = "net:" + token.rsplit(".", 1)[0]
+            features[subnet] = features.get(subnet, 0.0) + 0.5
+        elif len(token) > 4 and not token.isdigit():
+            padded = f"<{token}>"
+            for idx in range(len(padded) - 2):
+                gram = "#" + padded[idx:idx + 3]
+                features[gram] = features.get(gram, 0.0) + 0.25
+        if previous:
+            bigram = previous + " " + token
+            features[bigram] = features.get(bigram, 0.0) + 0.5
+        previous = token
+    return features
+
+
+def hashed_embed_texts(texts):
+    vectors = []
+    for text in texts:
+        vector = [0.0] * RAG_EMBEDDING_DIMS
+        for feature, count in rag_embedding_features(text).items():
+            hashed = zlib.crc32(feature.encode("utf-8"))
+            weight = 1.0 + math.log(count) if count > 1.0 else count
+            vector[hashed % RAG_EMBEDDING_DIMS] += -weight if hashed & 0x80000000 else weight
+        norm = math.sqrt(sum(value * value for value in vector))
+        vectors.append([round(value / norm, 6) for value in vector] if norm else None)
+    return vectors
+
+
+def ollama_embed_texts(texts):
+    req = urllib_request.Request(
+        f"{OLLAMA_URL}/api/embed",
+        data=json.dumps({"model": OLLAMA_EMBED_MODEL, "input": list(texts), "keep_alive": "10m"}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with metrics.backend_call("ollama", "embed"), urllib_request.urlopen(req, timeout=OLLAMA_TIMEOUT_SECONDS) as response:
+            result = json.loads(response.read().decode("utf-8"))
+    except urllib_error.HTTPError as exc:
+        details = exc.read().decode("utf-8", errors="replace")
+        raise RuntimeError(f"Ollama embedding returned HTTP {exc.code}: {details[:500]}") from exc
+    except urllib_error.URLError as exc:
+        raise RuntimeError(f"Unable to reach Ollama at {OLLAMA_URL}: {exc.reason}") from exc
+    vectors = result.get("embeddings") or []
+    if len(vectors) != len(texts):
+        raise RuntimeError("Ollama returned an unexpected number of embeddings.")
+    for vector in vectors:
+        if len(vector) != RAG_EMBEDDING_DIMS:
+            raise RuntimeError(
+                f"Ollama model {OLLAMA_EMBED_MODEL} returned {len(vector)} dimensions; "
+                f"set EFLP_RAG_EMBEDDING_DIMS={len(vector)}."
+            )
+    return vectors
+
+
+RAG_EMBEDDING_BACKENDS = {
+    "hashed": hashed_embed_texts,
+    "ollama": ollama_embed_texts,
+}
+
+
+def embed_rag_texts(texts):
+    backend = RAG_EMBEDDING_BACKENDS.get(RAG_EMBEDDING_BACKEND)
+    if backend is None:
+        raise ValueError(f"Unknown RAG embedding backend '{RAG_EMBEDDING_BACKEND}'.")
+    vectors = []
+    texts = list(texts)
+    for start in range(0, len(texts), RAG_EMBEDDING_BATCH):
+        vectors.extend(backend(texts[start:start + RAG_EMBEDDING_BATCH]))
+    return vectors
+
+
+def rag_action_source(action):
+    return action["upsert"] if action.get("_op_type") == "update" else action["_source"]
+
+
+def attach_rag_vectors(documents):
+    if not RAG_VECTOR_ENABLED or not documents:
+        return documents
+    try:
+        vectors = embed_rag_texts([rag_embedding_text(rag_action_source(doc)) for doc in documents])
+    except Exception as exc:
+        update_rag_state(last_error=f"Embedding failed; indexed without vectors: {exc}"[:500])
+        return documents
+    for doc, vector in zip(documents, vectors):
+        if vector:
+            rag_action_source(doc)["rag_vector"] = vector
+            if doc.get("_op_type") == "update":
+                doc["script"]["params"]["rag_vector"] = vector
+    return documents
+
+
+def get_rag_template_miner(case_id, incremental=False):
+    if not incremental:
+        return LogTemplateMiner(
+            similarity=RAG_TEMPLATE_SIMILARITY,
+            max_clusters=RAG_TEMPLATE_MAX_CLUSTERS,
+            namespace=case_id,
+        )
+    miner = RAG_TEMPLATE_MINERS.get(case_id)
+    if miner is None:
+        miner = LogTemplateMiner(
+            similarity=RAG_TEMPLATE_SIMILARITY,
+            max_clusters=RAG_TEMPLATE_MAX_CLUSTERS,
+            namespace=case_id,
+        )
+        RAG_TEMPLATE_MINERS[case_id] = miner
+        # An evicted case starts a fresh miner; template ids only depend on
+        # the template text, so its documents keep being updated in place.
+        while len(RAG_TEMPLATE_MINERS) > RAG_TEMPLATE_MINER_CASES:
+            RAG_TEMPLATE_MINERS.popitem(last=False)
+    else:
+        RAG_TEMPLATE_MINERS.move_to_end(case_id)
+    return miner
+
+
+def rag_template_bucket(timestamp):
+    text = str(timestamp or "")
+    if not RAG_ISO_TIMESTAMP_RE.match(text):
+        return ""
+    try:
+        parsed = datetime.strptime(text, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return ""
+    span = RAG_TEMPLATE_BUCKET_MINUTES * 60
+    floored = int(parsed.timestamp()) // span * span
+    return datetime.fromtimestamp(floored, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def add_rag_template_sample(samples, value):
+    text = str(value or "").strip()
+    if text and text not in samples and len(samples) < RAG_TEMPLATE_SAMPLE_IPS:
+        samples.append(text)
+
+
+def prepare_rag_template_documents(case, normalized, incremental=False, chunk=None):
+    case_id = str(case.get("sid", ""))
+    groups = {}
+    with RAG_TEMPLATE_LOCK:
+        miner = get_rag_template_miner(case_id, incremental=incremental)
+        for record in normalized:
+            cluster = miner.add(record.get("message") or record.get("raw_message") or record.get("event"))
+            timestamp = str(record.get("timestamp", "") or "")
+            key = (
+                cluster["key"],
+                rag_template_bucket(timestamp),
+                str(record.get("severity", "")),
+                str(record.get("outcome", "")),
+            )
+            group = groups.get(key)
+            if group is None:
+                group = {"sample": record, "count": 0, "first": "", "last": "", "src": [], "dst": []}
+                groups[key] = group
+            group["count"] += 1
+            if RAG_ISO_TIMESTAMP_RE.match(timestamp):
+                if not group["first"] or timestamp < group["first"]:
+                    group["first"] = timestamp
+                if not group["last"] or timestamp > group["last"]:
+                    group["last"] = timestamp
+            add_rag_template_sample(group["src"], record.get("src_ip"))
+            add_rag_template_sample(group["dst"], record.get("dst_ip"))
+        templates = {}
+        for cluster_key in {key[0] for key in groups}:
+            templates[cluster_key] = (miner.template_id(cluster_key), miner.template(cluster_key))
+
+    # Clusters that generalized to the same template share one document.
+    merged = {}
+    for key, group in groups.items():
+        cluster_id, template = templates[key[0]]
+        merged_key = (cluster_id,) + key[1:]
+        current = merged.get(merged_key)
+        if current is None:
+            merged[merged_key] = dict(group, template=template)
+            continue
+        current["count"] += group["count"]
+        current["first"] = min(filter(None, (current["first"], group["first"])), default="")
+        current["last"] = max(current["last"], group["last"])
+        for value in group["src"]:
+            add_rag_template_sample(current["src"], value)
+        for value in group["dst"]:
+            add_rag_template_sample(current["dst"], value)
+
+    documents = []
+    for key, group in merged.items():
+        cluster_id, bucket, severity, outcome = key
+        record = dict(group["sample"])
+        record.update(rag_case_fields(case, record))
+        record["template"] = group["template"]
+        record["template_id"] = cluster_id
+        record["occurrences"] = group["count"]
+        record["first_seen"] = group["first"] or None
+        record["last_seen"] = group["last"] or None
+        record["bucket_start"] = bucket or None
+        record["sample_src_ips"] = group["src"]
+        record["sample_dst_ips"] = group["dst"]
+        if group["first"]:
+            record["timestamp"] = group["first"]
+        record["rag_text"] = rag_text_for_record(record)
+        if record["sample_src_ips"] or record["sample_dst_ips"]:
+            record["rag_text"] += " | sample_ips: " + " ".join(record["sample_src_ips"] + record["sample_dst_ips"])
+        document_id = hashlib.sha256(
+            json.dumps([case_id, cluster_id, bucket, severity, outcome]).encode("utf-8")
+        ).hexdigest()
+        if not incremental:
+            documents.append({"_index": ELASTICSEARCH_INDEX, "_id": document_id, "_source": record})
+            continue
+        if chunk is not None:
+            record["applied_chunk"] = chunk
+        documents.append({
+            "_op_type": "update",
+            "_index": ELASTICSEARCH_INDEX,
+            "_id": document_id,
+            "script": {
+                "lang": "painless",
+                "source": RAG_TEMPLATE_UPDATE_SCRIPT,
+                "params": {
+                    "count": group["count"],
+                    "first_seen": record["first_seen"],
+                    "last_seen": record["last_seen"],
+                    "sample_src_ips": record["sample_src_ips"],
+                    "sample_dst_ips": record["sample_dst_ips"],
+                    "sample_limit": RAG_TEMPLATE_SAMPLE_IPS,
+                    "template": record["template"],
+                    "rag_text": record["rag_text"],
+                    "indexed_at": record["indexed_at"],
+                    "rag_vector": None,
+                    "chunk": chunk,
+                },
+            },
+            "upsert": record,
+        })
+    return documents
+
+
+def rag_case_fields(case, record):
+    return {
+        "case_id": str(case.get("sid", "")),
+        "case_label": str(case.get("label", "")),
+        "vendor": record.get("vendor") or str(case.get("vendor", "")),
+        "ingestion_mode": record.get("ingestion_mode") or str(case.get("ingestion_mode", "upload") or "upload"),
+        "indexed_at": utc_now_iso(),
+    }
+
+
+def prepare_rag_documents(case, records, incremental=False, chunk=None):
     documents = []
     case_id = str(case.get("sid", ""))
-    case_label = str(case.get("label", ""))
-    vendor = str(case.get("vendor", ""))
-    ingestion_mode = str(case.get("ingestion_mode", "upload") or "upload")
     normalized = normalized_records_for_case(case, records)
+    if RAG_TEMPLATES_ENABLED:
+        return attach_rag_vectors(prepare_rag_template_documents(case, normalized, incremental=incremental, chunk=chunk))
     for position, raw_record in enumerate(normalized):
-        record = json.loads(json.dumps(raw_record, default=str))
-        record["case_id"] = case_id
-        record["case_label"] = case_label
-        record["vendor"] = record.get("vendor") or vendor
-        record["ingestion_mode"] = record.get("ingestion_mode") or ingestion_mode
-        record["indexed_at"] = utc_now_iso()
+        record = dict(raw_record)
+        record.update(rag_case_fields(case, record))
         record["rag_text"] = rag_text_for_record(record)
         identity = {
             "case_id": case_id,
@@ -1931,40 +2997,304 @@ def prepare_rag_documents(case, records):
             json.dumps(identity, sort_keys=True, default=str).encode("utf-8")
         ).hexdigest()
         documents.append({"_index": ELASTICSEARCH_INDEX, "_id": document_id, "_source": record})
-    return documents
+    return attach_rag_vectors(documents)
 
 
-def index_rag_records(case, records):
+def index_rag_records(case, records, incremental=False, chunk=None, strict=False):
     if not RAG_ENABLED or not records:
         return 0
+    from elasticsearch import helpers
+
     client = create_elasticsearch_client()
-    if not client.indices.exists(index=ELASTICSEARCH_INDEX):
-        client.indices.create(index=ELASTICSEARCH_INDEX, body=rag_index_mapping())
-    actions = prepare_rag_documents(case, records)
+    ensure_rag_index(client)
+    actions = prepare_rag_documents(case, records, incremental=incremental, chunk=chunk)
     if not actions:
         return 0
-    succeeded, errors = helpers.bulk(
-        client.options(request_timeout=60),
-        actions,
-        chunk_size=500,
-        raise_on_error=False,
-    )
+    with metrics.backend_call("elasticsearch", "bulk"):
+        succeeded, errors = helpers.bulk(
+            client.options(request_timeout=60),
+            actions,
+            chunk_size=500,
+            raise_on_error=False,
+        )
     if errors:
         update_rag_state(failed_delta=1, last_error=str(errors[0])[:500])
+        if strict:
+            # Sync chunks are retried as a whole, so nothing may be recorded
+            # as indexed past a chunk with failed documents.
+            raise RuntimeError(f"{len(errors)} RAG document(s) failed to index: {str(errors[0])[:300]}")
     update_rag_state(
         status="ready",
-        message=f"Indexed {succeeded} record(s) for case {case.get('label', case.get('sid', ''))}.",
+        message=f"Indexed {len(records)} record(s) as {succeeded} document(s) for case {case.get('label', case.get('sid', ''))}.",
         indexed_delta=succeeded,
     )
     return succeeded
 
 
+def rag_index_version():
+    templates = RAG_TEMPLATE_BUCKET_MINUTES if RAG_TEMPLATES_ENABLED else 0
+    vector = f"{RAG_EMBEDDING_BACKEND}:{RAG_EMBEDDING_DIMS}" if RAG_VECTOR_ENABLED else "none"
+    return f"{RAG_NORMALIZATION_VERSION}|templates={templates}|vector={vector}"
+
+
+def get_rag_watermark(case_id):
+    safe_case_id, watermark_path = resolve_case_sidecar_path(case_id, "rag")
+    if not safe_case_id:
+        return {}
+    with RAG_WATERMARK_LOCK:
+        watermark = RAG_WATERMARKS.get(safe_case_id)
+        if watermark is None:
+            watermark = {}
+            if os.path.exists(watermark_path):
+                try:
+                    with open(watermark_path, "r", encoding="utf-8") as fh:
+                        loaded = json.load(fh)
+                    if isinstance(loaded, dict):
+                        watermark = loaded
+                except Exception:
+                    watermark = {}
+            RAG_WATERMARKS[safe_case_id] = watermark
+        copied = dict(watermark)
+        copied["live_ranges"] = [list(item) for item in watermark.get("live_ranges", [])]
+        return copied
+
+
+def save_rag_watermark(case_id, watermark, flush=True):
+    safe_case_id, watermark_path = resolve_case_sidecar_path(case_id, "rag")
+    if not safe_case_id:
+        return
+    now = time.time()
+    with RAG_WATERMARK_LOCK:
+        previous = RAG_WATERMARKS.get(safe_case_id) or {}
+        state = dict(watermark)
+        state["updated"] = now
+        state["flushed"] = previous.get("flushed", 0)
+        RAG_WATERMARKS[safe_case_id] = state
+        if not flush and now - float(state["flushed"] or 0) < RAG_WATERMARK_FLUSH_SECONDS:
+            return
+        state["flushed"] = now
+        try:
+            temp_path = f"{watermark_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as fh:
+                json.dump(state, fh)
+            os.replace(temp_path, watermark_path)
+        except Exception:
+            pass
+
+
+def merge_byte_ranges(ranges):
+    merged = []
+    for start, end in sorted((int(item[0]), int(item[1])) for item in ranges if item and int(item[1]) > int(item[0])):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def missing_byte_ranges(ranges, size):
+    missing = []
+    position = 0
+    for start, end in merge_byte_ranges(ranges):
+        if start >= size:
+            break
+        if start > position:
+            missing.append((position, start))
+        position = max(position, end)
+    if position < size:
+        missing.append((position, size))
+    return missing
+
+
+def rag_live_range_indexed(case_id, live_range):
+    start, end = live_range
+    for covered_start, covered_end in get_rag_watermark(case_id).get("live_ranges", []):
+        if covered_start <= start and end <= covered_end:
+            return True
+    return False
+
+
+def mark_rag_live_range(case_id, live_range, flush=False):
+    with RAG_WATERMARK_LOCK:
+        watermark = get_rag_watermark(case_id)
+        # A live case that predates watermarks keeps an empty version so the
+        # next sync rebuilds it instead of trusting a partial range list.
+        if "version" not in watermark and int(live_range[0]) == 0:
+            watermark["version"] = rag_index_version()
+        watermark["live_ranges"] = merge_byte_ranges(watermark.get("live_ranges", []) + [list(live_range)])
+        save_rag_watermark(case_id, watermark, flush=flush)
+
+
+def rag_case_fingerprint(case):
+    path = str(case.get("path", "") or "")
+    digest = hashlib.sha1(path.encode("utf-8"))
+    try:
+        stat = os.stat(path)
+        digest.update(f"|{stat.st_size}|{stat.st_mtime_ns}".encode("utf-8"))
+        with open(path, "rb") as fh:
+            digest.update(fh.read(65536))
+            if stat.st_size > 65536:
+                fh.seek(max(65536, stat.st_size - 65536))
+                digest.update(fh.read(65536))
+    except OSError:
+        pass
+    return digest.hexdigest()
+
+
+def delete_rag_case_documents(case_id):
+    client = create_elasticsearch_client()
+    ensure_rag_index(client)
+    with metrics.backend_call("elasticsearch", "delete_by_query"):
+        client.options(request_timeout=120).delete_by_query(
+            index=ELASTICSEARCH_INDEX,
+            query={"term": {"case_id": str(case_id)}},
+            conflicts="proceed",
+            refresh=True,
+        )
+    with RAG_TEMPLATE_LOCK:
+        RAG_TEMPLATE_MINERS.pop(str(case_id), None)
+
+
+def sync_upload_case_rag_index(case, watermark, version):
+    case_id = str(case.get("sid", ""))
+    fingerprint = rag_case_fingerprint(case)
+    current = watermark.get("version") == version and watermark.get("fingerprint") == fingerprint
+    if current and watermark.get("complete"):
+        return 0, True
+    if not current:
+        delete_rag_case_documents(case_id)
+        watermark = {"version": version, "fingerprint": fingerprint, "records_indexed": 0, "complete": False}
+        save_rag_watermark(case_id, watermark)
+    records = get_cached_case_data(case_id)
+    if records is None:
+        loaded_case, records = load_case_data(case_id)
+        if not loaded_case:
+            raise RuntimeError(records)
+    indexed = 0
+    position = min(int(watermark.get("records_indexed", 0)), len(records))
+    try:
+        # Chunks go through the incremental (upsert) path so a resumed case
+        # adds to the template counts written before the restart; the chunk
+        # key makes re-sending the chunk in flight at a crash harmless, and a
+        # chunk with failed documents stops the sync before the watermark
+        # moves past it.
+        while position < len(records):
+            chunk = records[position:position + RAG_SYNC_CHUNK_RECORDS]
+            chunk_key = f"records:{position}-{position + len(chunk)}"
+            indexed += index_rag_records(case, chunk, incremental=True, chunk=chunk_key, strict=True)
+            position += len(chunk)
+            watermark["records_indexed"] = position
+            save_rag_watermark(case_id, watermark)
+    finally:
+        with RAG_TEMPLATE_LOCK:
+            RAG_TEMPLATE_MINERS.pop(case_id, None)
+    watermark["complete"] = True
+    save_rag_watermark(case_id, watermark)
+    return indexed, False
+
+
+def sync_live_case_rag_index(case, watermark, version):
+    case_id = str(case.get("sid", ""))
+    if watermark.get("version") != version:
+        delete_rag_case_documents(case_id)
+        with RAG_WATERMARK_LOCK:
+            save_rag_watermark(case_id, {"version": version, "live_ranges": []})
+        watermark = get_rag_watermark(case_id)
+    store = get_live_segment_store(case_id)
+    if store is None:
+        return 0, True
+    # Offsets below the first retained segment were removed by retention.
+    covered = watermark.get("live_ranges", []) + [[0, store.first_offset()]]
+    gaps = missing_byte_ranges(covered, store.size())
+    if not gaps:
+        return 0, True
+    indexed = 0
+    for gap_start, gap_end in gaps:
+        position = chunk_start = gap_start
+        chunk = []
+        for offset, line in store.iter_lines(gap_start, gap_end):
+            if not line.endswith(b"\n"):
+                break
+            position = offset + len(line)
+            try:
+                item = json_codec.loads(line)
+            except ValueError:
+                item = None
+            if isinstance(item, dict):
+                chunk.append(item)
+            if len(chunk) >= RAG_SYNC_CHUNK_RECORDS:
+                chunk_key = f"bytes:{chunk_start}-{position}"
+                indexed += index_rag_records(case, chunk, incremental=True, chunk=chunk_key, strict=True)
+                mark_rag_live_range(case_id, (chunk_start, position), flush=True)
+                chunk = []
+                chunk_start = position
+        if position > chunk_start:
+            chunk_key = f"bytes:{chunk_start}-{position}"
+            indexed += index_rag_records(case, chunk, incremental=True, chunk=chunk_key, strict=True)
+            mark_rag_live_range(case_id, (chunk_start, position), flush=True)
+    return indexed, False
+
+
+def sync_case_rag_index_once(case):
+    version = rag_index_version()
+    watermark = get_rag_watermark(str(case.get("sid", "")))
+    if is_live_case(case):
+        return sync_live_case_rag_index(case, watermark, version)
+    return sync_upload_case_rag_index(case, watermark, version)
+
+
+def sync_case_rag_index(case):
+    # One sync per case at a time: two concurrent runs would both upsert the
+    # same template counts and drop each other's miner. A request that comes
+    # in while a sync runs is folded into one more pass by the running thread.
+    case_id = str(case.get("sid", ""))
+    with RAG_SYNC_LOCK:
+        if case_id in RAG_SYNC_ACTIVE:
+            RAG_SYNC_ACTIVE[case_id] = True
+            return 0, True
+        RAG_SYNC_ACTIVE[case_id] = False
+    indexed = 0
+    unchanged = True
+    try:
+        while True:
+            count, skipped = sync_case_rag_index_once(case)
+            indexed += count
+            unchanged = unchanged and skipped
+            with RAG_SYNC_LOCK:
+                if not RAG_SYNC_ACTIVE[case_id]:
+                    del RAG_SYNC_ACTIVE[case_id]
+                    return indexed, unchanged
+                RAG_SYNC_ACTIVE[case_id] = False
+    except Exception:
+        with RAG_SYNC_LOCK:
+            RAG_SYNC_ACTIVE.pop(case_id, None)
+        raise
+
+
 def rag_index_worker():
     while True:
         item = RAG_INDEX_QUEUE.get()
+        kind = "sync" if item.get("sync") else "records"
+        started = time.perf_counter()
         try:
             update_rag_state(status="indexing", message="Indexing newly ingested records for RAG.")
-            index_rag_records(item["case"], item["records"])
+            case = item["case"]
+            live_range = item.get("live_range")
+            if item.get("sync"):
+                sync_case_rag_index(case)
+            elif not live_range or not rag_live_range_indexed(case.get("sid", ""), live_range):
+                # One record maps to one document, so a retry cannot count
+                # it twice; failures leave the range unmarked for the retry.
+                index_rag_records(
+                    case,
+                    item["records"],
+                    incremental=item.get("incremental", False),
+                    strict=bool(live_range),
+                )
+                metrics.RAG_BATCH_RECORDS.inc(kind, amount=len(item["records"]))
+                if live_range:
+                    mark_rag_live_range(case.get("sid", ""), live_range)
+            LIVE_LATENCY.indexed(item.get("latency") or [])
         except Exception as exc:
             attempts = int(item.get("attempts", 0)) + 1
             update_rag_state(
@@ -1979,8 +3309,12 @@ def rag_index_worker():
                 try:
                     RAG_INDEX_QUEUE.put_nowait(item)
                 except queue.Full:
+                    LIVE_LATENCY.abandon(item.get("latency") or [])
                     update_rag_state(message="RAG retry queue is full; run a full sync from the chat page.")
+            else:
+                LIVE_LATENCY.abandon(item.get("latency") or [])
         finally:
+            metrics.RAG_BATCH_SECONDS.observe(time.perf_counter() - started, kind)
             RAG_INDEX_QUEUE.task_done()
 
 
@@ -1992,14 +3326,15 @@ def ensure_rag_worker_started():
         return
     RAG_INDEX_THREAD = threading.Thread(target=rag_index_worker, daemon=True)
     RAG_INDEX_THREAD.start()
+    resume_rag_sync()
 
 
-def enqueue_rag_records(case, records):
-    if not RAG_ENABLED or not records:
+def enqueue_rag_item(item):
+    if not RAG_ENABLED:
         return False
     ensure_rag_worker_started()
     try:
-        RAG_INDEX_QUEUE.put_nowait({"case": dict(case), "records": list(records), "attempts": 0})
+        RAG_INDEX_QUEUE.put_nowait(item)
         return True
     except queue.Full:
         update_rag_state(
@@ -2010,22 +3345,87 @@ def enqueue_rag_records(case, records):
         return False
 
 
-def reindex_all_cases_background():
+def enqueue_rag_records(case, records, incremental=False, live_range=None, latency=None):
+    if not records:
+        return False
+    return enqueue_rag_item({
+        "case": dict(case),
+        "records": list(records),
+        "incremental": bool(incremental),
+        "live_range": live_range,
+        "latency": latency or [],
+        "attempts": 0,
+    })
+
+
+def enqueue_rag_case_sync(case):
+    return enqueue_rag_item({"case": dict(case), "sync": True, "attempts": 0})
+
+
+def read_rag_sync_checkpoint():
+    if not os.path.exists(RAG_SYNC_CHECKPOINT_PATH):
+        return None
     try:
-        cases = get_all_cases()
-        update_rag_state(status="syncing", message=f"Syncing {len(cases)} case(s) into the RAG index.")
+        with open(RAG_SYNC_CHECKPOINT_PATH, "r", encoding="utf-8") as fh:
+            loaded = json.load(fh)
+        return loaded if isinstance(loaded, dict) else None
+    except Exception:
+        return None
+
+
+def write_rag_sync_checkpoint(checkpoint):
+    try:
+        temp_path = f"{RAG_SYNC_CHECKPOINT_PATH}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as fh:
+            json.dump(checkpoint, fh)
+        os.replace(temp_path, RAG_SYNC_CHECKPOINT_PATH)
+    except Exception:
+        pass
+
+
+def reindex_all_cases_background(case_ids=None):
+    try:
+        cases = [case for case in get_all_cases() if case.get("sid")]
+        if case_ids is not None:
+            wanted = set(case_ids)
+            cases = [case for case in cases if case.get("sid") in wanted]
+        checkpoint = {
+            "status": "running",
+            "started": time.time(),
+            "pending": [case["sid"] for case in cases],
+            "completed": 0,
+            "total": len(cases),
+        }
+        write_rag_sync_checkpoint(checkpoint)
+        update_rag_state(
+            status="syncing",
+            message=f"Syncing {len(cases)} case(s) into the RAG index with {RAG_SYNC_WORKERS} worker(s).",
+        )
         total = 0
+        unchanged = 0
         failures = []
-        for case in cases:
-            loaded_case, records = load_case_data(str(case.get("sid", "")))
-            if not loaded_case:
-                failures.append(str(case.get("sid", "unknown")))
-                continue
-            try:
-                total += index_rag_records(loaded_case, records)
-            except Exception as exc:
-                failures.append(f"{case.get('sid', 'unknown')}: {exc}")
-        message = f"RAG sync complete: {total} record(s) indexed."
+        with ThreadPoolExecutor(max_workers=RAG_SYNC_WORKERS) as executor:
+            futures = {executor.submit(sync_case_rag_index, case): case["sid"] for case in cases}
+            for future in as_completed(futures):
+                case_id = futures[future]
+                try:
+                    indexed, skipped = future.result()
+                    total += indexed
+                    unchanged += int(skipped)
+                except Exception as exc:
+                    failures.append(f"{case_id}: {exc}")
+                checkpoint["pending"].remove(case_id)
+                checkpoint["completed"] += 1
+                write_rag_sync_checkpoint(checkpoint)
+                update_rag_state(
+                    status="syncing",
+                    message=f"Synced {checkpoint['completed']} of {len(cases)} case(s) into the RAG index.",
+                )
+        try:
+            os.remove(RAG_SYNC_CHECKPOINT_PATH)
+        except OSError:
+            pass
+        message = f"RAG sync complete: {total} document(s) indexed, {unchanged} case(s) already up to date."
         if failures:
             message += f" {len(failures)} case(s) failed."
         update_rag_state(
@@ -2037,22 +3437,30 @@ def reindex_all_cases_background():
         update_rag_state(status="degraded", message=f"RAG sync failed: {exc}", last_error=str(exc), failed_delta=1)
 
 
-def start_rag_reindex():
+def start_rag_reindex(case_ids=None):
     global RAG_REINDEX_THREAD
     if not RAG_ENABLED:
         return False
     if RAG_REINDEX_THREAD and RAG_REINDEX_THREAD.is_alive():
         return False
-    RAG_REINDEX_THREAD = threading.Thread(target=reindex_all_cases_background, daemon=True)
+    RAG_REINDEX_THREAD = threading.Thread(target=reindex_all_cases_background, args=(case_ids,), daemon=True)
     RAG_REINDEX_THREAD.start()
     return True
 
 
+def resume_rag_sync():
+    checkpoint = read_rag_sync_checkpoint()
+    if checkpoint and checkpoint.get("status") == "running" and checkpoint.get("pending"):
+        start_rag_reindex(case_ids=list(checkpoint["pending"]))
+
+
 def search_rag_records(question, case_id=""):
     if not RAG_ENABLED or not str(question or "").strip():
         return []
     client = create_elasticsearch_client()
-    if not client.indices.exists(index=ELASTICSEARCH_INDEX):
+    with metrics.backend_call("elasticsearch", "exists"):
+        exists = client.indices.exists(index=ELASTICSEARCH_INDEX)
+    if not exists:
         return []
     filters = []
     if case_id:
@@ -2062,7 +3470,7 @@ def search_rag_records(question, case_id=""):
             "must": [{
                 "multi_match": {
                     "query": str(question)[:2000],
-                    "fields": ["rag_text^4", "message^3", "raw_message^2", "event^2", "rule", "user", "case_label"],
+                    "fields": ["rag_text^4", "message^3", "template^2", "raw_message^2", "event^2", "rule", "user", "case_label"],
                     "type": "best_fields",
                     "operator": "or",
                     "lenient": True,
@@ -2071,16 +3479,193 @@ def search_rag_records(question, case_id=""):
             "filter": filters,
         }
     }
-    response = client.search(index=ELASTICSEARCH_INDEX, body={"size": RAG_TOP_K, "query": query})
-    return [hit.get("_source", {}) for hit in response.get("hits", {}).get("hits", [])]
-
-
-def build_rag_context(records):
+    if not RAG_VECTOR_ENABLED:
+        with metrics.backend_call("elasticsearch", "search"):
+            response = client.search(index=ELASTICSEARCH_INDEX, body={"size": RAG_TOP_K, "query": query})
+        return [hit.get("_source", {}) for hit in response.get("hits", {}).get("hits", [])]
+
+    window = min(RAG_KNN_CANDIDATES, max(RAG_TOP_K * 4, 20))
+    source_filter = {"excludes": ["rag_vector"]}
+    with metrics.backend_call("elasticsearch", "search"):
+        response = client.search(
+            index=ELASTICSEARCH_INDEX,
+            body={"size": window, "query": query, "_source": source_filter},
+        )
+    ranked_lists = [response.get("hits", {}).get("hits", [])]
+    try:
+        vector = embed_rag_texts([str(question)[:2000]])[0]
+        if vector:
+            knn = {
+                "field": "rag_vector",
+                "query_vector": vector,
+                "k": window,
+                "num_candidates": max(RAG_KNN_CANDIDATES, window),
+            }
+            if filters:
+                knn["filter"] = {"bool": {"filter": filters}}
+            with metrics.backend_call("elasticsearch", "knn_search"):
+                knn_response = client.search(
+                    index=ELASTICSEARCH_INDEX,
+                    body={"size": window, "knn": knn, "_source": source_filter},
+                )
+            ranked_lists.append(knn_response.get("hits", {}).get("hits", []))
+    except Exception as exc:
+        update_rag_state(last_error=f"Vector retrieval unavailable; using BM25 only: {exc}"[:500])
+    return [hit.get("_source", {}) for hit in reciprocal_rank_fusion(ranked_lists, limit=RAG_TOP_K)]
+
+
+def reciprocal_rank_fusion(ranked_lists, limit=RAG_TOP_K, k=RAG_RRF_K):
+    scores = {}
+    hits = {}
+    for ranked in ranked_lists:
+        for rank, hit in enumerate(ranked, start=1):
+            hit_id = hit.get("_id") or id(hit)
+            scores[hit_id] = scores.get(hit_id, 0.0) + 1.0 / (k + rank)
+            hits.setdefault(hit_id, hit)
+    ordered = sorted(scores, key=lambda hit_id: scores[hit_id], reverse=True)
+    return [hits[hit_id] for hit_id in ordered[:int(limit)]]
+
+
+def estimate_tokens(text):
+    # BPE vocabularies split long alphabetic runs into ~4 character pieces and
+    # emit most digits and punctuation as their own tokens.
+    total = 0
+    for piece in RAG_TOKEN_PIECE_RE.findall(str(text or "")):
+        if piece.isdigit():
+            total += (len(piece) + 2) // 3
+        elif len(piece) > 4:
+            total += (len(piece) + 3) // 4
+        else:
+            total += 1
+    return total
+
+
+def truncate_to_tokens(text, max_tokens):
+    text = str(text or "")
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) + 1 <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low].rstrip() + "…"
+
+
+def rag_context_token_budget(messages):
+    history_tokens = sum(estimate_tokens(item.get("content", "")) + 4 for item in messages or [])
+    available = OLLAMA_NUM_CTX - estimate_tokens(RAG_SYSTEM_PROMPT) - history_tokens - RAG_ANSWER_RESERVE_TOKENS
+    if RAG_CONTEXT_TOKENS:
+        available = min(available, RAG_CONTEXT_TOKENS)
+    return max(0, available)
+
+
+def rag_context_legend(records):
+    prefix_counts = {}
+    case_ids = []
+    for record in records:
+        text = " ".join(
+            str(record.get(field) or "")
+            for field in ("src_ip", "dst_ip", "message")
+        ) + " " + " ".join(record.get("sample_src_ips") or []) + " " + " ".join(record.get("sample_dst_ips") or [])
+        for prefix, _ in RAG_CONTEXT_IPV4_RE.findall(text):
+            prefix_counts[prefix] = prefix_counts.get(prefix, 0) + 1
+        case_id = str(record.get("case_id", ""))
+        if case_id and case_id not in case_ids:
+            case_ids.append(case_id)
+    prefixes = sorted((prefix for prefix, count in prefix_counts.items() if count > 1), key=lambda p: -prefix_counts[p])
+    ip_aliases = {prefix: f"n{idx}" for idx, prefix in enumerate(prefixes, start=1)}
+    case_aliases = {case_id: f"C{idx}" for idx, case_id in enumerate(case_ids, start=1)}
+    return ip_aliases, case_aliases
+
+
+def compress_context_ips(text, ip_aliases):
+    if not ip_aliases:
+        return str(text or "")
+
+    def substitute(match):
+        alias = ip_aliases.get(match.group(1))
+        return f"{alias}.{match.group(2)}" if alias else match.group(0)
+
+    return RAG_CONTEXT_IPV4_RE.sub(substitute, str(text or ""))
+
+
+def render_rag_context_line(number, record, ip_aliases, case_aliases):
+    fields = []
+    values = {}
+
+    # `same_as` names earlier fields this one only restates (a signature that
+    # is just the event name); equal values in unrelated fields are kept.
+    def add(name, value, same_as=()):
+        text = str(value if value is not None else "").strip()
+        if not text or normalize_token_text(text) in UNKNOWN_VALUE_TOKENS:
+            return
+        if any(values.get(other) == text for other in same_as):
+            return
+        values[name] = text
+        fields.append(f"{name}={compress_context_ips(text, ip_aliases)}")
+
+    case_alias = case_aliases.get(str(record.get("case_id", "")), "")
+    occurrences = int(record.get("occurrences") or 1)
+    message = str(record.get("message") or record.get("raw_message") or "")
+    template = str(record.get("template") or "")
+    add("case", case_alias)
+    add("ts", record.get("first_seen") if occurrences > 1 and record.get("first_seen") else record.get("timestamp"))
+    if occurrences > 1:
+        add("last", record.get("last_seen"), same_as=("ts",))
+        fields.append(f"count={occurrences}")
+    add("sev", record.get("severity"))
+    add("cat", record.get("log_category"))
+    add("outcome", record.get("outcome"))
+    event = str(record.get("event") or "")
+    if event and event not in message:
+        add("event", event)
+    add("src", record.get("src_ip"))
+    add("dst", record.get("dst_ip"))
+    if record.get("dst_port") not in (None, ""):
+        add("dport", record.get("dst_port"))
+    add("user", record.get("user"))
+    add("rule", record.get("rule"))
+    add("sig", record.get("signature"), same_as=("event", "rule"))
+    if occurrences > 1:
+        sample_src = [ip for ip in record.get("sample_src_ips") or [] if ip != record.get("src_ip")]
+        sample_dst = [ip for ip in record.get("sample_dst_ips") or [] if ip != record.get("dst_ip")]
+        if sample_src:
+            add("more_src", ",".join(sample_src))
+        if sample_dst:
+            add("more_dst", ",".join(sample_dst))
+    body = template if occurrences > 1 and template else message
+    body = truncate_to_tokens(compress_context_ips(body, ip_aliases), RAG_RECORD_MAX_TOKENS)
+    prefix = f"[{number}] " + " ".join(fields)
+    return f"{prefix} msg={body}" if body else prefix
+
+
+def build_rag_context(records, token_budget=None):
+    if token_budget is None:
+        token_budget = rag_context_token_budget([])
+    records = list(records or [])
+    ip_aliases, case_aliases = rag_context_legend(records)
     context_parts = []
     sources = []
-    used_chars = 0
-    for position, record in enumerate(records, start=1):
-        source = {
+    packed = []
+    used_tokens = 0
+    for record in records:
+        position = len(packed) + 1
+        line = render_rag_context_line(position, record, ip_aliases, case_aliases)
+        line_tokens = estimate_tokens(line) + 1
+        if used_tokens + line_tokens > token_budget:
+            continue
+        if RAG_CONTEXT_CHARS and sum(len(part) + 1 for part in context_parts) + len(line) > RAG_CONTEXT_CHARS:
+            continue
+        legend_tokens = estimate_tokens(render_rag_context_legend(packed + [record], ip_aliases, case_aliases))
+        if used_tokens + line_tokens + legend_tokens > token_budget:
+            continue
+        packed.append(record)
+        context_parts.append(line)
+        used_tokens += line_tokens
+        sources.append({
             "number": position,
             "case_id": str(record.get("case_id", "")),
             "case_label": str(record.get("case_label", "")),
@@ -2090,28 +3675,34 @@ def build_rag_context(records):
             "src_ip": str(record.get("src_ip", "")),
             "dst_ip": str(record.get("dst_ip", "")),
             "message": str(record.get("message", record.get("raw_message", "")))[:500],
-        }
-        line = (
-            f"[{position}] case={source['case_label']} case_id={source['case_id']} "
-            f"timestamp={source['timestamp']} severity={source['severity']} event={source['event']} "
-            f"src={source['src_ip']} dst={source['dst_ip']} message={source['message']}"
-        )
-        if used_chars + len(line) > RAG_CONTEXT_CHARS:
-            break
-        context_parts.append(line)
-        sources.append(source)
-        used_chars += len(line)
-    return "\n".join(context_parts), sources
+            "occurrences": int(record.get("occurrences") or 1),
+        })
+    if not packed:
+        return "", sources
+    legend = render_rag_context_legend(packed, ip_aliases, case_aliases)
+    return (legend + "\n" if legend else "") + "\n".join(context_parts), sources
+
+
+def render_rag_context_legend(records, ip_aliases, case_aliases):
+    used_cases = []
+    used_prefixes = set()
+    for record in records:
+        case_id = str(record.get("case_id", ""))
+        if case_id in case_aliases and case_id not in used_cases:
+            used_cases.append(case_id)
+        text = " ".join(str(record.get(field) or "") for field in ("src_ip", "dst_ip", "message", "template"))
+        text += " " + " ".join((record.get("sample_src_ips") or []) + (record.get("sample_dst_ips") or []))
+        for prefix, _ in RAG_CONTEXT_IPV4_RE.findall(text):
+            if prefix in ip_aliases:
+                used_prefixes.add(prefix)
+    labels = {str(record.get("case_id", "")): str(record.get("case_label", "")) for record in records}
+    entries = [f"{case_aliases[case_id]}={labels.get(case_id, '')} (case_id {case_id})" for case_id in used_cases]
+    entries += [f"{alias}.x={prefix}.x" for prefix, alias in ip_aliases.items() if prefix in used_prefixes]
+    return "Legend: " + "; ".join(entries) if entries else ""
 
 
 def call_ollama_chat(messages, context):
-    system_message = (
-        "You are the EFLP forensic analysis assistant. Answer concisely and distinguish observed log facts "
-        "from hypotheses. Use the retrieved EFLP records below when relevant and cite them with bracketed "
-        "source numbers such as [1]. If the records do not support a claim, say so. RAG retrieval updates "
-        "the context but does not retrain your model weights.\n\nRetrieved records:\n"
-        + (context or "No matching EFLP records were retrieved.")
-    )
+    system_message = RAG_SYSTEM_PROMPT + (context or "No matching EFLP records were retrieved.")
     payload = {
         "model": OLLAMA_MODEL,
         "messages": [{"role": "system", "content": system_message}] + messages,
@@ -2126,7 +3717,7 @@ def call_ollama_chat(messages, context):
         method="POST",
     )
     try:
-        with urllib_request.urlopen(req, timeout=OLLAMA_TIMEOUT_SECONDS) as response:
+        with metrics.backend_call("ollama", "chat"), urllib_request.urlopen(req, timeout=OLLAMA_TIMEOUT_SECONDS) as response:
             result = json.loads(response.read().decode("utf-8"))
     except urllib_error.HTTPError as exc:
         details = exc.read().decode("utf-8", errors="replace")
@@ -2139,9 +3730,14 @@ def call_ollama_chat(messages, context):
     return answer
 
 
-def generate_export_forms(case_id, vendor):
+def generate_export_forms(case_id, vendor, start="", end=""):
     default_target = build_case_export_target(vendor, case_id)
     safe_case_id = html.escape(str(case_id))
+    range_fields = "".join(
+        f'<input type="hidden" name="{name}" value="{html.escape(value, quote=True)}" />'
+        for name, value in (("start", start), ("end", end))
+        if value
+    )
     safe_target = html.escape(default_target)
     safe_es_url = html.escape(ELASTICSEARCH_URL)
     safe_influx_url = html.escape(INFLUXDB_URL)
@@ -2149,6 +3745,7 @@ def generate_export_forms(case_id, vendor):
     es_form = f"""
     <form action="/export" method="post" style="margin-bottom:15px;">
       <input type="hidden" name="case_id" value="{safe_case_id}" />
+      {range_fields}
       <label>Elasticsearch URL:</label>
       <input type="text" name="es_url" value="{safe_es_url}" />
       <label>Index:</label>
@@ -2163,6 +3760,7 @@ def generate_export_forms(case_id, vendor):
     influx_form = f"""
     <form action="/export_influx" method="post" style="margin-bottom:15px;">
       <input type="hidden" name="case_id" value="{safe_case_id}" />
+      {range_fields}
       <label>InfluxDB URL:</label>
       <input type="text" name="influxdb_url" value="{safe_influx_url}" />
       <label>Database:</label>
@@ -2177,28 +3775,51 @@ def generate_export_forms(case_id, vendor):
     csv_form = f"""
     <form action="/export_csv" method="post" style="margin-bottom:15px;">
       <input type="hidden" name="case_id" value="{safe_case_id}" />
+      {range_fields}
       <input class="button" type="submit" value="Export to CSV" />
     </form>
     """
     json_form = f"""
     <form action="/export_json" method="post" style="margin-bottom:15px;">
       <input type="hidden" name="case_id" value="{safe_case_id}" />
+      {range_fields}
       <input class="button secondary" type="submit" value="Export to JSON" />
     </form>
     """
     return es_form + influx_form + csv_form + json_form
 
-def generate_export_panel(case_id, vendor):
-    export_forms = generate_export_forms(case_id, vendor)
+def generate_time_range_panel(case_id, start="", end=""):
+    safe_case_id = html.escape(str(case_id), quote=True)
+    clear_link = f' <a href="/case/{safe_case_id}">Show all records</a>' if start or end else ""
+    return f"""
+      <form class="panel" action="/case/{safe_case_id}" method="get">
+        <h3>Time Range</h3>
+        <label>Start (UTC):</label>
+        <input type="text" name="start" value="{html.escape(start, quote=True)}" placeholder="2024-01-01T10:00:00Z" />
+        <label>End (UTC):</label>
+        <input type="text" name="end" value="{html.escape(end, quote=True)}" placeholder="2024-01-01T10:15:00Z" />
+        <input class="button secondary" type="submit" value="Apply" />{clear_link}
+      </form>
+    """
+
+def generate_export_panel(case_id, vendor, start="", end=""):
+    export_forms = generate_export_forms(case_id, vendor, start=start, end=end)
+    range_note = ""
+    if start or end:
+        range_note = f"<p class=\"muted\">Exports are limited to {html.escape(start or 'the beginning')} through {html.escape(end or 'the end')}.</p>"
     return f"""
       <div class="panel">
         <h3>Export Pipelines</h3>
         <p class="muted">Compose-internal service URLs are prefilled. From the host, use Elasticsearch at <code>http://localhost:9200</code> and InfluxDB at <code>http://localhost:8086</code>.</p>
+        {range_note}
         {export_forms}
       </div>
     """
 
 def export_to_influxdb(parsed_data, vendor, influxdb_url, influxdb_db, influxdb_user, influxdb_pass, case_id="", case_label=""):
+    from dateutil import parser as date_parser
+    from influxdb import InfluxDBClient
+
     parsed_url = urlparse(influxdb_url)
     host = parsed_url.hostname if parsed_url.hostname else influxdb_url
     port = parsed_url.port if parsed_url.port else 8086
@@ -2236,7 +3857,8 @@ def export_to_influxdb(parsed_data, vendor, influxdb_url, influxdb_db, influxdb_
         if iso_time:
             point["time"] = iso_time
         points.append(point)
-    client.write_points(points)
+    with metrics.backend_call("influxdb", "write_points"):
+        client.write_points(points)
 
 def severity_from_priority_value(value) -> str:
     try:
@@ -2367,7 +3989,9 @@ def timestamp_has_explicit_year(value) -> bool:
     return bool(re.search(r"\b\d{1,4}[/-]\d{1,2}[/-]\d{1,4}\b", text))
 
 
-def roll_back_one_year(ts: pd.Timestamp) -> pd.Timestamp:
+def roll_back_one_year(ts: "pd.Timestamp") -> "pd.Timestamp":
+    import pandas as pd
+
     dt = ts.to_pydatetime()
     try:
         shifted = dt.replace(year=dt.year - 1)
@@ -2379,7 +4003,9 @@ def roll_back_one_year(ts: pd.Timestamp) -> pd.Timestamp:
     return adjusted.tz_convert("UTC")
 
 
-def adjust_missing_year_future_timestamp(parsed_ts: pd.Timestamp, raw_text: str) -> pd.Timestamp:
+def adjust_missing_year_future_timestamp(parsed_ts: "pd.Timestamp", raw_text: str) -> "pd.Timestamp":
+    import pandas as pd
+
     if pd.isna(parsed_ts):
         return parsed_ts
     if timestamp_has_explicit_year(raw_text):
@@ -2394,6 +4020,8 @@ def adjust_missing_year_future_timestamp(parsed_ts: pd.Timestamp, raw_text: str)
 
 
 def normalize_timestamp_value(value):
+    import pandas as pd
+
     if value is None:
         return pd.NaT
     text = str(value).strip()
@@ -2423,38 +4051,83 @@ def normalize_timestamp_value(value):
     return adjust_missing_year_future_timestamp(parsed, text)
 
 
-def ensure_network_type(df: pd.DataFrame) -> pd.DataFrame:
+ISO_TIMESTAMP_REGEX = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+
+
+def parse_timestamp_value(value):
+    # Parsers emit isoformat() text, which datetime.fromisoformat reads far
+    # faster than pd.to_datetime; anything it rejects takes the full path.
+    import pandas as pd
+
+    text = str(value).strip() if value is not None else ""
+    if ISO_TIMESTAMP_REGEX.match(text):
+        try:
+            parsed = datetime.fromisoformat(text[:-1] + "+00:00" if text.endswith("Z") else text)
+        except ValueError:
+            return normalize_timestamp_value(value)
+        if parsed.tzinfo is None:
+            return pd.Timestamp(parsed.replace(tzinfo=timezone.utc))
+        return pd.Timestamp(parsed.astimezone(timezone.utc))
+    return normalize_timestamp_value(value)
+
+
+def map_unique(series, func):
+    # Normalized columns repeat a handful of values; convert each distinct
+    # value once.
+    import pandas as pd
+
+    return series.map({value: func(value) for value in pd.unique(series)})
+
+
+NETWORK_TYPE_CLASSIFIER = KeywordClassifier([
+    ("sslvpn", ["sslvpn", "nsvpn", "vpn", "citrix gateway", "globalprotect", "wireguard", "openvpn"]),
+    ("ike", ["ike", "ipsec", "l2tp", "pptp"]),
+    ("appfw", ["appfw", "app firewall"]),
+    ("wan", ["wan", "internet"]),
+    ("lan", ["lan", "intranet"]),
+    ("dmz", ["dmz"]),
+])
+LOG_CATEGORY_CLASSIFIER = KeywordClassifier([
+    ("threat", ["threat", "intrusion", "ips", "ids", "attack", "exploit", "signature", "idp", "utm", "appfw", "waf"]),
+    ("malware", ["malware", "virus", "spyware", "ransomware", "botnet", "trojan", "c2"]),
+    ("authentication", ["auth", "login", "logout", "radius", "ldap", "saml", "mfa", "aaa", "user-id"]),
+    ("vpn", ["vpn", "ipsec", "ike", "sslvpn", "nsvpn", "globalprotect", "tunnel"]),
+    ("configuration", ["config", "policy install", "commit", "admin", "change", "audit", "cmd", "cli"]),
+    ("system", ["system", "daemon", "kernel", "cpu", "memory", "fan", "health", "chassis", "resource"]),
+    ("dns", ["dns", "domain", "resolver", "query", "dnssec"]),
+    ("web", ["url", "web", "http", "https", "proxy"]),
+    ("ha", ["ha", "cluster", "failover", "sync", "heartbeat"]),
+    ("routing", ["route", "bgp", "ospf", "rip", "routing"]),
+    ("wireless", ["wireless", "wifi", "ssid", "wlan", "ap "]),
+    ("traffic", ["nat", "session", "flow", "traffic", "connection", "firewall", "packet", "rt_flow"]),
+])
+OUTCOME_CLASSIFIER = KeywordClassifier([
+    ("blocked", ["deny", "denied", "drop", "blocked", "reject", "quarantine", "reset"]),
+    ("failed", ["fail", "failed", "error", "invalid", "timeout"]),
+    ("allowed", ["allow", "accept", "permit", "pass", "session create"]),
+    ("success", ["success", "successful", "authenticated", "ok"]),
+    ("detected", ["detect", "detected", "alert", "threat"]),
+])
+
+
+def ensure_network_type(df: "pd.DataFrame") -> "pd.DataFrame":
+    def column(name):
+        return df[name].tolist() if name in df.columns else [""] * len(df)
+
     nts = []
-    for _, row in df.iterrows():
-        if str(row.get("network_type", "")).strip():
-            nts.append(str(row.get("network_type", "")).strip())
+    hints = zip(*(column(name) for name in ("message", "severity", "subtype", "object", "log_category", "protocol")))
+    for current, row in zip(column("network_type"), hints):
+        current = "" if is_missing(current) else str(current).strip()
+        if current:
+            nts.append(current)
             continue
-        s = " ".join(str(x) for x in [
-            row.get("message", ""),
-            row.get("severity", ""),
-            row.get("subtype", ""),
-            row.get("object", ""),
-            row.get("log_category", ""),
-            row.get("protocol", ""),
-        ]).lower()
-        t = "unknown"
-        if any(k in s for k in ["sslvpn", "nsvpn", "vpn", "citrix gateway", "globalprotect", "wireguard", "openvpn"]):
-            t = "sslvpn"
-        elif any(k in s for k in ["ike", "ipsec", "l2tp", "pptp"]):
-            t = "ike"
-        elif "appfw" in s or "app firewall" in s:
-            t = "appfw"
-        elif "wan" in s or "internet" in s:
-            t = "wan"
-        elif "lan" in s or "intranet" in s:
-            t = "lan"
-        elif "dmz" in s:
-            t = "dmz"
-        nts.append(t)
+        nts.append(NETWORK_TYPE_CLASSIFIER.classify(" ".join(str(x) for x in row).lower()))
     df["network_type"] = nts
     return df
 
-def coalesce_columns(df: pd.DataFrame, candidates, default=""):
+def coalesce_columns(df: "pd.DataFrame", candidates, default=""):
+    import pandas as pd
+
     existing = [c for c in candidates if c in df.columns]
     if not existing:
         return pd.Series([default] * len(df), index=df.index, dtype=object)
@@ -2494,49 +4167,27 @@ def canonicalize_outcome_value(value: str) -> str:
     return "" if inferred == "unknown" else inferred
 
 def infer_log_category_from_text(text: str) -> str:
-    s = str(text or "").lower()
-    if any(k in s for k in ["threat", "intrusion", "ips", "ids", "attack", "exploit", "signature", "idp", "utm", "appfw", "waf"]):
-        return "threat"
-    if any(k in s for k in ["malware", "virus", "spyware", "ransomware", "botnet", "trojan", "c2"]):
-        return "malware"
-    if any(k in s for k in ["auth", "login", "logout", "radius", "ldap", "saml", "mfa", "aaa", "user-id"]):
-        return "authentication"
-    if any(k in s for k in ["vpn", "ipsec", "ike", "sslvpn", "nsvpn", "globalprotect", "tunnel"]):
-        return "vpn"
-    if any(k in s for k in ["config", "policy install", "commit", "admin", "change", "audit", "cmd", "cli"]):
-        return "configuration"
-    if any(k in s for k in ["system", "daemon", "kernel", "cpu", "memory", "fan", "health", "chassis", "resource"]):
-        return "system"
-    if any(k in s for k in ["dns", "domain", "resolver", "query", "dnssec"]):
-        return "dns"
-    if any(k in s for k in ["url", "web", "http", "https", "proxy"]):
-        return "web"
-    if any(k in s for k in ["ha", "cluster", "failover", "sync", "heartbeat"]):
-        return "ha"
-    if any(k in s for k in ["route", "bgp", "ospf", "rip", "routing"]):
-        return "routing"
-    if any(k in s for k in ["wireless", "wifi", "ssid", "wlan", "ap "]):
-        return "wireless"
-    if any(k in s for k in ["nat", "session", "flow", "traffic", "connection", "firewall", "packet", "rt_flow"]):
-        return "traffic"
-    return "unknown"
+    return LOG_CATEGORY_CLASSIFIER.classify(str(text or "").lower())
 
 def infer_outcome_from_text(text: str) -> str:
-    s = str(text or "").lower()
-    if any(k in s for k in ["deny", "denied", "drop", "blocked", "reject", "quarantine", "reset"]):
-        return "blocked"
-    if any(k in s for k in ["fail", "failed", "error", "invalid", "timeout"]):
-        return "failed"
-    if any(k in s for k in ["allow", "accept", "permit", "pass", "session create"]):
-        return "allowed"
-    if any(k in s for k in ["success", "successful", "authenticated", "ok"]):
-        return "success"
-    if any(k in s for k in ["detect", "detected", "alert", "threat"]):
-        return "detected"
-    return "unknown"
-
-def normalize_case_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    return OUTCOME_CLASSIFIER.classify(str(text or "").lower())
+
+def normalize_case_dataframe(df: "pd.DataFrame", trust_parser=None) -> "pd.DataFrame":
+    import pandas as pd
+
     norm = df.copy()
+    # Rows a vendor parser produced were already enriched from their message
+    # and raw fields. With trust_parser their values are only canonicalized
+    # and the message scans below fill gaps in the other rows (CSV/JSON
+    # uploads, records stored before provenance was recorded). Off by
+    # default: the dashboard's scans still find protocols, IPs and
+    # categories that some parsers leave empty or "unknown".
+    if trust_parser is None:
+        trust_parser = TRUST_PARSER_FIELDS
+    if trust_parser and "provenance" in norm.columns:
+        foreign = norm["provenance"].ne(PARSER_PROVENANCE)
+    else:
+        foreign = pd.Series(True, index=norm.index)
     norm["timestamp"] = coalesce_columns(norm, ["timestamp", "@timestamp", "time", "event_time", "generated_time", "eventtime", "receive_time"])
     norm["severity"] = coalesce_columns(norm, ["severity", "level", "priority", "pri"], default="INFO")
     norm["event"] = coalesce_columns(norm, ["event", "event_type", "subtype", "log_type", "signature"])
@@ -2555,11 +4206,11 @@ def normalize_case_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     norm["event_id"] = coalesce_columns(norm, ["event_id", "eventid", "logid", "id", "msgid"])
     norm["session_id"] = coalesce_columns(norm, ["session_id", "sessionid", "sid", "connid", "flowid"])
 
-    norm["severity"] = norm["severity"].fillna("").astype(str).map(canonicalize_severity_value)
+    norm["severity"] = map_unique(norm["severity"].fillna("").astype(str), canonicalize_severity_value)
 
     norm["action"] = norm["action"].fillna("").astype(str)
-    norm["action"] = norm["action"].map(lambda x: normalize_token_text(x).replace(" ", "_"))
-    missing_action = norm["action"].eq("")
+    norm["action"] = map_unique(norm["action"], lambda x: normalize_token_text(x).replace(" ", "_"))
+    missing_action = norm["action"].eq("") & foreign
     if missing_action.any():
         action_seed = norm["message"].fillna("").astype(str).str.lower()
         norm.loc[missing_action & action_seed.str.contains(r"\b(deny|drop|block|reject|quarantine)\b", regex=True), "action"] = "deny"
@@ -2569,14 +4220,14 @@ def normalize_case_dataframe(df: pd.DataFrame) -> pd.DataFrame:
         norm.loc[missing_action & action_seed.str.contains(r"\b(reset|teardown|close)\b", regex=True), "action"] = "close"
 
     norm["event"] = norm["event"].fillna("").astype(str).str.strip()
-    missing_event = norm["event"].eq("")
+    missing_event = norm["event"].eq("") & foreign
     if missing_event.any():
         inferred_event = norm["message"].fillna("").astype(str).str.extract(r"\b([A-Z][A-Z0-9_]{3,})\b", expand=False).fillna("")
         norm.loc[missing_event, "event"] = inferred_event[missing_event]
     norm.loc[norm["event"].str.strip().eq(""), "event"] = "unknown"
 
-    norm["protocol"] = norm["protocol"].fillna("").astype(str).map(canonicalize_protocol_value)
-    missing_protocol = norm["protocol"].eq("")
+    norm["protocol"] = map_unique(norm["protocol"].fillna("").astype(str), canonicalize_protocol_value)
+    missing_protocol = norm["protocol"].eq("") & foreign
     if missing_protocol.any():
         protocol_seed = norm["message"].fillna("").astype(str).str.lower()
         norm.loc[missing_protocol & protocol_seed.str.contains(r"\btcp\b", regex=True), "protocol"] = "TCP"
@@ -2586,30 +4237,31 @@ def normalize_case_dataframe(df: pd.DataFrame) -> pd.DataFrame:
         norm.loc[missing_protocol & protocol_seed.str.contains(r"\bgre\b", regex=True), "protocol"] = "GRE"
     norm.loc[norm["protocol"].eq(""), "protocol"] = "UNKNOWN"
 
-    norm["src_ip"] = norm["src_ip"].fillna("").astype(str).map(normalize_ip_value)
-    norm["dst_ip"] = norm["dst_ip"].fillna("").astype(str).map(normalize_ip_value)
-    missing_src = norm["src_ip"].eq("")
-    missing_dst = norm["dst_ip"].eq("")
-    if missing_src.any() or missing_dst.any():
-        ip_pairs = norm["message"].fillna("").astype(str).map(extract_message_ips)
-        msg_src = ip_pairs.map(lambda pair: pair[0])
-        msg_dst = ip_pairs.map(lambda pair: pair[1])
-        norm.loc[missing_src, "src_ip"] = msg_src[missing_src]
-        norm.loc[missing_dst, "dst_ip"] = msg_dst[missing_dst]
+    norm["src_ip"] = map_unique(norm["src_ip"].fillna("").astype(str), normalize_ip_value)
+    norm["dst_ip"] = map_unique(norm["dst_ip"].fillna("").astype(str), normalize_ip_value)
+    missing_src = norm["src_ip"].eq("") & foreign
+    missing_dst = norm["dst_ip"].eq("") & foreign
+    needs_ips = missing_src | missing_dst
+    if needs_ips.any():
+        ip_pairs = norm.loc[needs_ips, "message"].fillna("").astype(str).map(extract_message_ips)
+        src_rows = missing_src[needs_ips]
+        dst_rows = missing_dst[needs_ips]
+        norm.loc[src_rows.index[src_rows], "src_ip"] = ip_pairs[src_rows].map(lambda pair: pair[0])
+        norm.loc[dst_rows.index[dst_rows], "dst_ip"] = ip_pairs[dst_rows].map(lambda pair: pair[1])
 
     norm["src_port"] = norm["src_port"].map(canonicalize_port_value)
     norm["dst_port"] = norm["dst_port"].map(canonicalize_port_value)
-    src_port_from_msg = norm["message"].fillna("").astype(str).str.extract(r"\b(?:spt|sport|srcport|source_port|src[\s_]?port)\s*[=:]\s*(\d{1,5})\b", expand=False)
-    dst_port_from_msg = norm["message"].fillna("").astype(str).str.extract(r"\b(?:dpt|dport|dstport|destination_port|dst[\s_]?port)\s*[=:]\s*(\d{1,5})\b", expand=False)
-    missing_src_port = norm["src_port"].isna()
-    missing_dst_port = norm["dst_port"].isna()
+    missing_src_port = norm["src_port"].isna() & foreign
+    missing_dst_port = norm["dst_port"].isna() & foreign
     if missing_src_port.any():
-        norm.loc[missing_src_port, "src_port"] = src_port_from_msg[missing_src_port].map(canonicalize_port_value)
+        src_port_from_msg = norm.loc[missing_src_port, "message"].fillna("").astype(str).str.extract(r"\b(?:spt|sport|srcport|source_port|src[\s_]?port)\s*[=:]\s*(\d{1,5})\b", expand=False)
+        norm.loc[missing_src_port, "src_port"] = src_port_from_msg.map(canonicalize_port_value)
     if missing_dst_port.any():
-        norm.loc[missing_dst_port, "dst_port"] = dst_port_from_msg[missing_dst_port].map(canonicalize_port_value)
+        dst_port_from_msg = norm.loc[missing_dst_port, "message"].fillna("").astype(str).str.extract(r"\b(?:dpt|dport|dstport|destination_port|dst[\s_]?port)\s*[=:]\s*(\d{1,5})\b", expand=False)
+        norm.loc[missing_dst_port, "dst_port"] = dst_port_from_msg.map(canonicalize_port_value)
 
-    norm["log_category"] = norm["log_category"].fillna("").astype(str).map(canonicalize_log_category_value)
-    missing_category = norm["log_category"].eq("")
+    norm["log_category"] = map_unique(norm["log_category"].fillna("").astype(str), canonicalize_log_category_value)
+    missing_category = norm["log_category"].eq("") & foreign
     if missing_category.any():
         category_seed = (
             coalesce_columns(norm, ["category", "type", "subtype"]).fillna("").astype(str) + " " +
@@ -2619,11 +4271,11 @@ def normalize_case_dataframe(df: pd.DataFrame) -> pd.DataFrame:
             norm["protocol"].fillna("").astype(str)
         )
         norm.loc[missing_category, "log_category"] = category_seed[missing_category].map(infer_log_category_from_text)
-    norm["log_category"] = norm["log_category"].fillna("").astype(str).map(canonicalize_log_category_value)
+    norm["log_category"] = map_unique(norm["log_category"].fillna("").astype(str), canonicalize_log_category_value)
     norm.loc[norm["log_category"].eq(""), "log_category"] = "unknown"
 
-    norm["outcome"] = norm["outcome"].fillna("").astype(str).map(canonicalize_outcome_value)
-    missing_outcome = norm["outcome"].eq("")
+    norm["outcome"] = map_unique(norm["outcome"].fillna("").astype(str), canonicalize_outcome_value)
+    missing_outcome = norm["outcome"].eq("") & foreign
     if missing_outcome.any():
         outcome_seed = (
             norm["action"].fillna("").astype(str) + " " +
@@ -2631,11 +4283,11 @@ def normalize_case_dataframe(df: pd.DataFrame) -> pd.DataFrame:
             norm["message"].fillna("").astype(str)
         )
         norm.loc[missing_outcome, "outcome"] = outcome_seed[missing_outcome].map(infer_outcome_from_text)
-    norm["outcome"] = norm["outcome"].fillna("").astype(str).map(canonicalize_outcome_value)
+    norm["outcome"] = map_unique(norm["outcome"].fillna("").astype(str), canonicalize_outcome_value)
     norm.loc[norm["outcome"].eq(""), "outcome"] = "unknown"
 
     raw_timestamp = norm["timestamp"].fillna("").astype(str)
-    norm["timestamp_dt"] = raw_timestamp.map(normalize_timestamp_value)
+    norm["timestamp_dt"] = pd.to_datetime(map_unique(raw_timestamp, parse_timestamp_value), utc=True)
     rendered_timestamp = norm["timestamp_dt"].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
     norm["timestamp"] = rendered_timestamp.where(norm["timestamp_dt"].notna(), raw_timestamp.str.strip()).fillna("")
 
@@ -2659,7 +4311,7 @@ def count_items(series, order=None, limit=None):
 def traffic_int_value(value):
     if value is None:
         return None
-    if isinstance(value, float) and pd.isna(value):
+    if isinstance(value, float) and math.isnan(value):
         return None
     text = str(value).strip().replace(",", "")
     if not text:
@@ -2762,7 +4414,7 @@ def traffic_aggregate_items(df, label_columns, limit=10, include_both_ip_columns
 def safe_table_records(df, limit=LIVE_RECENT_LIMIT):
     columns = [
         "timestamp", "severity", "log_category", "event", "action", "outcome",
-        "src_ip", "dst_ip", "user", "message", "ingest_source"
+        "src_ip", "dst_ip", "user", "message", "ingest_source", "received_at"
     ]
     for col in columns:
         if col not in df.columns:
@@ -2773,6 +4425,8 @@ def safe_table_records(df, limit=LIVE_RECENT_LIMIT):
 
 
 def build_live_dashboard_summary(records, case, recent_limit=LIVE_RECENT_LIMIT):
+    import pandas as pd
+
     total_records = len(records)
     window_records = records[-LIVE_DASHBOARD_WINDOW:] if len(records) > LIVE_DASHBOARD_WINDOW else records
     if not window_records:
@@ -2800,7 +4454,7 @@ def build_live_dashboard_summary(records, case, recent_limit=LIVE_RECENT_LIMIT):
             "recent": [],
         }
 
-    df = add_live_traffic_columns(normalize_case_dataframe(pd.DataFrame(window_records)))
+    df = add_live_traffic_columns(normalize_case_dataframe(records_frame(window_records)))
     blocked_failed = df["outcome"].isin(["blocked", "failed"]).sum()
     critical_high = df["severity"].isin(["CRITICAL", "HIGH"]).sum()
     unique_sources = df["src_ip"].fillna("").astype(str).str.strip().replace("", pd.NA).dropna().nunique()
@@ -2849,6 +4503,91 @@ def build_live_dashboard_summary(records, case, recent_limit=LIVE_RECENT_LIMIT):
     }
 
 
+def approximate_record_bytes(record):
+    size = sys.getsizeof(record)
+    for value in record.values():
+        size += sys.getsizeof(value)
+        if isinstance(value, dict):
+            size += sum(sys.getsizeof(key) + sys.getsizeof(item) for key, item in value.items())
+    return size
+
+
+def case_cache_sizes():
+    with CASE_STATE_LOCK:
+        cached = list(CASE_DATA_CACHE.values())
+    records = 0
+    approx_bytes = 0
+    for entries in cached:
+        count = len(entries)
+        if not count:
+            continue
+        step = max(1, count // CACHE_SIZE_SAMPLE)
+        sample = [entries[row] for row in range(0, count, step)][:CACHE_SIZE_SAMPLE]
+        records += count
+        approx_bytes += int(sum(approximate_record_bytes(record) for record in sample) / len(sample) * count)
+    return {"cases": len(cached), "records": records, "bytes": approx_bytes}
+
+
+# Both cache gauges read one result per scrape instead of sampling twice.
+CASE_CACHE_SIZES = {"at": 0.0, "sizes": None}
+CASE_CACHE_SIZES_LOCK = threading.Lock()
+
+
+def scraped_case_cache_sizes():
+    with CASE_CACHE_SIZES_LOCK:
+        now = time.monotonic()
+        if CASE_CACHE_SIZES["sizes"] is None or now - CASE_CACHE_SIZES["at"] > 1.0:
+            CASE_CACHE_SIZES["sizes"] = case_cache_sizes()
+            CASE_CACHE_SIZES["at"] = now
+        return CASE_CACHE_SIZES["sizes"]
+
+
+metrics.REGISTRY.gauge(
+    "eflp_case_cache_bytes", "Approximate memory held by cached case records (sampled).",
+    collect=lambda: scraped_case_cache_sizes()["bytes"],
+)
+metrics.REGISTRY.gauge(
+    "eflp_case_cache_records", "Records held in the case data cache.",
+    collect=lambda: scraped_case_cache_sizes()["records"],
+)
+metrics.REGISTRY.gauge("eflp_rag_queue_depth", "Items waiting in the RAG indexing queue.", collect=RAG_INDEX_QUEUE.qsize)
+metrics.REGISTRY.gauge(
+    "eflp_syslog_routes", "Live syslog routes currently registered.", collect=lambda: len(SYSLOG_ROUTES),
+)
+metrics.REGISTRY.gauge(
+    "eflp_live_rag_lag_seconds", "Age of the oldest sampled live record not yet indexed for RAG.", ("case_id",),
+    collect=lambda: {(case_id,): lag for case_id, lag in LIVE_LATENCY.rag_lag().items()},
+)
+metrics.REGISTRY.gauge(
+    "eflp_parser_conversion_failures_total", "Values a parser could not convert, per vendor, conversion and field.",
+    ("vendor", "kind", "field"), collect=parser_diagnostics.totals, kind="counter",
+)
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def observe_request_time(response):
+    started = g.get("request_started")
+    if started is not None:
+        metrics.HTTP_SECONDS.observe(time.perf_counter() - started, request.endpoint or "unmatched", request.method)
+    return response
+
+
+@app.route("/metrics")
+def metrics_endpoint():
+    if not METRICS_ENABLED:
+        return Response("Metrics are disabled.\n", status=404, mimetype="text/plain")
+    if METRICS_TOKEN:
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(token, METRICS_TOKEN):
+            return Response("Metrics require a valid EFLP_METRICS_TOKEN.\n", status=401, mimetype="text/plain")
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
+
 def vendor_options_html(selected=""):
     selected = str(selected or "")
     chunks = []
@@ -2946,6 +4685,20 @@ def upload():
         return "No file selected"
     if vendor not in PARSERS:
         return render_page("Error", "Error", f"Unsupported vendor '{html.escape(str(vendor))}'.")
+    profile = ""
+    if PROFILING_TOKEN and request.form.get("profile"):
+        try:
+            profile = requested_profile_mode(request.form)
+        except PermissionError as exc:
+            return render_page("Error", "Error", html.escape(str(exc))), 403
+        except ValueError as exc:
+            return render_page("Error", "Error", html.escape(str(exc))), 400
+    trace = False
+    if PROFILING_TOKEN and request.form.get("parser_trace") in ("1", "true", "on"):
+        # Traces hold raw field values, so they sit behind the profiling token.
+        if not profiling_token_valid(request.form):
+            return render_page("Error", "Error", "Parser traces require a valid EFLP_PROFILING_TOKEN."), 403
+        trace = True
 
     case_id = str(uuid.uuid4())
     safe_name = secure_filename(uploaded_file.filename)
@@ -2954,7 +4707,7 @@ def upload():
     file_path = os.path.join(UPLOADS, f"{case_id}_{safe_name}")
     uploaded_file.save(file_path)
     store_case(case_id, label, vendor, file_path)
-    start_case_parse_job(case_id, file_path, vendor)
+    start_case_parse_job(case_id, file_path, vendor, profile=profile, trace=trace)
     return render_case_loading_page(case_id, label, vendor)
 
 
@@ -2964,11 +4717,14 @@ def upload_status(case_id):
     if not case:
         return jsonify({"status": "error", "message": "Case not found.", "next_url": "/"}), 404
 
+    state = get_case_parse_status(case_id)
+    extras = {key: state[key] for key in ("profiles", "diagnostics") if (state or {}).get(key)}
     cached = get_cached_case_data(case_id)
     if cached is not None:
-        return jsonify({"status": "ready", "records": len(cached), "next_url": f"/case/{case_id}"})
+        payload = {"status": "ready", "records": len(cached), "next_url": f"/case/{case_id}"}
+        payload.update(extras)
+        return jsonify(payload)
 
-    state = get_case_parse_status(case_id)
     if state:
         payload = {
             "status": state.get("status", "queued"),
@@ -2976,6 +4732,7 @@ def upload_status(case_id):
             "records": int(state.get("records", 0)),
             "next_url": f"/case/{case_id}",
         }
+        payload.update(extras)
         return jsonify(payload)
 
     return jsonify({"status": "queued", "message": "Waiting for parser...", "records": 0, "next_url": f"/case/{case_id}"})
@@ -3026,12 +4783,36 @@ def api_live_summary(case_id):
         recent_limit = min(max(int(request.args.get("limit", LIVE_RECENT_LIMIT)), 1), 500)
     except ValueError:
         recent_limit = LIVE_RECENT_LIMIT
-    records = get_live_case_records(case_id)
+    try:
+        start, end = request_time_range()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    records = read_live_case_range(case_id, start, end) if start or end else get_live_case_records(case_id)
     summary = build_live_dashboard_summary(records, case, recent_limit=recent_limit)
     summary["listener"] = get_syslog_listener_state()
+    latency = LIVE_LATENCY.summary(case_id)
+    latency["rag_lag_alert_seconds"] = RAG_LAG_ALERT_SECONDS
+    latency["rag_lag_alert"] = RAG_ENABLED and latency["rag_lag_seconds"] > RAG_LAG_ALERT_SECONDS
+    summary["latency"] = latency
     return jsonify(summary)
 
 
+@app.route("/api/case/<case_id>/related")
+def api_related_cases(case_id):
+    case = get_case_by_sid(case_id)
+    if not case:
+        return jsonify({"error": "Case not found."}), 404
+    try:
+        limit = min(max(int(request.args.get("limit", 50)), 1), 500)
+    except ValueError:
+        limit = 50
+    try:
+        related = get_related_cases(case_id, limit=limit)
+    except Exception as exc:
+        return jsonify({"error": f"Entity graph query failed: {exc}"}), 502
+    return jsonify({"case_id": case_id, "related": related})
+
+
 def render_live_case_page(case):
     case_id = str(case.get("sid", ""))
     label = str(case.get("label", "Live Syslog"))
@@ -3055,6 +4836,12 @@ def render_live_case_page(case):
           <span class="badge">udp/{SYSLOG_PORT}</span>
           <span class="badge" id="liveLastUpdated">waiting for data</span>
         </div>
+        <div class="live-status" title="Seconds since syslog receipt for sampled records (p50 / p95 / p99)">
+          <span class="badge" id="liveLatencyParsed">parsed: n/a</span>
+          <span class="badge" id="liveLatencyAppended">dashboard: n/a</span>
+          <span class="badge" id="liveLatencyIndexed">RAG: n/a</span>
+          <span class="badge" id="liveRagLag">RAG lag: n/a</span>
+        </div>
       </div>
 
       <div class="stats-grid">
@@ -3139,6 +4926,24 @@ def render_live_case_page(case):
             return scaled.toFixed(digits) + " " + units[idx];
           }}
 
+          function formatSeconds(value) {{
+            const amount = Number(value || 0);
+            return amount < 1 ? (amount * 1000).toFixed(0) + " ms" : amount.toFixed(2) + " s";
+          }}
+
+          function renderLatency(latency) {{
+            if (!latency) return;
+            const labels = {{ parsed: "parsed", appended: "dashboard", indexed: "RAG" }};
+            Object.keys(labels).forEach(function(stage) {{
+              const id = "liveLatency" + stage.charAt(0).toUpperCase() + stage.slice(1);
+              const item = (latency.stages || {{}})[stage];
+              text(id, labels[stage] + ": " + (item ? [item.p50, item.p95, item.p99].map(formatSeconds).join(" / ") : "n/a"));
+            }});
+            text("liveRagLag", "RAG lag: " + formatSeconds(latency.rag_lag_seconds));
+            const lag = document.getElementById("liveRagLag");
+            if (lag) lag.classList.toggle("alert", Boolean(latency.rag_lag_alert));
+          }}
+
           function renderBar(target, items, title, color) {{
             const trace = {{
               type: "bar",
@@ -3239,6 +5044,7 @@ def render_live_case_page(case):
             renderTrafficBar("liveTrafficIpChart", data.top_traffic_ips, "Top 10 IPs by Traffic", "#22c55e");
             renderTrafficBar("liveTrafficRuleChart", data.top_traffic_rules, "Top 10 Rules by Traffic", "#f59e0b");
             renderRecent(data.recent);
+            renderLatency(data.latency);
           }}
 
           function fetchSummary() {{
@@ -3260,6 +5066,7 @@ def render_live_case_page(case):
 
 
 @app.route("/live/<case_id>")
+@profiled_case_view("live_case")
 def live_case(case_id):
     ensure_syslog_listener_started()
     case = get_case_by_sid(case_id)
@@ -3271,6 +5078,7 @@ def live_case(case_id):
 
 
 @app.route("/case/<case_id>")
+@profiled_case_view("view_case")
 def view_case(case_id):
     case_meta = get_case_by_sid(case_id)
     if not case_meta:
@@ -3287,23 +5095,32 @@ def view_case(case_id):
         message = html.escape(parse_state.get("message", "Parsing failed."))
         return render_page("Error", "Error", f"Error parsing file: {message}")
 
-    case, result = load_case_data(case_id)
+    try:
+        start, end = request_time_range()
+    except ValueError as exc:
+        return render_page("Error", "Error", html.escape(str(exc)))
+    case, result = load_case_data(case_id, start=start, end=end)
     if not case:
         return render_page("Error", "Error", result)
     vendor = case["vendor"]
     label = case["label"]
-    df = pd.DataFrame(result)
+    df = records_frame(result)
+    range_panel = generate_time_range_panel(case_id, start, end)
 
     if df.empty:
-        export_panel = generate_export_panel(case_id, vendor)
+        export_panel = generate_export_panel(case_id, vendor, start=start, end=end)
         empty_content = f"""
           <h2>Case: {label} ({vendor})</h2>
+          {range_panel}
           <p>No records parsed.</p>
           {export_panel}
           <br><a href="/">Back</a>
         """
         return render_page(label, f"Case: {label} ({vendor})", empty_content)
 
+    import pandas as pd
+    import plotly.express as px
+
     df = normalize_case_dataframe(df)
 
     chart_blocks = []
@@ -3530,7 +5347,7 @@ def view_case(case_id):
 
     table_df = df.drop(columns=["timestamp_dt"], errors="ignore")
     table_html, table_column_map = generate_logs_table(table_df)
-    export_panel = generate_export_panel(case_id, vendor)
+    export_panel = generate_export_panel(case_id, vendor, start=start, end=end)
 
     total_events = len(df)
     category_total = df["log_category"].fillna("unknown").astype(str).str.lower().ne("unknown").sum()
@@ -3583,6 +5400,7 @@ def view_case(case_id):
 
     content = f"""
       <h2>Case: {label} ({vendor})</h2>
+      {range_panel}
       {stats_html}
       <div class="chart-grid">{chart_cards}</div>
       {table_filter_panel}
@@ -3743,6 +5561,49 @@ def chat_page():
     return render_page("Granite RAG Chat", "EFLP XMPP-style RAG Chat", content)
 
 
+@app.route("/api/search")
+def api_search():
+    if not SEARCH_INDEX_ENABLED:
+        return jsonify({"error": "The cross-case search index is disabled."}), 400
+    query = {name: request.args.get(name, "").strip() for name in SEARCH_QUERY_FIELDS if request.args.get(name, "").strip()}
+    if not query:
+        return jsonify({"error": f"Provide at least one of: {', '.join(SEARCH_QUERY_FIELDS)}."}), 400
+    try:
+        limit = min(max(int(request.args.get("limit", 100)), 1), 1000)
+    except ValueError:
+        limit = 100
+    started = time.perf_counter()
+    matches = None
+    for name, value in query.items():
+        hits = SEARCH_INDEX.lookup(SEARCH_QUERY_FIELDS[name], value)
+        if matches is None:
+            matches = {case_id: set(rows) for case_id, rows in hits.items()}
+        else:
+            matches = {
+                case_id: rows & set(hits[case_id])
+                for case_id, rows in matches.items()
+                if case_id in hits and rows & set(hits[case_id])
+            }
+    cases = {case["sid"]: case for case in get_all_cases()}
+    results = []
+    for case_id, rows in sorted(matches.items(), key=lambda item: len(item[1]), reverse=True):
+        case = cases.get(case_id, {})
+        results.append({
+            "case_id": case_id,
+            "label": case.get("label", ""),
+            "vendor": case.get("vendor", ""),
+            "count": len(rows),
+            "row_type": "byte_offset" if is_live_case(case) else "record_index",
+            "rows": sorted(rows)[:limit],
+        })
+    return jsonify({
+        "query": query,
+        "cases": len(results),
+        "hits": results,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    })
+
+
 @app.route("/api/rag/status")
 def api_rag_status():
     return jsonify(get_rag_state())
@@ -3785,7 +5646,7 @@ def api_chat():
     except Exception as exc:
         records = []
         retrieval_warning = f"Elasticsearch retrieval was unavailable: {exc}"
-    context, sources = build_rag_context(records)
+    context, sources = build_rag_context(records, token_budget=rag_context_token_budget(messages))
     try:
         answer = call_ollama_chat(messages, context)
     except Exception as exc:
@@ -3806,7 +5667,11 @@ def export_es():
     es_index = request.form.get("es_index", "logs")
     es_user = request.form.get("es_user", "")
     es_pass = request.form.get("es_pass", "")
-    case, parsed_data = load_case_data(case_id)
+    try:
+        start, end = request_time_range()
+    except ValueError as exc:
+        return render_page("Error", "Error", html.escape(str(exc)))
+    case, parsed_data = load_case_data(case_id, start=start, end=end)
     if not case:
         return render_page("Error", "Error", parsed_data)
     vendor = case["vendor"]
@@ -3818,16 +5683,19 @@ def export_es():
             f"No records available to export for case '{html.escape(case['label'])}'. <a href='/case/{case_id}'>Back</a>",
         )
     try:
+        from elasticsearch import helpers
+
         es = create_elasticsearch_client(es_url, es_user, es_pass)
         parser_instance = PARSERS.get(vendor)()
         mapping = parser_instance.get_elasticsearch_mapping()
-        if not es.indices.exists(index=es_index):
-            es.indices.create(index=es_index, body=mapping)
-        actions = [
-            {"_index": es_index, "_source": sanitize_elasticsearch_export_record(rec)}
-            for rec in export_records
-        ]
-        helpers.bulk(es, actions)
+        with metrics.backend_call("elasticsearch", "export"):
+            if not es.indices.exists(index=es_index):
+                es.indices.create(index=es_index, body=mapping)
+            actions = [
+                {"_index": es_index, "_source": sanitize_elasticsearch_export_record(rec)}
+                for rec in export_records
+            ]
+            helpers.bulk(es, actions)
     except Exception as exc:
         return render_page("Error", "Elasticsearch Export", f"Export failed: {html.escape(str(exc))}. <a href='/case/{case_id}'>Back</a>")
     safe_index = html.escape(str(es_index))
@@ -3840,7 +5708,11 @@ def export_influx():
     influxdb_db = request.form.get("influxdb_db", INFLUXDB_DATABASE)
     influxdb_user = request.form.get("influxdb_user", "")
     influxdb_pass = request.form.get("influxdb_pass", "")
-    case, parsed_data = load_case_data(case_id)
+    try:
+        start, end = request_time_range()
+    except ValueError as exc:
+        return render_page("Error", "Error", html.escape(str(exc)))
+    case, parsed_data = load_case_data(case_id, start=start, end=end)
     if not case:
         return render_page("Error", "Error", parsed_data)
     vendor = case["vendor"]
@@ -3870,12 +5742,14 @@ def export_influx():
 @app.route("/export_csv", methods=["POST"])
 def export_csv():
     case_id = request.form.get("case_id")
-    case, parsed_data = load_case_data(case_id)
+    try:
+        start, end = request_time_range()
+    except ValueError as exc:
+        return render_page("Error", "Error", html.escape(str(exc)))
+    case, parsed_data = load_case_data(case_id, start=start, end=end)
     if not case:
         return render_page("Error", "Error", parsed_data)
-    export_records = normalized_records_for_case(case, parsed_data)
-    df = pd.DataFrame(export_records)
-    csv_data = df.to_csv(index=False)
+    csv_data = normalized_frame_for_case(case, parsed_data).to_csv(index=False)
     filename = f"{case['label'].replace(' ', '_')}_logs.csv"
     return Response(csv_data,
                     mimetype="text/csv",
@@ -3885,11 +5759,15 @@ def export_csv():
 @app.route("/export_json", methods=["POST"])
 def export_json():
     case_id = request.form.get("case_id")
-    case, parsed_data = load_case_data(case_id)
+    try:
+        start, end = request_time_range()
+    except ValueError as exc:
+        return render_page("Error", "Error", html.escape(str(exc)))
+    case, parsed_data = load_case_data(case_id, start=start, end=end)
     if not case:
         return render_page("Error", "Error", parsed_data)
     export_records = normalized_records_for_case(case, parsed_data)
-    json_payload = json.dumps(export_records, ensure_ascii=False, indent=2, default=str)
+    json_payload = json_codec.dumps(export_records, indent=2)
     filename = f"{case['label'].replace(' ', '_')}_logs.json"
     return Response(
         json_payload,
@@ -3897,7 +5775,11 @@ def export_json():
         headers={"Content-Disposition": f"attachment;filename={filename}"}
     )
 
-if __name__ == "__main__":
+def start_background_services():
     ensure_syslog_listener_started()
     ensure_rag_worker_started()
+
+
+if __name__ == "__main__":
+    start_background_services()
     app.run(host="0.0.0.0", port=5000, debug=False)
@@ -0,0 +1,6 @@
+def post_worker_init(worker):
+    # Bind the syslog listener and load its routes as soon as the worker has
+    # imported the app, instead of on the first page request.
+    from eflp_app import start_background_services
+
+    start_background_services()
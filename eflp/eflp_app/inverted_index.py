@@ -0,0 +1,417 @@
+import bisect
+import glob
+import os
+import re
+import struct
+import threading
+import time
+
+
+SEGMENT_MAGIC = b"EFLPIDX1"
+SEGMENT_FOOTER = struct.Struct("<QQQ")
+SPARSE_INTERVAL = 64
+TERM_SEPARATOR = "\x00"
+SEGMENT_NAME_RE = re.compile(r"^(?P<case_id>[A-Za-z0-9_-]{1,128})\.(?P<number>\d+)\.eidx$")
+
+
+def encode_varint(value, out):
+    value = int(value)
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, position):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
+
+
+def encode_postings(rows):
+    out = bytearray()
+    previous = 0
+    for row in rows:
+        encode_varint(row - previous, out)
+        previous = row
+    return bytes(out)
+
+
+def decode_postings(data, count):
+    rows = []
+    position = 0
+    previous = 0
+    for _ in range(count):
+        delta, position = decode_varint(data, position)
+        previous += delta
+        rows.append(previous)
+    return rows
+
+
+def index_term(field, value):
+    return f"{field}{TERM_SEPARATOR}{value}".encode("utf-8")
+
+
+def write_segment(path, postings):
+    # Layout: magic, delta/varint postings blocks, a sorted term dictionary,
+    # then a sparse index of every SPARSE_INTERVAL-th term and a fixed footer.
+    temp_path = f"{path}.tmp"
+    dictionary = bytearray()
+    sparse = bytearray()
+    terms = sorted(postings)
+    with open(temp_path, "wb") as fh:
+        fh.write(SEGMENT_MAGIC)
+        for number, term in enumerate(terms):
+            rows = sorted(set(postings[term]))
+            block = encode_postings(rows)
+            if number % SPARSE_INTERVAL == 0:
+                encode_varint(len(term), sparse)
+                sparse.extend(term)
+                encode_varint(len(dictionary), sparse)
+            encode_varint(len(term), dictionary)
+            dictionary.extend(term)
+            encode_varint(fh.tell(), dictionary)
+            encode_varint(len(block), dictionary)
+            encode_varint(len(rows), dictionary)
+            fh.write(block)
+        dictionary_offset = fh.tell()
+        fh.write(dictionary)
+        sparse_offset = fh.tell()
+        fh.write(sparse)
+        fh.write(SEGMENT_FOOTER.pack(dictionary_offset, sparse_offset, len(terms)))
+    os.replace(temp_path, path)
+
+
+class SegmentReader:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as fh:
+            if fh.read(len(SEGMENT_MAGIC)) != SEGMENT_MAGIC:
+                raise ValueError(f"{path} is not an EFLP index segment")
+            fh.seek(-SEGMENT_FOOTER.size, os.SEEK_END)
+            footer_offset = fh.tell()
+            self.dictionary_offset, sparse_offset, self.term_count = SEGMENT_FOOTER.unpack(fh.read(SEGMENT_FOOTER.size))
+            self.dictionary_size = sparse_offset - self.dictionary_offset
+            fh.seek(sparse_offset)
+            sparse = fh.read(footer_offset - sparse_offset)
+        self.sparse_terms = []
+        self.sparse_offsets = []
+        position = 0
+        while position < len(sparse):
+            length, position = decode_varint(sparse, position)
+            self.sparse_terms.append(bytes(sparse[position:position + length]))
+            position += length
+            offset, position = decode_varint(sparse, position)
+            self.sparse_offsets.append(offset)
+
+    def _read_entries(self, fh, start, limit):
+        fh.seek(self.dictionary_offset + start)
+        end = self.dictionary_offset + self.dictionary_size
+        data = fh.read(min(end - fh.tell(), limit))
+        position = 0
+        while position < len(data):
+            try:
+                length, cursor = decode_varint(data, position)
+                term = bytes(data[cursor:cursor + length])
+                cursor += length
+                offset, cursor = decode_varint(data, cursor)
+                size, cursor = decode_varint(data, cursor)
+                count, cursor = decode_varint(data, cursor)
+            except IndexError:
+                return
+            if cursor > len(data):
+                return
+            position = cursor
+            yield term, offset, size, count
+
+    def lookup(self, term):
+        slot = bisect.bisect_right(self.sparse_terms, term) - 1
+        if slot < 0:
+            return []
+        with open(self.path, "rb") as fh:
+            block_end = self.sparse_offsets[slot + 1] if slot + 1 < len(self.sparse_offsets) else self.dictionary_size
+            for current, offset, size, count in self._read_entries(fh, self.sparse_offsets[slot], block_end - self.sparse_offsets[slot]):
+                if current == term:
+                    fh.seek(offset)
+                    return decode_postings(fh.read(size), count)
+                if current > term:
+                    break
+        return []
+
+    def items(self):
+        with open(self.path, "rb") as fh:
+            entries = list(self._read_entries(fh, 0, self.dictionary_size))
+            for term, offset, size, count in entries:
+                fh.seek(offset)
+                yield term, decode_postings(fh.read(size), count)
+
+
+class InvertedIndex:
+    # Segments are merged in size tiers: once `merge_factor` segments of a
+    # case fall in the same tier they are rewritten as one, on a background
+    # thread, so each posting is rewritten about log(n) times over the life
+    # of a live case instead of on every compaction.
+    def __init__(self, root, fields, skip_values=(), flush_records=5000, flush_seconds=30.0,
+                 merge_factor=8, tier_floor_bytes=64 * 1024):
+        self.root = root
+        self.fields = tuple(fields)
+        self.skip_values = set(skip_values)
+        self.flush_records = max(1, int(flush_records))
+        self.flush_seconds = float(flush_seconds)
+        self.merge_factor = max(2, int(merge_factor))
+        self.tier_floor_bytes = max(1, int(tier_floor_bytes))
+        self.lock = threading.RLock()
+        self.readers = {}
+        self.buffers = {}
+        self.flush_thread = None
+        self.segment_list = None
+        self.segment_mtime = None
+        self.generations = {}
+        self.compact_pending = set()
+        self.compact_wakeup = threading.Event()
+        self.compact_thread = None
+        os.makedirs(root, exist_ok=True)
+
+    def _value(self, value):
+        text = str(value or "").strip().lower()
+        return "" if text in self.skip_values else text
+
+    def _collect(self, records, rows, postings):
+        if hasattr(records, "column"):
+            rows = [int(row) for row in rows]
+            for field in self.fields:
+                for value, row in zip(records.column(field), rows):
+                    value = self._value(value)
+                    if value:
+                        postings.setdefault(index_term(field, value), []).append(row)
+            return postings
+        for record, row in zip(records, rows):
+            for field in self.fields:
+                value = self._value(record.get(field))
+                if value:
+                    postings.setdefault(index_term(field, value), []).append(int(row))
+        return postings
+
+    def _segments(self, case_id=None):
+        # (case_id, number, path, size) per segment. The list is cached and
+        # rebuilt when this process changes the directory or, for segments
+        # written by another worker, when the directory mtime moves.
+        try:
+            mtime = os.stat(self.root).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self.segment_list is None or mtime != self.segment_mtime:
+            found = []
+            for path in glob.glob(os.path.join(self.root, "*.eidx")):
+                match = SEGMENT_NAME_RE.match(os.path.basename(path))
+                if match:
+                    try:
+                        size = os.path.getsize(path)
+                    except OSError:
+                        continue
+                    found.append((match.group("case_id"), int(match.group("number")), path, size))
+            self.segment_list = sorted(found)
+            self.segment_mtime = mtime
+        if case_id is None:
+            return self.segment_list
+        return [segment for segment in self.segment_list if segment[0] == case_id]
+
+    def _invalidate(self):
+        self.segment_list = None
+
+    def _reader(self, path):
+        reader = self.readers.get(path)
+        if reader is None:
+            reader = SegmentReader(path)
+            self.readers[path] = reader
+        return reader
+
+    def _write_case_segment(self, case_id, postings):
+        if not postings:
+            return
+        segments = self._segments(case_id)
+        write_segment(os.path.join(self.root, f"{case_id}.{self._next_number(case_id)}.eidx"), postings)
+        self._invalidate()
+        if len(segments) + 1 >= self.merge_factor:
+            self._schedule_compaction(case_id)
+
+    def _tier(self, size):
+        tier = 0
+        limit = self.tier_floor_bytes
+        while size >= limit:
+            tier += 1
+            limit *= self.merge_factor
+        return tier
+
+    def _merge_candidates(self, segments):
+        # The oldest `merge_factor` segments of the smallest full tier.
+        tiers = {}
+        for segment in segments:
+            tiers.setdefault(self._tier(segment[3]), []).append(segment)
+        for tier in sorted(tiers):
+            if len(tiers[tier]) >= self.merge_factor:
+                return tiers[tier][:self.merge_factor]
+        return []
+
+    def _schedule_compaction(self, case_id):
+        self.compact_pending.add(case_id)
+        if self.compact_thread is None or not self.compact_thread.is_alive():
+            self.compact_thread = threading.Thread(target=self._compact_loop, daemon=True)
+            self.compact_thread.start()
+        self.compact_wakeup.set()
+
+    def _compact_loop(self):
+        while True:
+            self.compact_wakeup.wait()
+            with self.lock:
+                self.compact_wakeup.clear()
+                pending = list(self.compact_pending)
+                self.compact_pending.clear()
+            for case_id in pending:
+                try:
+                    # A merge can fill the next tier up, so repeat until no
+                    # tier is full.
+                    while self._compact(case_id):
+                        pass
+                except (OSError, ValueError):
+                    pass
+
+    def _compact(self, case_id):
+        # Only choosing the segments and publishing the result hold the lock;
+        # the merge itself runs without it, so appends and lookups go on.
+        with self.lock:
+            segments = self._segments(case_id)
+            chosen = self._merge_candidates(segments)
+            if not chosen:
+                return False
+            generation = self.generations.get(case_id, 0)
+            readers = [self._reader(path) for _, _, path, _ in chosen]
+        merged = {}
+        for reader in readers:
+            for term, rows in reader.items():
+                merged.setdefault(term, []).extend(rows)
+        # Not a segment name until it is renamed below.
+        staged_path = os.path.join(self.root, f"{case_id}.eidx.merge")
+        write_segment(staged_path, merged)
+        with self.lock:
+            current = {path for _, _, path, _ in self._segments(case_id)}
+            stale = self.generations.get(case_id, 0) != generation or any(
+                path not in current for _, _, path, _ in chosen
+            )
+            target_path = os.path.join(self.root, f"{case_id}.{self._next_number(case_id)}.eidx")
+            if stale:
+                os.remove(staged_path)
+                return False
+            os.replace(staged_path, target_path)
+            for _, _, path, _ in chosen:
+                self.readers.pop(path, None)
+                os.remove(path)
+            self._invalidate()
+        return True
+
+    def _next_number(self, case_id):
+        segments = self._segments(case_id)
+        return segments[-1][1] + 1 if segments else 0
+
+    def remove_case(self, case_id):
+        with self.lock:
+            self.buffers.pop(case_id, None)
+            self.generations[case_id] = self.generations.get(case_id, 0) + 1
+            for _, _, path, _ in self._segments(case_id):
+                self.readers.pop(path, None)
+                os.remove(path)
+            self._invalidate()
+
+    def write_case(self, case_id, records, rows=None):
+        rows = range(len(records)) if rows is None else rows
+        postings = self._collect(records, rows, {})
+        with self.lock:
+            self.remove_case(case_id)
+            self._write_case_segment(case_id, postings)
+
+    def append(self, case_id, record, row):
+        with self.lock:
+            buffer = self.buffers.get(case_id)
+            if buffer is None:
+                buffer = {"postings": {}, "records": 0, "started": time.time()}
+                self.buffers[case_id] = buffer
+            self._collect([record], [row], buffer["postings"])
+            buffer["records"] += 1
+            if buffer["records"] >= self.flush_records:
+                self.flush(case_id)
+            elif self.flush_thread is None or not self.flush_thread.is_alive():
+                self.flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+                self.flush_thread.start()
+
+    def flush(self, case_id=None):
+        with self.lock:
+            case_ids = [case_id] if case_id else list(self.buffers)
+            for current in case_ids:
+                buffer = self.buffers.pop(current, None)
+                if buffer:
+                    self._write_case_segment(current, buffer["postings"])
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(max(1.0, self.flush_seconds / 2))
+            now = time.time()
+            with self.lock:
+                stale = [case_id for case_id, buffer in self.buffers.items() if now - buffer["started"] >= self.flush_seconds]
+                for case_id in stale:
+                    try:
+                        self.flush(case_id)
+                    except OSError:
+                        pass
+
+    def lookup(self, fields, value):
+        value = self._value(value)
+        hits = {}
+        if not value:
+            return hits
+        terms = [index_term(field, value) for field in fields if field in self.fields]
+        # Only the segment list and the in-memory buffers are read under the
+        # lock; segment files are read after releasing it so a search does
+        # not stall appends or merges. A merge that removes a listed segment
+        # in between makes the lookup start over from a fresh list.
+        for _ in range(3):
+            hits = {}
+            with self.lock:
+                segments = self._segments()
+                readers = {path: self.readers.get(path) for _, _, path, _ in segments}
+                for case_id, buffer in self.buffers.items():
+                    for term in terms:
+                        rows = buffer["postings"].get(term)
+                        if rows:
+                            hits.setdefault(case_id, set()).update(rows)
+                for path in [path for path in self.readers if path not in readers]:
+                    self.readers.pop(path, None)
+            opened = {}
+            removed = False
+            for case_id, _, path, _ in segments:
+                try:
+                    reader = readers[path]
+                    if reader is None:
+                        reader = opened[path] = SegmentReader(path)
+                    for term in terms:
+                        rows = reader.lookup(term)
+                        if rows:
+                            hits.setdefault(case_id, set()).update(rows)
+                except FileNotFoundError:
+                    removed = True
+                    break
+                except (OSError, ValueError):
+                    continue
+            with self.lock:
+                live = {path for _, _, path, _ in self._segments()}
+                for path, reader in opened.items():
+                    if path in live:
+                        self.readers.setdefault(path, reader)
+            if not removed:
+                break
+        return {case_id: sorted(rows) for case_id, rows in hits.items()}
@@ -0,0 +1,124 @@
+import json
+import os
+from collections.abc import Mapping
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def default(value):
+    # Same fallback as json.dumps(default=str), except for float/int
+    # subclasses (numpy scalars) which the stdlib writes as numbers and
+    # mappings such as NormalizedRecord which are written as objects.
+    if isinstance(value, float):
+        return float(value)
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, Mapping):
+        return value.to_dict() if hasattr(value, "to_dict") else dict(value)
+    return str(value)
+
+
+class StdlibCodec:
+    name = "stdlib"
+
+    def dumpb(self, value, sort_keys=False, indent=None):
+        return json.dumps(
+            value, ensure_ascii=False, default=default, sort_keys=sort_keys, indent=indent,
+            separators=None if indent else (",", ":"),
+        ).encode("utf-8", "surrogatepass")
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    name = "orjson"
+    base_options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    def dumpb(self, value, sort_keys=False, indent=None):
+        options = self.base_options
+        if sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(value, default=default, option=options)
+        except TypeError:
+            # Integers beyond 64 bits and other values orjson refuses outright.
+            return STDLIB.dumpb(value, sort_keys=sort_keys, indent=indent)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+class MsgspecCodec:
+    name = "msgspec"
+
+    def __init__(self):
+        self.encoder = msgspec.json.Encoder(enc_hook=default)
+        self.sorted_encoder = msgspec.json.Encoder(enc_hook=default, order="sorted")
+        self.decoder = msgspec.json.Decoder()
+
+    def dumpb(self, value, sort_keys=False, indent=None):
+        try:
+            data = (self.sorted_encoder if sort_keys else self.encoder).encode(value)
+        except (TypeError, msgspec.EncodeError):
+            return STDLIB.dumpb(value, sort_keys=sort_keys, indent=indent)
+        return msgspec.json.format(data, indent=2) if indent else data
+
+    def loads(self, data):
+        try:
+            return self.decoder.decode(data)
+        except msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+
+STDLIB = StdlibCodec()
+
+
+def available_codecs():
+    codecs = {"stdlib": STDLIB}
+    if orjson is not None:
+        codecs["orjson"] = OrjsonCodec()
+    if msgspec is not None:
+        codecs["msgspec"] = MsgspecCodec()
+    return codecs
+
+
+def select_codec(name="auto"):
+    codecs = available_codecs()
+    name = str(name or "auto").strip().lower()
+    if name in codecs:
+        return codecs[name]
+    for candidate in ("orjson", "msgspec"):
+        if candidate in codecs:
+            return codecs[candidate]
+    return STDLIB
+
+
+CODEC = select_codec(os.environ.get("EFLP_JSON_CODEC", "auto"))
+
+
+def dumpb(value, sort_keys=False, indent=None):
+    return CODEC.dumpb(value, sort_keys=sort_keys, indent=indent)
+
+
+def dumps(value, sort_keys=False, indent=None):
+    return CODEC.dumpb(value, sort_keys=sort_keys, indent=indent).decode("utf-8", "surrogatepass")
+
+
+def dump_line(value):
+    return CODEC.dumpb(value) + b"\n"
+
+
+def loads(data):
+    return CODEC.loads(data)
+
@@ -0,0 +1,325 @@
+import gzip
+import io
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+MANIFEST_NAME = "segments.json"
+READ_CHUNK_BYTES = 1024 * 1024
+REVERSE_BLOCK_BYTES = 4 * 1024 * 1024
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+COMPRESSION_QUEUE = queue.Queue()
+COMPRESSION_THREAD = None
+COMPRESSION_LOCK = threading.Lock()
+
+
+def available_compression(name):
+    name = str(name or "").strip().lower()
+    if name == "zstd" and zstandard is None:
+        return "gzip"
+    return name if name in COMPRESSION_SUFFIXES else "none"
+
+
+def compression_worker():
+    while True:
+        store, segment = COMPRESSION_QUEUE.get()
+        try:
+            store.compress_segment(segment)
+        except Exception:
+            pass
+        finally:
+            COMPRESSION_QUEUE.task_done()
+
+
+def schedule_compression(store, segment):
+    global COMPRESSION_THREAD
+    with COMPRESSION_LOCK:
+        if COMPRESSION_THREAD is None or not COMPRESSION_THREAD.is_alive():
+            COMPRESSION_THREAD = threading.Thread(target=compression_worker, daemon=True)
+            COMPRESSION_THREAD.start()
+    COMPRESSION_QUEUE.put((store, segment))
+
+
+class LiveSegmentStore:
+    # Segments share one logical byte offset space: segment N starts where
+    # segment N-1 ended, so offsets recorded by the RAG watermarks, search
+    # postings and partition index stay valid across rotation and compression.
+    def __init__(self, directory, legacy_path=None, max_bytes=256 * 1024 * 1024, max_seconds=86400,
+                 compression="gzip", retention_seconds=0, retention_bytes=0, flush_seconds=5.0):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self.max_bytes = max(1, int(max_bytes))
+        self.max_seconds = float(max_seconds)
+        self.compression = available_compression(compression)
+        self.retention_seconds = float(retention_seconds or 0)
+        self.retention_bytes = int(retention_bytes or 0)
+        self.flush_seconds = float(flush_seconds)
+        self.lock = threading.RLock()
+        self.persisted = 0.0
+        self.segments = []
+        self._load(legacy_path)
+
+    def _load(self, legacy_path):
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as fh:
+                self.segments = json.load(fh).get("segments", [])
+        elif legacy_path and os.path.exists(legacy_path):
+            segment = self._new_segment(0, os.path.getmtime(legacy_path))
+            os.replace(legacy_path, self._path(segment))
+            segment["size"] = segment["disk_bytes"] = os.path.getsize(self._path(segment))
+            segment["records"] = None
+            self.segments.append(segment)
+        self.segments = [segment for segment in self.segments if os.path.exists(self._path(segment))]
+        if self.segments and not self.segments[-1]["closed"]:
+            active = self.segments[-1]
+            active["size"] = active["disk_bytes"] = os.path.getsize(self._path(active))
+        for segment in self.segments:
+            if segment["closed"] and not segment["compressed"] and self.compression != "none":
+                schedule_compression(self, segment)
+        self.enforce_retention()
+        self._persist()
+
+    def _path(self, segment):
+        return os.path.join(self.directory, segment["file"])
+
+    def _new_segment(self, base, now):
+        return {
+            "file": f"{base:020d}.jsonl",
+            "base": base,
+            "size": 0,
+            "records": 0,
+            "created": now,
+            "updated": now,
+            "closed": False,
+            "compressed": False,
+            "disk_bytes": 0,
+        }
+
+    def _persist(self):
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as fh:
+            json.dump({"segments": self.segments}, fh)
+        os.replace(temp_path, self.manifest_path)
+        self.persisted = time.time()
+
+    def size(self):
+        with self.lock:
+            if not self.segments:
+                return 0
+            last = self.segments[-1]
+            return last["base"] + last["size"]
+
+    def first_offset(self):
+        with self.lock:
+            return self.segments[0]["base"] if self.segments else 0
+
+    def append(self, data, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            active = self.segments[-1] if self.segments and not self.segments[-1]["closed"] else None
+            if active and active["size"] and (
+                active["size"] >= self.max_bytes or now - active["created"] >= self.max_seconds
+            ):
+                self._close(active)
+                active = None
+            if active is None:
+                active = self._new_segment(self.size(), now)
+                self.segments.append(active)
+                self._persist()
+            with open(self._path(active), "ab") as fh:
+                fh.write(data)
+            start = active["base"] + active["size"]
+            active["size"] += len(data)
+            active["disk_bytes"] = active["size"]
+            if active["records"] is not None:
+                active["records"] += data.count(b"\n")
+            active["updated"] = now
+            if now - self.persisted >= self.flush_seconds:
+                self._persist()
+            return start, start + len(data)
+
+    def _close(self, segment):
+        segment["closed"] = True
+        self._persist()
+        if self.compression != "none":
+            schedule_compression(self, segment)
+        self.enforce_retention()
+
+    def compress_segment(self, segment):
+        with self.lock:
+            if segment not in self.segments or segment["compressed"] or not segment["closed"]:
+                return
+            source_path = self._path(segment)
+        suffix = COMPRESSION_SUFFIXES[self.compression]
+        target_name = f"{segment['file']}{suffix}"
+        target_path = os.path.join(self.directory, target_name)
+        with open(source_path, "rb") as source, open(f"{target_path}.tmp", "wb") as raw:
+            if self.compression == "zstd":
+                with zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=False) as target:
+                    while True:
+                        chunk = source.read(READ_CHUNK_BYTES)
+                        if not chunk:
+                            break
+                        target.write(chunk)
+            else:
+                with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as target:
+                    while True:
+                        chunk = source.read(READ_CHUNK_BYTES)
+                        if not chunk:
+                            break
+                        target.write(chunk)
+        with self.lock:
+            if segment not in self.segments:
+                os.remove(f"{target_path}.tmp")
+                return
+            os.replace(f"{target_path}.tmp", target_path)
+            segment["file"] = target_name
+            segment["compressed"] = True
+            segment["disk_bytes"] = os.path.getsize(target_path)
+            self._persist()
+            os.remove(source_path)
+
+    def enforce_retention(self, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            removed = False
+            total = sum(segment["disk_bytes"] for segment in self.segments)
+            while self.segments and self.segments[0]["closed"]:
+                oldest = self.segments[0]
+                expired = self.retention_seconds and now - oldest["updated"] > self.retention_seconds
+                oversized = self.retention_bytes and total > self.retention_bytes
+                if not expired and not oversized:
+                    break
+                self.segments.pop(0)
+                total -= oldest["disk_bytes"]
+                try:
+                    os.remove(self._path(oldest))
+                except OSError:
+                    pass
+                removed = True
+            if removed:
+                self._persist()
+
+    def _open(self, segment):
+        # `segment` is a snapshot entry. Compression renames the file and
+        # retention deletes it, both under the lock, so the current name is
+        # looked up and opened under the lock too; an open handle stays
+        # readable afterwards. Returns None once retention has removed it.
+        with self.lock:
+            current = next((item for item in self.segments if item["base"] == segment["base"]), None)
+            if current is None:
+                return None
+            segment["file"] = current["file"]
+            segment["compressed"] = current["compressed"]
+            try:
+                raw = open(self._path(current), "rb")
+            except FileNotFoundError:
+                return None
+        if not segment["compressed"]:
+            return raw
+        if segment["file"].endswith(".zst"):
+            return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+
+    def _skip(self, reader, count, segment):
+        if not segment["compressed"]:
+            reader.seek(count)
+            return
+        while count > 0:
+            chunk = reader.read(min(count, READ_CHUNK_BYTES))
+            if not chunk:
+                break
+            count -= len(chunk)
+
+    def snapshot(self):
+        with self.lock:
+            return [dict(segment) for segment in self.segments]
+
+    def _reverse_start(self, segment, count):
+        # Walk back from the end of an uncompressed segment in large blocks
+        # until count complete lines are behind us; returns a segment-local
+        # offset aligned to a line start.
+        found = 0
+        position = segment["size"]
+        reader = self._open(segment)
+        if reader is None or segment["compressed"]:
+            # Removed or compressed since the snapshot; the caller falls back
+            # to a forward read.
+            if reader is not None:
+                reader.close()
+            return None
+        with reader:
+            while position > 0:
+                read_size = min(REVERSE_BLOCK_BYTES, position)
+                position -= read_size
+                reader.seek(position)
+                block = reader.read(read_size)
+                index = len(block)
+                while True:
+                    index = block.rfind(b"\n", 0, index)
+                    if index < 0:
+                        break
+                    found += 1
+                    if found > count:
+                        return position + index + 1
+        return 0
+
+    def tail_lines(self, count):
+        lines = []
+        needed = count
+        for segment in reversed(self.snapshot()):
+            if needed <= 0:
+                break
+            segment_end = segment["base"] + segment["size"]
+            start = None if segment["compressed"] else self._reverse_start(segment, needed)
+            if start is None:
+                found = list(deque(self.iter_lines(segment["base"], segment_end), maxlen=needed))
+            else:
+                found = list(self.iter_lines(segment["base"] + start, segment_end))
+            lines[:0] = found
+            needed -= len(found)
+        return lines
+
+    def iter_lines(self, start, end):
+        for segment in self.snapshot():
+            segment_end = segment["base"] + segment["size"]
+            if segment_end <= start or segment["base"] >= end:
+                continue
+            position = max(start, segment["base"])
+            limit = min(end, segment_end)
+            reader = self._open(segment)
+            if reader is None:
+                continue
+            with reader:
+                self._skip(reader, position - segment["base"], segment)
+                while position < limit:
+                    line = reader.readline()
+                    if not line:
+                        break
+                    yield position, line
+                    position += len(line)
+
+    def read_range(self, start, end):
+        parts = []
+        for segment in self.snapshot():
+            segment_end = segment["base"] + segment["size"]
+            if segment_end <= start or segment["base"] >= end:
+                continue
+            position = max(start, segment["base"])
+            reader = self._open(segment)
+            if reader is None:
+                continue
+            with reader:
+                self._skip(reader, position - segment["base"], segment)
+                parts.append(reader.read(min(end, segment_end) - position))
+        return b"".join(parts)
@@ -0,0 +1,119 @@
+import hashlib
+import re
+
+
+WILDCARD = "<*>"
+MASK_PATTERNS = [
+    re.compile(r"^\[?(?:\d{1,3}\.){3}\d{1,3}(?:[:/]\d+)?\]?[,;)]?$"),
+    re.compile(r"^[0-9a-f]{2}(?::[0-9a-f]{2}){5}$", re.IGNORECASE),
+    re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE),
+    re.compile(r"^(?:0x)?[0-9a-f]{8,}$", re.IGNORECASE),
+    re.compile(r"^[-+]?\d+(?:[.:/,]\d+)*[a-z%]{0,3}$", re.IGNORECASE),
+    re.compile(r"^[a-z0-9_.\-]+=.*\d.*$", re.IGNORECASE),
+]
+TOKEN_SPLIT_RE = re.compile(r"\s+")
+
+
+def mask_token(token):
+    for pattern in MASK_PATTERNS:
+        if pattern.match(token):
+            if "=" in token and not token.startswith("="):
+                return token.split("=", 1)[0] + "=" + WILDCARD
+            return WILDCARD
+    return token
+
+
+def template_tokens(message, max_tokens=64):
+    tokens = [token for token in TOKEN_SPLIT_RE.split(str(message or "").strip()) if token]
+    return [mask_token(token) for token in tokens[:max_tokens]]
+
+
+class LogTemplateMiner:
+    # Drain: a fixed-depth prefix tree keyed by token count and the leading
+    # tokens routes each message to a small leaf of candidate clusters, so
+    # matching cost does not grow with the number of templates.
+    def __init__(self, depth=4, similarity=0.5, max_children=100, max_clusters=5000, namespace=""):
+        self.depth = max(1, int(depth))
+        self.similarity = float(similarity)
+        self.max_children = max(2, int(max_children))
+        self.max_clusters = max(1, int(max_clusters))
+        self.namespace = str(namespace or "")
+        self.root = {}
+        self.clusters = {}
+
+    def add(self, message):
+        tokens = template_tokens(message)
+        leaf = self._leaf_for(tokens)
+        cluster = self._best_match(leaf, tokens)
+        if cluster is None:
+            if len(self.clusters) >= self.max_clusters:
+                cluster = self._overflow_cluster(tokens)
+            else:
+                cluster = self._new_cluster(tokens)
+                leaf.append(cluster)
+        else:
+            cluster["tokens"] = [
+                current if current == incoming else WILDCARD
+                for current, incoming in zip(cluster["tokens"], tokens)
+            ]
+        cluster["size"] += 1
+        return cluster
+
+    def template(self, cluster_key):
+        cluster = self.clusters.get(cluster_key)
+        return " ".join(cluster["tokens"]) if cluster else ""
+
+    def template_id(self, cluster_key):
+        # Derived from the current masked template rather than from whichever
+        # message opened the cluster, so the same template gets the same id
+        # regardless of arrival order or a restart.
+        cluster = self.clusters.get(cluster_key)
+        if cluster is None:
+            return ""
+        template = " ".join(cluster["tokens"])
+        return hashlib.sha1(f"{self.namespace}|{len(cluster['tokens'])}|{template}".encode("utf-8")).hexdigest()[:16]
+
+    def _leaf_for(self, tokens):
+        node = self.root.setdefault(len(tokens), {})
+        for token in tokens[:self.depth]:
+            key = WILDCARD if any(ch.isdigit() for ch in token) else token
+            children = node.setdefault("children", {})
+            if key not in children and len(children) >= self.max_children:
+                key = WILDCARD
+            node = children.setdefault(key, {})
+        return node.setdefault("clusters", [])
+
+    def _best_match(self, leaf, tokens):
+        best = None
+        best_score = -1.0
+        for cluster in leaf:
+            score = self._score(cluster["tokens"], tokens)
+            if score > best_score:
+                best = cluster
+                best_score = score
+        if best is not None and best_score >= self.similarity:
+            return best
+        return None
+
+    def _score(self, template, tokens):
+        if not tokens:
+            return 1.0
+        same = sum(1 for current, incoming in zip(template, tokens) if current == incoming and current != WILDCARD)
+        wildcards = sum(1 for current in template if current == WILDCARD)
+        return (same + wildcards) / float(len(tokens))
+
+    def _new_cluster(self, tokens):
+        # The key only identifies the cluster inside this miner; use
+        # template_id() for anything persisted.
+        cluster_key = len(self.clusters)
+        cluster = {"key": cluster_key, "tokens": list(tokens), "size": 0}
+        self.clusters[cluster_key] = cluster
+        return cluster
+
+    def _overflow_cluster(self, tokens):
+        cluster_key = ("overflow", len(tokens))
+        cluster = self.clusters.get(cluster_key)
+        if cluster is None:
+            cluster = {"key": cluster_key, "tokens": [WILDCARD] * len(tokens), "size": 0}
+            self.clusters[cluster_key] = cluster
+        return cluster
@@ -0,0 +1,256 @@
+import bisect
+import math
+import threading
+import time
+
+
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0,
+)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names, values, extra=None):
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class ShardedMetric:
+    # Every writing thread owns one dict of label tuple -> value, so the hot
+    # path is a thread-local lookup plus a dict update without any lock. The
+    # lock is only taken when a thread creates its shard and when /metrics
+    # merges the shards; shards of finished threads are folded into `retired`.
+    kind = ""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.local = threading.local()
+        self.shards = []
+        self.retired = {}
+        self.lock = threading.Lock()
+
+    def shard(self):
+        try:
+            return self.local.values
+        except AttributeError:
+            values = self.local.values = {}
+            with self.lock:
+                self.shards.append((threading.current_thread(), values))
+            return values
+
+    def merge(self, target, source):
+        raise NotImplementedError
+
+    def snapshot(self):
+        merged = {}
+        with self.lock:
+            alive = []
+            for thread, values in self.shards:
+                if thread.is_alive():
+                    alive.append((thread, values))
+                else:
+                    self.merge(self.retired, dict(values))
+            self.shards = alive
+            self.merge(merged, self.retired)
+            for _, values in alive:
+                self.merge(merged, dict(values))
+        return merged
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(ShardedMetric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        values = self.shard()
+        values[labels] = values.get(labels, 0) + amount
+
+    def merge(self, target, source):
+        for labels, value in source.items():
+            target[labels] = target.get(labels, 0) + value
+
+    def render(self):
+        lines = self.header()
+        for labels, value in sorted(self.snapshot().items()):
+            lines.append(f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}")
+        return lines
+
+
+class Histogram(ShardedMetric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        values = self.shard()
+        state = values.get(labels)
+        if state is None:
+            # Per-bucket counts (not cumulative), then +Inf, sum and count.
+            state = values[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def time(self, *labels):
+        return Timer(self, labels)
+
+    def merge(self, target, source):
+        for labels, state in source.items():
+            current = target.get(labels)
+            if current is None:
+                target[labels] = list(state)
+            else:
+                for position, value in enumerate(state):
+                    current[position] += value
+
+    def render(self):
+        lines = self.header()
+        for labels, state in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), state):
+                cumulative += count
+                bucket_labels = format_labels(self.labelnames, labels, f'le="{format_value(float(bound))}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            series = format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{series} {format_value(state[-2])}")
+            lines.append(f"{self.name}_count{series} {state[-1]}")
+        return lines
+
+
+class Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+        return False
+
+
+class Gauge:
+    # Read at scrape time from `collect`, which returns a number or a dict of
+    # label tuple -> number, so no write path exists at all. kind="counter"
+    # exposes totals that another module already keeps.
+    def __init__(self, name, documentation, labelnames=(), collect=None, kind="gauge"):
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        try:
+            value = self.collect() if self.collect else 0
+        except Exception:
+            return lines
+        values = value if isinstance(value, dict) else {(): value}
+        for labels, item in sorted(values.items()):
+            lines.append(f"{self.name}{format_labels(self.labelnames, labels)} {format_value(item)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+        self.lock = threading.Lock()
+
+    def register(self, metric):
+        with self.lock:
+            self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, labelnames=(), collect=None, kind="gauge"):
+        return self.register(Gauge(name, documentation, labelnames, collect, kind))
+
+    def render(self):
+        with self.lock:
+            metrics = list(self.metrics)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+INGEST_EVENTS = REGISTRY.counter(
+    "eflp_ingest_events_total", "Log lines accepted per ingest route and vendor.", ("route", "vendor"))
+INGEST_REJECTED = REGISTRY.counter(
+    "eflp_ingest_rejected_total", "Log lines dropped or failed per ingest route.", ("route", "reason"))
+PARSE_SECONDS = REGISTRY.histogram(
+    "eflp_parse_seconds", "Time to parse and normalize one live line.", ("vendor",))
+PARSE_JOB_SECONDS = REGISTRY.histogram(
+    "eflp_parse_job_seconds", "Wall time of an upload parse job.", ("vendor",))
+LIVE_APPEND_SECONDS = REGISTRY.histogram(
+    "eflp_live_append_seconds", "Time to append one record to a live case.")
+LIVE_STAGE_SECONDS = REGISTRY.histogram(
+    "eflp_live_stage_seconds", "Seconds from syslog receipt until a sampled record reaches each stage.", ("stage",))
+RAG_BATCH_SECONDS = REGISTRY.histogram(
+    "eflp_rag_batch_seconds", "Time to process one RAG queue item.", ("kind",))
+RAG_BATCH_RECORDS = REGISTRY.counter(
+    "eflp_rag_batch_records_total", "Records taken off the RAG queue.", ("kind",))
+BACKEND_SECONDS = REGISTRY.histogram(
+    "eflp_backend_call_seconds", "Latency of calls to external services.", ("backend", "operation"))
+BACKEND_ERRORS = REGISTRY.counter(
+    "eflp_backend_call_errors_total", "Failed calls to external services.", ("backend", "operation"))
+CASE_CACHE_REQUESTS = REGISTRY.counter(
+    "eflp_case_cache_requests_total", "Case data cache lookups.", ("result",))
+HTTP_SECONDS = REGISTRY.histogram(
+    "eflp_http_request_seconds", "Time to render a response per endpoint.", ("endpoint", "method"))
+
+
+class BackendCall:
+    # `with backend_call("neo4j", "get_case"):` times the block and counts it
+    # as an error when it raises.
+    __slots__ = ("labels", "started")
+
+    def __init__(self, backend, operation):
+        self.labels = (backend, operation)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        BACKEND_SECONDS.observe(time.perf_counter() - self.started, *self.labels)
+        if exc_type is not None:
+            BACKEND_ERRORS.inc(*self.labels)
+        return False
+
+
+def backend_call(backend, operation):
+    return BackendCall(backend, operation)
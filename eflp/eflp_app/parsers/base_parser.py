@@ -3,17 +3,112 @@ from dateutil import parser as date_parser
 from datetime import datetime, timedelta
 import ipaddress
 import json
-import logging
 import re
-
-logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.DEBUG)
+import sys
+
+from parsers import diagnostics
+from parsers.keyword_matcher import KeywordClassifier
+from parsers.record import PARSER_PROVENANCE, NormalizedRecord, RecordBatch
+
+KV_KEY_CACHE = {}
+KV_KEY_CACHE_LIMIT = 4096
+PLAN_CACHES = {}
+PLAN_CACHE_LIMIT = 1024
+
+# Candidate raw_fields keys for each value enrich_record looks up, in order.
+EXTRACTION_FIELDS = (
+    ("message", ("msg", "message", "description", "reason", "details")),
+    ("date", ("date", "logdate", "eventdate", "devdate")),
+    ("time", ("time", "eventtime", "devtime")),
+    ("timestamp", ("timestamp", "event_time", "generated_time", "receive_time", "time_generated", "starttime")),
+    ("rt", ("rt",)),
+    ("severity", ("severity", "level", "risk", "threatlevel", "priority", "pri")),
+    ("host", ("host", "hostname", "device", "device_name", "devname")),
+    ("src_ip", ("src", "srcip", "src_ip", "source", "source_ip", "sip", "clientip", "client_ip")),
+    ("dst_ip", ("dst", "dstip", "dst_ip", "destination", "destination_ip", "dip", "serverip", "server_ip")),
+    ("src_port", ("srcport", "sport", "spt", "source_port")),
+    ("dst_port", ("dstport", "dport", "dpt", "destination_port")),
+    ("protocol", ("proto", "protocol", "service", "transport")),
+    ("action", ("action", "act", "result", "status", "disposition", "verdict", "operation")),
+    ("user", ("user", "username", "srcuser", "dstuser", "admin", "account", "userid", "user_id")),
+    ("rule", ("rule", "rulename", "policy", "policyid", "policyname", "acl", "access_rule")),
+    ("signature", ("signature", "attack", "threat", "sig", "sig_name", "ips_signature")),
+    ("event_id", ("eventid", "event_id", "id", "logid", "msgid", "messageid", "sid")),
+    ("session_id", ("sessionid", "session_id", "connection_id", "connid", "flowid", "sid")),
+    ("status", ("status", "result", "outcome", "disposition")),
+    ("category_type", ("type", "subtype", "log_type", "event_type", "category", "module", "service")),
+    ("category_app", ("appcat", "app", "signature", "threat", "attack", "proto")),
+    ("event", (
+        "event", "event_type", "subtype", "log_subtype", "attack", "signature",
+        "threat", "msgid", "messageid", "id", "operation", "action",
+    )),
+)
+FIELD_CANDIDATES = dict(EXTRACTION_FIELDS)
+# raw_fields key -> (field, priority) pairs it can feed.
+CANDIDATE_FIELDS = {}
+for field_name, candidates in EXTRACTION_FIELDS:
+    for priority, candidate in enumerate(candidates):
+        CANDIDATE_FIELDS.setdefault(candidate, []).append((field_name, priority))
+
+
+class ExtractionPlan:
+    # Resolved once per raw_fields key set: the lowercased, interned name of
+    # each source key, and for each EXTRACTION_FIELDS entry only the
+    # candidates that are present, still in priority order. Looking a value
+    # up through the plan gives the same result as scanning every candidate.
+    __slots__ = ("key_names", "fields")
+
+    def __init__(self, keys):
+        self.key_names = {key: sys.intern(str(key).lower()) for key in keys}
+        # Walk the present keys rather than every candidate list, so key sets
+        # that are seen only once stay cheap to compile.
+        found = {}
+        for key in set(self.key_names.values()):
+            for name, priority in CANDIDATE_FIELDS.get(key, ()):
+                found.setdefault(name, []).append((priority, key))
+        self.fields = dict.fromkeys(FIELD_CANDIDATES, ())
+        for name, ranked in found.items():
+            ranked.sort()
+            self.fields[name] = tuple(key for _, key in ranked)
+
+
+def extraction_plan(vendor, data):
+    # One cache per vendor, so a parser whose key sets vary per line (e.g.
+    # tokens picked up from free text) cannot crowd out the others. A full
+    # cache is emptied rather than frozen, so it follows the current traffic.
+    cache = PLAN_CACHES.get(vendor)
+    if cache is None:
+        cache = PLAN_CACHES[vendor] = {}
+    signature = frozenset(data)
+    plan = cache.get(signature)
+    if plan is None:
+        if len(cache) >= PLAN_CACHE_LIMIT:
+            cache.clear()
+        plan = cache[signature] = ExtractionPlan(signature)
+    return plan
+
+
+class LineContext:
+    # Per-source details the line itself does not carry, e.g. where and when
+    # a live datagram arrived. `fields` fill record keys the parser left
+    # unset, and `received_at` is also the timestamp for lines without one.
+    __slots__ = ("fields", "received_at")
+
+    def __init__(self, received_at="", **fields):
+        if received_at:
+            fields["received_at"] = received_at
+        self.received_at = received_at
+        self.fields = fields
 
 
 class BaseParser(ABC):
+    VENDOR = ""
+    # Quoted values are captured without their quotes, so parse_kv_pairs
+    # needs no clean_value() pass per token.
     KV_REGEX = re.compile(
-        r'(?P<key>[A-Za-z0-9_.\-]+)\s*(?:=|:)\s*(?P<value>"[^"]*"|\'[^\']*\'|\[[^\]]*\]|[^\s,;]+)'
+        r'([A-Za-z0-9_.\-]+)\s*[=:]\s*(?:"([^"]*)"|\'([^\']*)\'|(\[[^\]]*\]|[^\s,;]+))'
     )
+    JSON_START_REGEX = re.compile(r'[ \t\n\r]*\{')
     SYSLOG_REGEXES = [
         re.compile(
             r'^<(?P<priority>\d+)>\d?\s+(?P<timestamp>\S+)\s+(?P<host>\S+)\s+(?P<app>\S+)\s+(?P<payload>.*)$'
@@ -27,6 +122,9 @@ class BaseParser(ABC):
     ]
     IPV4_REGEX = re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b')
     DATE_WITH_YEAR_REGEX = re.compile(r'\b\d{1,4}[/-]\d{1,2}[/-]\d{1,4}\b')
+    ISO_TIMESTAMP_REGEX = re.compile(
+        r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d{1,6})?(?:Z|[+-]\d{2}:\d{2})?'
+    )
 
     SEVERITY_ALIASES = {
         "EMERG": "CRITICAL",
@@ -79,26 +177,92 @@ class BaseParser(ABC):
         "quarantine": "quarantine",
     }
 
+    ACTION_CLASSIFIER = KeywordClassifier([
+        ("deny", ["deny", "drop", "block", "reject", "quarantine"]),
+        ("allow", ["allow", "accept", "permit", "pass"]),
+        ("auth_success", ["auth success", "login success", "authenticated"]),
+        ("auth_fail", ["auth fail", "login fail", "authentication failed", "denied"]),
+        ("logout", ["logout"]),
+        ("login", ["login"]),
+    ])
+    OUTCOME_CLASSIFIER = KeywordClassifier([
+        ("blocked", ["deny", "drop", "block", "reject", "quarantine"]),
+        ("failed", ["fail", "failed", "error", "invalid"]),
+        ("allowed", ["allow", "accept", "permit", "pass"]),
+        ("success", ["success", "ok", "authenticated"]),
+        ("detected", ["detect", "alert", "threat"]),
+    ])
+    CATEGORY_CLASSIFIER = KeywordClassifier([
+        ("threat", ["threat", "intrusion", "ips", "ids", "attack", "exploit", "signature"]),
+        ("malware", ["malware", "virus", "spyware", "ransomware", "botnet", "c2"]),
+        ("authentication", ["auth", "login", "logout", "mfa", "radius", "saml", "ldap", "user-id", "user id"]),
+        ("vpn", ["vpn", "ipsec", "ike", "sslvpn", "globalprotect", "tunnel"]),
+        ("system", ["system", "daemon", "kernel", "service", "resource", "health", "temperature", "fan", "cpu", "memory"]),
+        ("configuration", ["config", "policy install", "commit", "admin", "cli", "change", "audit"]),
+        ("dns", ["dns", "domain", "resolver", "query", "response"]),
+        ("web", ["url", "web", "http", "https", "proxy", "category"]),
+        ("traffic", ["nat", "session", "flow", "traffic", "forward", "packet", "connection", "firewall"]),
+        ("ha", ["ha", "cluster", "failover", "sync"]),
+        ("routing", ["route", "bgp", "ospf", "rip", "static route"]),
+        ("wireless", ["wireless", "wifi", "ssid", "ap "]),
+    ])
+    NETWORK_TYPE_CLASSIFIER = KeywordClassifier([
+        ("sslvpn", ["sslvpn", "nsvpn", "globalprotect", "vpn", "citrix gateway"]),
+        ("ike", ["ike", "ipsec"]),
+        ("appfw", ["appfw", "app firewall"]),
+        ("wan", ["wan", "internet"]),
+        ("lan", ["lan", "intranet"]),
+        ("dmz", ["dmz"]),
+    ])
+
     @abstractmethod
-    def parse(self, file_path):
+    def parse_line(self, line, context=None):
         pass
 
+    def parse_lines(self, lines, context=None):
+        for line in lines:
+            record = self.parse_line(line, context)
+            if record is not None:
+                yield record
+
+    def parse(self, file_path):
+        records = RecordBatch()
+        with open(file_path, "r", errors="ignore") as fh:
+            records.extend(self.parse_lines(fh))
+        return records
+
     @abstractmethod
     def get_elasticsearch_mapping(self):
         pass
 
-    def to_int(self, value, default=None):
+    def conversion_failed(self, kind, field, value, error):
+        # field=None marks a probe (e.g. scanning positional fields for a port)
+        # whose failures are expected and not counted.
+        if field is not None:
+            diagnostics.current().failure(self.VENDOR, kind, field, value, error)
+
+    def to_int(self, value, default=None, field=""):
+        if value is None:
+            return default
+        text = str(value).strip()
+        if not text:
+            return default
         try:
-            return int(str(value).strip())
-        except (TypeError, ValueError) as e:
-            logger.debug(f"to_int conversion failed for value '{value}': {e}")
+            return int(text)
+        except ValueError as e:
+            self.conversion_failed("int", field, value, e)
             return default
 
-    def to_float(self, value, default=None):
+    def to_float(self, value, default=None, field=""):
+        if value is None:
+            return default
+        text = str(value).strip()
+        if not text:
+            return default
         try:
-            return float(str(value).strip())
-        except (TypeError, ValueError) as e:
-            logger.debug(f"to_float conversion failed for value '{value}': {e}")
+            return float(text)
+        except ValueError as e:
+            self.conversion_failed("float", field, value, e)
             return default
 
     def normalize_severity(self, text, fallback='INFO'):
@@ -108,7 +272,7 @@ class BaseParser(ABC):
         if text in self.SEVERITY_ALIASES:
             return self.SEVERITY_ALIASES[text]
         if text.isdigit():
-            prio = self.to_int(text)
+            prio = self.to_int(text, field="priority")
             if prio is not None:
                 return self.severity_from_priority(prio)
         return fallback
@@ -126,7 +290,7 @@ class BaseParser(ABC):
         return 5
 
     def severity_from_priority(self, priority_value):
-        priority = self.to_int(priority_value)
+        priority = self.to_int(priority_value, field="priority")
         if priority is None:
             return "INFO"
         sev_code = priority % 8
@@ -140,9 +304,20 @@ class BaseParser(ABC):
             return "LOW"
         return "INFO"
 
-    def to_iso(self, date_str, default=None):
+    def to_iso(self, date_str, default=None, field=""):
+        if date_str is None:
+            return default
+        raw = str(date_str).strip()
+        if not raw:
+            return default
+        if self.ISO_TIMESTAMP_REGEX.fullmatch(raw):
+            # Already ISO 8601 with a year, as live receive times and most
+            # JSON sources are; same result as dateutil without the tokenizer.
+            try:
+                return datetime.fromisoformat(raw[:-1] + "+00:00" if raw.endswith("Z") else raw).isoformat()
+            except ValueError:
+                pass
         try:
-            raw = str(date_str).strip()
             parsed = date_parser.parse(raw)
             if not self._timestamp_has_explicit_year(raw):
                 now = datetime.now(parsed.tzinfo) if parsed.tzinfo else datetime.now()
@@ -155,7 +330,7 @@ class BaseParser(ABC):
                     parsed = self._roll_back_one_year(parsed)
             return parsed.isoformat()
         except Exception as e:
-            logger.debug(f"to_iso conversion failed for date_str '{date_str}': {e}")
+            self.conversion_failed("iso", field, date_str, e)
             return default
 
     def _timestamp_has_explicit_year(self, value):
@@ -174,15 +349,19 @@ class BaseParser(ABC):
             return dt.replace(year=dt.year - 1, month=2, day=28)
 
     def normalize_timestamp(self, *candidates):
+        # The record timestamp is often copied from one of the raw candidates;
+        # a value that failed once is not handed to dateutil again.
+        failed = []
         for candidate in candidates:
             if candidate is None:
                 continue
             value = str(candidate).strip()
-            if not value:
+            if not value or value in failed:
                 continue
-            iso_val = self.to_iso(value)
+            iso_val = self.to_iso(value, field="timestamp")
             if iso_val:
                 return iso_val
+            failed.append(value)
         for candidate in candidates:
             if candidate is None:
                 continue
@@ -216,6 +395,8 @@ class BaseParser(ABC):
         return None
 
     def parse_json_line(self, text):
+        if not text or not self.JSON_START_REGEX.match(text):
+            return {}
         try:
             payload = json.loads(text)
             if isinstance(payload, dict):
@@ -228,10 +409,19 @@ class BaseParser(ABC):
         if not text:
             return {}
         pairs = {}
-        for match in self.KV_REGEX.finditer(text):
-            key = match.group("key").lower()
-            value = self.clean_value(match.group("value"))
-            pairs[key] = value
+        cache = KV_KEY_CACHE
+        for key, double_quoted, single_quoted, bare in self.KV_REGEX.findall(text):
+            lowered = cache.get(key)
+            if lowered is None:
+                lowered = sys.intern(key.lower())
+                if len(cache) < KV_KEY_CACHE_LIMIT:
+                    cache[key] = lowered
+            if double_quoted:
+                pairs[lowered] = double_quoted.strip("'")
+            elif single_quoted:
+                pairs[lowered] = single_quoted
+            else:
+                pairs[lowered] = bare.strip('"').strip("'")
         return pairs
 
     def lower_keys(self, data):
@@ -239,7 +429,7 @@ class BaseParser(ABC):
         if not isinstance(data, dict):
             return out
         for key, value in data.items():
-            out[str(key).lower()] = self.clean_value(value)
+            out[sys.intern(str(key).lower())] = self.clean_value(value)
         return out
 
     def first_value(self, *values):
@@ -274,7 +464,7 @@ class BaseParser(ABC):
         if value is None:
             return ""
         candidate = str(value).strip().strip('[](),')
-        if not candidate:
+        if not candidate or ("." not in candidate and ":" not in candidate):
             return ""
 
         if self.IPV4_REGEX.fullmatch(candidate):
@@ -296,8 +486,8 @@ class BaseParser(ABC):
             return match.group(0)
         return ""
 
-    def normalize_port(self, value):
-        port = self.to_int(value)
+    def normalize_port(self, value, field="port"):
+        port = self.to_int(value, field=field)
         if port is None:
             return None
         if 0 <= port <= 65535:
@@ -310,99 +500,39 @@ class BaseParser(ABC):
             return self.ACTION_ALIASES[action]
 
         text = f"{action} {message or ''}".lower()
-        if any(word in text for word in ["deny", "drop", "block", "reject", "quarantine"]):
-            return "deny"
-        if any(word in text for word in ["allow", "accept", "permit", "pass"]):
-            return "allow"
-        if any(word in text for word in ["auth success", "login success", "authenticated"]):
-            return "auth_success"
-        if any(word in text for word in ["auth fail", "login fail", "authentication failed", "denied"]):
-            return "auth_fail"
-        if "logout" in text:
-            return "logout"
-        if "login" in text:
-            return "login"
-        return action
-
-    def infer_outcome(self, action, message="", raw_fields=None):
+        return self.ACTION_CLASSIFIER.classify(text, default=action)
+
+    def infer_outcome(self, action, message="", raw_fields=None, status_keys=FIELD_CANDIDATES["status"]):
         text = f"{action or ''} {message or ''}".lower()
         if isinstance(raw_fields, dict):
-            status = self.dict_first(raw_fields, ["status", "result", "outcome", "disposition"])
+            status = self.dict_first(raw_fields, status_keys)
             if status:
                 text += f" {status}".lower()
+        return self.OUTCOME_CLASSIFIER.classify(text)
 
-        if any(word in text for word in ["deny", "drop", "block", "reject", "quarantine"]):
-            return "blocked"
-        if any(word in text for word in ["fail", "failed", "error", "invalid"]):
-            return "failed"
-        if any(word in text for word in ["allow", "accept", "permit", "pass"]):
-            return "allowed"
-        if any(word in text for word in ["success", "ok", "authenticated"]):
-            return "success"
-        if any(word in text for word in ["detect", "alert", "threat"]):
-            return "detected"
-        return "unknown"
-
-    def infer_log_category(self, raw_fields=None, message="", event="", action="", default="unknown"):
+    def infer_log_category(
+        self, raw_fields=None, message="", event="", action="", default="unknown",
+        type_keys=FIELD_CANDIDATES["category_type"], app_keys=FIELD_CANDIDATES["category_app"],
+    ):
         values = []
         if isinstance(raw_fields, dict):
             values.extend([
-                self.dict_first(raw_fields, ["type", "subtype", "log_type", "event_type", "category", "module", "service"]),
-                self.dict_first(raw_fields, ["appcat", "app", "signature", "threat", "attack", "proto"]),
+                self.dict_first(raw_fields, type_keys),
+                self.dict_first(raw_fields, app_keys),
             ])
         values.extend([event, action, message])
         text = " ".join(str(v or "") for v in values).lower()
-
-        if any(word in text for word in ["threat", "intrusion", "ips", "ids", "attack", "exploit", "signature"]):
-            return "threat"
-        if any(word in text for word in ["malware", "virus", "spyware", "ransomware", "botnet", "c2"]):
-            return "malware"
-        if any(word in text for word in ["auth", "login", "logout", "mfa", "radius", "saml", "ldap", "user-id", "user id"]):
-            return "authentication"
-        if any(word in text for word in ["vpn", "ipsec", "ike", "sslvpn", "globalprotect", "tunnel"]):
-            return "vpn"
-        if any(word in text for word in ["system", "daemon", "kernel", "service", "resource", "health", "temperature", "fan", "cpu", "memory"]):
-            return "system"
-        if any(word in text for word in ["config", "policy install", "commit", "admin", "cli", "change", "audit"]):
-            return "configuration"
-        if any(word in text for word in ["dns", "domain", "resolver", "query", "response"]):
-            return "dns"
-        if any(word in text for word in ["url", "web", "http", "https", "proxy", "category"]):
-            return "web"
-        if any(word in text for word in ["nat", "session", "flow", "traffic", "forward", "packet", "connection", "firewall"]):
-            return "traffic"
-        if any(word in text for word in ["ha", "cluster", "failover", "sync"]):
-            return "ha"
-        if any(word in text for word in ["route", "bgp", "ospf", "rip", "static route"]):
-            return "routing"
-        if any(word in text for word in ["wireless", "wifi", "ssid", "ap "]):
-            return "wireless"
-        return default
+        return self.CATEGORY_CLASSIFIER.classify(text, default=default)
 
     def infer_network_type(self, message="", raw_fields=None):
         text = str(message or "").lower()
         if isinstance(raw_fields, dict):
             text += " " + " ".join(str(v or "").lower() for v in raw_fields.values())
-        if any(k in text for k in ["sslvpn", "nsvpn", "globalprotect", "vpn", "citrix gateway"]):
-            return "sslvpn"
-        if any(k in text for k in ["ike", "ipsec"]):
-            return "ike"
-        if "appfw" in text or "app firewall" in text:
-            return "appfw"
-        if "wan" in text or "internet" in text:
-            return "wan"
-        if "lan" in text or "intranet" in text:
-            return "lan"
-        if "dmz" in text:
-            return "dmz"
-        return "unknown"
-
-    def infer_event(self, raw_fields=None, message="", fallback="unknown"):
+        return self.NETWORK_TYPE_CLASSIFIER.classify(text)
+
+    def infer_event(self, raw_fields=None, message="", fallback="unknown", keys=FIELD_CANDIDATES["event"]):
         if isinstance(raw_fields, dict):
-            for key in [
-                "event", "event_type", "subtype", "log_subtype", "attack", "signature",
-                "threat", "msgid", "messageid", "id", "operation", "action"
-            ]:
+            for key in keys:
                 value = self.dict_first(raw_fields, [key])
                 if value:
                     return str(value)
@@ -412,30 +542,45 @@ class BaseParser(ABC):
         words = text.split()
         return " ".join(words[:6])
 
-    def enrich_record(self, record, vendor="", default_category="unknown"):
+    def enrich_record(self, record, vendor="", default_category="unknown", context=None):
         rec = dict(record or {})
-        raw_fields = self.lower_keys(rec.get("raw_fields") or {})
+        if context is not None:
+            for key, value in context.fields.items():
+                rec.setdefault(key, value)
+        source_fields = rec.get("raw_fields") or {}
+        if not isinstance(source_fields, dict):
+            source_fields = {}
+        plan = extraction_plan(self.VENDOR, source_fields)
+        names = plan.key_names
+        # Same cleaning as clean_value(), inlined for the per-field loop.
+        raw_fields = {
+            names[key]: value.strip().strip('"').strip("'") if isinstance(value, str) else value
+            for key, value in source_fields.items()
+        }
+        fields = plan.fields
 
         payload_message = self.first_value(
             rec.get("message"),
-            self.dict_first(raw_fields, ["msg", "message", "description", "reason", "details"]),
+            self.dict_first(raw_fields, fields["message"]),
             ""
         )
 
-        date_part = self.dict_first(raw_fields, ["date", "logdate", "eventdate", "devdate"])
-        time_part = self.dict_first(raw_fields, ["time", "eventtime", "devtime"])
+        date_part = self.dict_first(raw_fields, fields["date"])
+        time_part = self.dict_first(raw_fields, fields["time"])
         dt_compound = f"{date_part} {time_part}".strip() if date_part or time_part else ""
 
         timestamp = self.normalize_timestamp(
             rec.get("timestamp"),
             dt_compound,
-            self.dict_first(raw_fields, ["timestamp", "event_time", "generated_time", "receive_time", "time_generated", "starttime"]),
-            self.dict_first(raw_fields, ["rt"]),
+            self.dict_first(raw_fields, fields["timestamp"]),
+            self.dict_first(raw_fields, fields["rt"]),
         )
+        if not timestamp and context is not None:
+            timestamp = self.normalize_timestamp(context.received_at)
 
         severity_candidate = self.first_value(
             rec.get("severity"),
-            self.dict_first(raw_fields, ["severity", "level", "risk", "threatlevel", "priority", "pri"]),
+            self.dict_first(raw_fields, fields["severity"]),
             rec.get("syslog_priority"),
         )
         severity = self.normalize_severity(
@@ -446,18 +591,18 @@ class BaseParser(ABC):
         host = self.first_value(
             rec.get("host"),
             rec.get("syslog_host"),
-            self.dict_first(raw_fields, ["host", "hostname", "device", "device_name", "devname"]),
+            self.dict_first(raw_fields, fields["host"]),
         )
 
         src_ip = self.normalize_ip(self.first_value(
             rec.get("src_ip"),
             rec.get("srcip"),
-            self.dict_first(raw_fields, ["src", "srcip", "src_ip", "source", "source_ip", "sip", "clientip", "client_ip"]),
+            self.dict_first(raw_fields, fields["src_ip"]),
         ))
         dst_ip = self.normalize_ip(self.first_value(
             rec.get("dst_ip"),
             rec.get("dstip"),
-            self.dict_first(raw_fields, ["dst", "dstip", "dst_ip", "destination", "destination_ip", "dip", "serverip", "server_ip"]),
+            self.dict_first(raw_fields, fields["dst_ip"]),
         ))
 
         if not src_ip:
@@ -472,24 +617,24 @@ class BaseParser(ABC):
         src_port = self.normalize_port(self.first_value(
             rec.get("src_port"),
             rec.get("srcport"),
-            self.dict_first(raw_fields, ["srcport", "sport", "spt", "source_port"]),
-        ))
+            self.dict_first(raw_fields, fields["src_port"]),
+        ), field="src_port")
         dst_port = self.normalize_port(self.first_value(
             rec.get("dst_port"),
             rec.get("dstport"),
-            self.dict_first(raw_fields, ["dstport", "dport", "dpt", "destination_port"]),
-        ))
+            self.dict_first(raw_fields, fields["dst_port"]),
+        ), field="dst_port")
 
         protocol = str(self.first_value(
             rec.get("protocol"),
-            self.dict_first(raw_fields, ["proto", "protocol", "service", "transport"]),
+            self.dict_first(raw_fields, fields["protocol"]),
         )).upper()
 
         action = self.normalize_action(
             self.first_value(
                 rec.get("action"),
                 rec.get("palo_action"),
-                self.dict_first(raw_fields, ["action", "act", "result", "status", "disposition", "verdict", "operation"]),
+                self.dict_first(raw_fields, fields["action"]),
             ),
             payload_message,
         )
@@ -497,7 +642,7 @@ class BaseParser(ABC):
         event = self.first_value(
             rec.get("event"),
             rec.get("event_type"),
-            self.infer_event(raw_fields=raw_fields, message=payload_message),
+            self.infer_event(raw_fields=raw_fields, message=payload_message, keys=fields["event"]),
         )
 
         log_category = self.first_value(
@@ -509,40 +654,44 @@ class BaseParser(ABC):
                 event=event,
                 action=action,
                 default=default_category,
+                type_keys=fields["category_type"],
+                app_keys=fields["category_app"],
             ),
             default_category,
         )
 
         outcome = self.first_value(
             rec.get("outcome"),
-            self.infer_outcome(action=action, message=payload_message, raw_fields=raw_fields),
+            self.infer_outcome(
+                action=action, message=payload_message, raw_fields=raw_fields, status_keys=fields["status"],
+            ),
         )
 
         user = self.first_value(
             rec.get("user"),
-            self.dict_first(raw_fields, ["user", "username", "srcuser", "dstuser", "admin", "account", "userid", "user_id"]),
+            self.dict_first(raw_fields, fields["user"]),
         )
 
         rule = self.first_value(
             rec.get("rule"),
             rec.get("policy"),
-            self.dict_first(raw_fields, ["rule", "rulename", "policy", "policyid", "policyname", "acl", "access_rule"]),
+            self.dict_first(raw_fields, fields["rule"]),
         )
 
         signature = self.first_value(
             rec.get("signature"),
-            self.dict_first(raw_fields, ["signature", "attack", "threat", "sig", "sig_name", "ips_signature"]),
+            self.dict_first(raw_fields, fields["signature"]),
         )
 
         event_id = self.first_value(
             rec.get("event_id"),
-            self.dict_first(raw_fields, ["eventid", "event_id", "id", "logid", "msgid", "messageid", "sid"]),
+            self.dict_first(raw_fields, fields["event_id"]),
         )
 
         session_id = self.first_value(
             rec.get("session_id"),
             rec.get("sessionid"),
-            self.dict_first(raw_fields, ["sessionid", "session_id", "connection_id", "connid", "flowid", "sid"]),
+            self.dict_first(raw_fields, fields["session_id"]),
         )
 
         network_type = self.first_value(
@@ -578,9 +727,10 @@ class BaseParser(ABC):
                 dstport=dst_port,
                 network_type=network_type,
                 raw_fields=raw_fields,
+                provenance=PARSER_PROVENANCE,
             )
         )
-        return rec
+        return NormalizedRecord.from_dict(rec)
 
     def get_base_elasticsearch_mapping(self):
         return {
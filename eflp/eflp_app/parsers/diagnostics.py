@@ -0,0 +1,104 @@
+import os
+import threading
+
+
+SAMPLE_EVERY = max(1, int(os.environ.get("EFLP_PARSER_DIAG_SAMPLE_EVERY", "100") or 100))
+SAMPLES_PER_FIELD = 5
+TRACE_LIMIT = 10000
+
+LOCAL = threading.local()
+LOCK = threading.Lock()
+OPEN = []
+RETIRED = {}
+
+
+class Diagnostics:
+    # Conversion failures counted per (vendor, kind, field). Only the raw value
+    # of every SAMPLE_EVERY-th failure of a field is kept, and nothing is
+    # formatted until summary() or trace_lines() is called. With trace=True
+    # every failure (up to TRACE_LIMIT) is kept with its error for a debug trace.
+    def __init__(self, trace=False):
+        self.counts = {}
+        self.samples = {}
+        self.trace = [] if trace else None
+        with LOCK:
+            OPEN.append(self)
+
+    def failure(self, vendor, kind, field, value, error):
+        key = (vendor, kind, field)
+        count = self.counts.get(key, 0) + 1
+        self.counts[key] = count
+        if (count - 1) % SAMPLE_EVERY == 0:
+            samples = self.samples.setdefault(key, [])
+            if len(samples) < SAMPLES_PER_FIELD:
+                samples.append(value)
+        if self.trace is not None and len(self.trace) < TRACE_LIMIT:
+            self.trace.append((key, value, type(error).__name__, error.args))
+
+    def close(self):
+        with LOCK:
+            if self in OPEN:
+                OPEN.remove(self)
+                merge_counts(RETIRED, dict(self.counts))
+
+    def summary(self):
+        counts = dict(self.counts)
+        fields = [
+            {
+                "vendor": vendor,
+                "kind": kind,
+                "field": field or "unknown",
+                "failures": count,
+                "samples": [repr(value)[:120] for value in self.samples.get((vendor, kind, field), [])],
+            }
+            for (vendor, kind, field), count in sorted(counts.items(), key=lambda item: -item[1])
+        ]
+        return {"conversion_failures": sum(counts.values()), "sample_every": SAMPLE_EVERY, "fields": fields}
+
+    def trace_lines(self):
+        for (vendor, kind, field), value, error_type, args in self.trace or []:
+            detail = "; ".join(str(arg) for arg in args)
+            yield f"{vendor or 'unknown'} {field or 'unknown'} to_{kind} failed for {value!r}: {error_type}: {detail}\n"
+
+
+class Activation:
+    __slots__ = ("diagnostics", "previous")
+
+    def __init__(self, diagnostics):
+        self.diagnostics = diagnostics
+
+    def __enter__(self):
+        self.previous = getattr(LOCAL, "active", None)
+        LOCAL.active = self.diagnostics
+        return self.diagnostics
+
+    def __exit__(self, *exc):
+        LOCAL.active = self.previous
+        return False
+
+
+def activate(diagnostics):
+    # `with activate(job):` sends the calling thread's failures to `job`;
+    # otherwise they go to a long-lived collector owned by the thread.
+    return Activation(diagnostics)
+
+
+def current():
+    active = getattr(LOCAL, "active", None)
+    if active is None:
+        active = LOCAL.active = Diagnostics()
+    return active
+
+
+def merge_counts(target, source):
+    for key, count in source.items():
+        target[key] = target.get(key, 0) + count
+
+
+def totals():
+    with LOCK:
+        merged = dict(RETIRED)
+        collectors = list(OPEN)
+    for collector in collectors:
+        merge_counts(merged, dict(collector.counts))
+    return merged
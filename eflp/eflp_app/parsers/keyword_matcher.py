@@ -0,0 +1,73 @@
+import re
+
+
+UNSET = object()
+
+
+def trie_pattern(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+    return _node_pattern(trie)
+
+
+def _node_pattern(node):
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # Optional and greedy, so the longest keyword at a position wins.
+        return "(?:" + body + ")?"
+    return body
+
+
+class KeywordClassifier:
+    # rules is an ordered list of (label, keywords); the first rule with any
+    # keyword in the text wins, exactly like the any(...) cascades it replaces.
+    # All keywords share one compiled trie. Each search returns the longest
+    # keyword at the leftmost remaining offset, and that match implies every
+    # keyword that is a prefix of it, so its rank is the best rule among
+    # those. Resuming one character after the match start keeps overlapping
+    # keywords, so the result equals testing `keyword in text` rule by rule.
+    def __init__(self, rules, default="unknown"):
+        self.default = default
+        self.rules = [(label, tuple(words)) for label, words in rules]
+        self.labels = [label for label, _ in rules]
+        priority = {}
+        for position, (_, words) in enumerate(self.rules):
+            for word in words:
+                if word:
+                    priority.setdefault(word, position)
+        self.pattern = re.compile(trie_pattern(priority)) if priority else None
+        self.rank = {
+            word: min(rank for other, rank in priority.items() if word.startswith(other))
+            for word in priority
+        }
+
+    def classify(self, text, default=UNSET):
+        pattern = self.pattern
+        best = None
+        position = 0
+        while pattern is not None:
+            match = pattern.search(text, position)
+            if match is None:
+                break
+            rank = self.rank[match.group()]
+            if best is None or rank < best:
+                best = rank
+                if best == 0:
+                    break
+            position = match.start() + 1
+        if best is None:
+            return self.default if default is UNSET else default
+        return self.labels[best]
+
+    def classify_cascade(self, text, default=UNSET):
+        for label, words in self.rules:
+            if any(word in text for word in words):
+                return label
+        return self.default if default is UNSET else default
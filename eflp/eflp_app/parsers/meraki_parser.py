@@ -3,6 +3,7 @@ from parsers.base_parser import BaseParser
 
 
 class MerakiParser(BaseParser):
+    VENDOR = "meraki"
     EVENT_CATEGORY_HINTS = {
         "ids": "threat",
         "ips": "threat",
@@ -20,69 +21,63 @@ class MerakiParser(BaseParser):
         "wireless": "wireless",
     }
 
-    def parse(self, file_path):
-        records = []
-        with open(file_path, "r", errors="ignore") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-
-                meta = self.parse_syslog_prefix(line)
-                payload = meta.get("payload", "") if meta else line
-
-                raw_fields = self.parse_json_line(payload)
-                timestamp = ""
-                event_type = ""
-                device_id = ""
-                leftover = []
-
-                if raw_fields:
-                    timestamp = self.first_value(raw_fields.get("timestamp"), raw_fields.get("occurredat"), raw_fields.get("time"))
-                    event_type = self.first_value(raw_fields.get("eventtype"), raw_fields.get("event"), raw_fields.get("type"))
-                    device_id = self.first_value(raw_fields.get("deviceid"), raw_fields.get("networkid"), raw_fields.get("device"))
-                else:
-                    tokens = payload.split()
-                    raw_fields, leftover, timestamp, device_id, event_type = self._parse_tokens(tokens)
-
-                severity = self.normalize_severity(raw_fields.get("severity"), fallback="INFO")
-                severity = self.normalize_severity(self.first_value(raw_fields.get("priority"), severity), fallback=severity)
-
-                action = self.normalize_action(self.first_value(raw_fields.get("action"), raw_fields.get("decision"), raw_fields.get("result")), payload)
-                if severity == "INFO" and action in {"deny", "reset", "quarantine"}:
-                    severity = "HIGH"
-
-                message = self.first_value(raw_fields.get("message"), raw_fields.get("msg"), " ".join(leftover), payload)
-                srcip, srcport = self._parse_ip_port(self.first_value(raw_fields.get("src"), raw_fields.get("srcip"), raw_fields.get("clientip")))
-                dstip, dstport = self._parse_ip_port(self.first_value(raw_fields.get("dst"), raw_fields.get("dstip"), raw_fields.get("serverip")))
-
-                category = self._infer_category(event_type, payload)
-
-                record = {
-                    "timestamp": self.first_value(timestamp, raw_fields.get("timestamp"), meta.get("timestamp") if meta else ""),
-                    "severity": severity,
-                    "host": self.first_value(meta.get("host") if meta else "", device_id, raw_fields.get("host")),
-                    "message": message,
-                    "event": self.first_value(event_type, raw_fields.get("event"), raw_fields.get("eventtype")),
-                    "action": action,
-                    "log_category": category,
-                    "src_ip": srcip,
-                    "dst_ip": dstip,
-                    "src_port": self.first_value(raw_fields.get("sport"), raw_fields.get("srcport"), srcport),
-                    "dst_port": self.first_value(raw_fields.get("dport"), raw_fields.get("dstport"), dstport),
-                    "protocol": self.first_value(raw_fields.get("proto"), raw_fields.get("protocol")),
-                    "user": self.first_value(raw_fields.get("user"), raw_fields.get("username"), raw_fields.get("clientmac")),
-                    "rule": self.first_value(raw_fields.get("rule"), raw_fields.get("policy"), raw_fields.get("ssid")),
-                    "event_id": self.first_value(raw_fields.get("eventid"), raw_fields.get("id")),
-                    "session_id": self.first_value(raw_fields.get("sessionid"), raw_fields.get("flowid")),
-                    "raw_fields": raw_fields,
-                    "syslog_priority": meta.get("priority") if meta else None,
-                }
-
-                record = self.enrich_record(record, vendor="meraki", default_category=category)
-                records.append(record)
-
-        return records
+    def parse_line(self, line, context=None):
+        line = line.strip()
+        if not line:
+            return None
+
+        meta = self.parse_syslog_prefix(line)
+        payload = meta.get("payload", "") if meta else line
+
+        raw_fields = self.parse_json_line(payload)
+        timestamp = ""
+        event_type = ""
+        device_id = ""
+        leftover = []
+
+        if raw_fields:
+            timestamp = self.first_value(raw_fields.get("timestamp"), raw_fields.get("occurredat"), raw_fields.get("time"))
+            event_type = self.first_value(raw_fields.get("eventtype"), raw_fields.get("event"), raw_fields.get("type"))
+            device_id = self.first_value(raw_fields.get("deviceid"), raw_fields.get("networkid"), raw_fields.get("device"))
+        else:
+            tokens = payload.split()
+            raw_fields, leftover, timestamp, device_id, event_type = self._parse_tokens(tokens)
+
+        severity = self.normalize_severity(raw_fields.get("severity"), fallback="INFO")
+        severity = self.normalize_severity(self.first_value(raw_fields.get("priority"), severity), fallback=severity)
+
+        action = self.normalize_action(self.first_value(raw_fields.get("action"), raw_fields.get("decision"), raw_fields.get("result")), payload)
+        if severity == "INFO" and action in {"deny", "reset", "quarantine"}:
+            severity = "HIGH"
+
+        message = self.first_value(raw_fields.get("message"), raw_fields.get("msg"), " ".join(leftover), payload)
+        srcip, srcport = self._parse_ip_port(self.first_value(raw_fields.get("src"), raw_fields.get("srcip"), raw_fields.get("clientip")))
+        dstip, dstport = self._parse_ip_port(self.first_value(raw_fields.get("dst"), raw_fields.get("dstip"), raw_fields.get("serverip")))
+
+        category = self._infer_category(event_type, payload)
+
+        record = {
+            "timestamp": self.first_value(timestamp, raw_fields.get("timestamp"), meta.get("timestamp") if meta else ""),
+            "severity": severity,
+            "host": self.first_value(meta.get("host") if meta else "", device_id, raw_fields.get("host")),
+            "message": message,
+            "event": self.first_value(event_type, raw_fields.get("event"), raw_fields.get("eventtype")),
+            "action": action,
+            "log_category": category,
+            "src_ip": srcip,
+            "dst_ip": dstip,
+            "src_port": self.first_value(raw_fields.get("sport"), raw_fields.get("srcport"), srcport),
+            "dst_port": self.first_value(raw_fields.get("dport"), raw_fields.get("dstport"), dstport),
+            "protocol": self.first_value(raw_fields.get("proto"), raw_fields.get("protocol")),
+            "user": self.first_value(raw_fields.get("user"), raw_fields.get("username"), raw_fields.get("clientmac")),
+            "rule": self.first_value(raw_fields.get("rule"), raw_fields.get("policy"), raw_fields.get("ssid")),
+            "event_id": self.first_value(raw_fields.get("eventid"), raw_fields.get("id")),
+            "session_id": self.first_value(raw_fields.get("sessionid"), raw_fields.get("flowid")),
+            "raw_fields": raw_fields,
+            "syslog_priority": meta.get("priority") if meta else None,
+        }
+
+        return self.enrich_record(record, vendor="meraki", default_category=category, context=context)
 
     def _parse_tokens(self, tokens):
         event_type = ""
@@ -146,7 +141,7 @@ class MerakiParser(BaseParser):
         text = str(value)
         if ":" in text and text.count(":") == 1:
             ip, port = text.split(":", 1)
-            return self.normalize_ip(ip), self.normalize_port(port)
+            return self.normalize_ip(ip), self.normalize_port(port, field="port")
         return self.normalize_ip(text), None
 
     def _infer_category(self, event_type, message):
@@ -1,9 +1,11 @@
 import csv
 import re
+from itertools import islice
 from parsers.base_parser import BaseParser
 
 
 class PaloAltoParser(BaseParser):
+    VENDOR = "palo_alto"
     TYPE_TO_CATEGORY = {
         "TRAFFIC": "traffic",
         "THREAT": "threat",
@@ -25,63 +27,63 @@ class PaloAltoParser(BaseParser):
         "reset-client", "reset-server", "block", "alert", "override",
     }
 
-    def parse(self, file_path):
-        records = []
-        with open(file_path, "r", errors="ignore") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-
-                meta = self.parse_syslog_prefix(line)
-                payload = meta.get("payload", "") if meta else line
-
-                raw_fields = self.parse_kv_pairs(payload)
-                csv_fields = self._parse_csv_fields(payload)
-
-                log_type, subtype = self._extract_type_subtype(csv_fields, raw_fields)
-                action = self._extract_action(csv_fields, raw_fields, payload)
-                src_ip, dst_ip, src_port, dst_port = self._extract_network_tuple(csv_fields, raw_fields)
-
-                message = self.first_value(
-                    raw_fields.get("msg"),
-                    raw_fields.get("message"),
-                    payload,
-                )
-                severity = self.normalize_severity(raw_fields.get("severity"), fallback="INFO")
-                if severity == "INFO" and (action in {"deny", "reset", "quarantine"} or log_type in {"THREAT", "WILDFIRE", "CORRELATION"}):
-                    severity = "HIGH"
-
-                if log_type:
-                    raw_fields.setdefault("type", log_type)
-                if subtype:
-                    raw_fields.setdefault("subtype", subtype)
-
-                record = {
-                    "timestamp": self.first_value(
-                        raw_fields.get("generated_time"),
-                        raw_fields.get("receive_time"),
-                        csv_fields[6] if len(csv_fields) > 6 else "",
-                        csv_fields[0] if csv_fields else "",
-                        meta.get("timestamp") if meta else "",
-                    ),
-                    "severity": severity,
-                    "host": self.first_value(meta.get("host") if meta else "", raw_fields.get("serial"), raw_fields.get("device_name")),
-                    "message": message,
-                    "action": action,
-                    "event": self.first_value(raw_fields.get("eventid"), raw_fields.get("event"), subtype, log_type),
-                    "log_category": self.TYPE_TO_CATEGORY.get(log_type, "unknown"),
-                    "src_ip": src_ip,
-                    "dst_ip": dst_ip,
-                    "src_port": src_port,
-                    "dst_port": dst_port,
-                    "syslog_priority": meta.get("priority") if meta else None,
-                    "raw_fields": raw_fields,
-                }
-
-                record = self.enrich_record(record, vendor="palo_alto", default_category=self.TYPE_TO_CATEGORY.get(log_type, "unknown"))
-                records.append(record)
-        return records
+    def parse_line(self, line, context=None):
+        line = line.strip()
+        if not line:
+            return None
+
+        meta = self.parse_syslog_prefix(line)
+        payload = meta.get("payload", "") if meta else line
+
+        raw_fields = self.parse_kv_pairs(payload)
+        csv_fields = self._parse_csv_fields(payload)
+
+        log_type, subtype = self._extract_type_subtype(csv_fields, raw_fields)
+        action = self._extract_action(csv_fields, raw_fields, payload)
+        src_ip, dst_ip, src_port, dst_port = self._extract_network_tuple(csv_fields, raw_fields)
+
+        message = self.first_value(
+            raw_fields.get("msg"),
+            raw_fields.get("message"),
+            payload,
+        )
+        severity = self.normalize_severity(raw_fields.get("severity"), fallback="INFO")
+        if severity == "INFO" and (action in {"deny", "reset", "quarantine"} or log_type in {"THREAT", "WILDFIRE", "CORRELATION"}):
+            severity = "HIGH"
+
+        if log_type:
+            raw_fields.setdefault("type", log_type)
+        if subtype:
+            raw_fields.setdefault("subtype", subtype)
+        if log_type == "TRAFFIC" and len(csv_fields) > 33:
+            # Rule name and byte counters of the PAN-OS TRAFFIC CSV layout.
+            for key, index in (("rule", 11), ("bytes", 31), ("bytes_sent", 32), ("bytes_received", 33)):
+                if csv_fields[index]:
+                    raw_fields.setdefault(key, csv_fields[index])
+
+        record = {
+            "timestamp": self.first_value(
+                raw_fields.get("generated_time"),
+                raw_fields.get("receive_time"),
+                csv_fields[6] if len(csv_fields) > 6 else "",
+                csv_fields[0] if csv_fields else "",
+                meta.get("timestamp") if meta else "",
+            ),
+            "severity": severity,
+            "host": self.first_value(meta.get("host") if meta else "", raw_fields.get("serial"), raw_fields.get("device_name")),
+            "message": message,
+            "action": action,
+            "event": self.first_value(raw_fields.get("eventid"), raw_fields.get("event"), subtype, log_type),
+            "log_category": self.TYPE_TO_CATEGORY.get(log_type, "unknown"),
+            "src_ip": src_ip,
+            "dst_ip": dst_ip,
+            "src_port": src_port,
+            "dst_port": dst_port,
+            "syslog_priority": meta.get("priority") if meta else None,
+            "raw_fields": raw_fields,
+        }
+
+        return self.enrich_record(record, vendor="palo_alto", default_category=self.TYPE_TO_CATEGORY.get(log_type, "unknown"), context=context)
 
     def _parse_csv_fields(self, payload):
         if "," not in payload:
@@ -124,20 +126,20 @@ class PaloAltoParser(BaseParser):
     def _extract_network_tuple(self, fields, raw_fields):
         src_ip = self.normalize_ip(raw_fields.get("src"))
         dst_ip = self.normalize_ip(raw_fields.get("dst"))
-        src_port = self.normalize_port(raw_fields.get("sport"))
-        dst_port = self.normalize_port(raw_fields.get("dport"))
+        src_port = self.normalize_port(raw_fields.get("sport"), field="sport")
+        dst_port = self.normalize_port(raw_fields.get("dport"), field="dport")
 
+        # Only the first two matches of each are used.
         if not src_ip or not dst_ip:
-            ips = [self.normalize_ip(value) for value in fields]
-            ips = [ip for ip in ips if ip]
+            ips = list(islice(filter(None, map(self.normalize_ip, fields)), 2))
             if not src_ip and ips:
                 src_ip = ips[0]
             if not dst_ip and len(ips) > 1:
                 dst_ip = ips[1]
 
         if src_port is None or dst_port is None:
-            ports = [self.normalize_port(value) for value in fields]
-            ports = [p for p in ports if p is not None]
+            ports = (self.normalize_port(value, field=None) for value in fields)
+            ports = list(islice((p for p in ports if p is not None), 2))
             if src_port is None and ports:
                 src_port = ports[0]
             if dst_port is None and len(ports) > 1:
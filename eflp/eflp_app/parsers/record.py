@@ -0,0 +1,388 @@
+import sys
+from collections.abc import MutableMapping, Sequence
+from operator import attrgetter
+
+
+CANONICAL_FIELDS = (
+    "vendor", "timestamp", "severity", "severity_int", "host", "message", "event",
+    "log_category", "action", "outcome", "user", "rule", "signature", "event_id",
+    "session_id", "protocol", "src_ip", "dst_ip", "src_port", "dst_port",
+    "network_type", "raw_fields",
+)
+FIELD_SET = frozenset(CANONICAL_FIELDS)
+ALIASES = {"srcip": "src_ip", "dstip": "dst_ip", "srcport": "src_port", "dstport": "dst_port"}
+ALIAS_OF = {target: alias for alias, target in ALIASES.items()}
+INTERNED_FIELDS = frozenset((
+    "vendor", "severity", "log_category", "action", "outcome", "protocol",
+    "network_type", "ingestion_mode", "provenance",
+))
+# `provenance` of records that went through BaseParser.enrich_record.
+PARSER_PROVENANCE = "parser"
+DELETED = object()
+CANONICAL_GETTER = attrgetter(*CANONICAL_FIELDS)
+
+
+def intern_value(key, value):
+    if key in INTERNED_FIELDS and type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+class NormalizedRecord(MutableMapping):
+    # Canonical fields live in slots, low-cardinality strings are interned and
+    # the srcip/dstip/srcport/dstport aliases are read through from their
+    # canonical fields unless a caller stores a different value for them.
+    __slots__ = CANONICAL_FIELDS + ("extra",)
+
+    def __init__(self, data=None, **fields):
+        self.extra = None
+        if data:
+            self.update_from(data)
+        if fields:
+            self.update_from(fields)
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls.__new__(cls)
+        record.extra = None
+        record.update_from(data)
+        return record
+
+    def update_from(self, data):
+        aliases = None
+        extra = self.extra
+        for key, value in data.items():
+            if type(value) is str and key in INTERNED_FIELDS:
+                value = sys.intern(value)
+            if key in FIELD_SET:
+                if key == "raw_fields" and type(value) is dict:
+                    value = {sys.intern(name) if type(name) is str else name: item for name, item in value.items()}
+                setattr(self, key, value)
+            elif key in ALIASES:
+                if aliases is None:
+                    aliases = []
+                aliases.append((key, value))
+            else:
+                if extra is None:
+                    extra = self.extra = {}
+                extra[key] = value
+        if aliases:
+            for key, value in aliases:
+                self[key] = value
+
+    def __getitem__(self, key):
+        if key in FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        extra = self.extra
+        if extra is not None and key in extra:
+            value = extra[key]
+            if value is DELETED:
+                raise KeyError(key)
+            return value
+        target = ALIASES.get(key)
+        if target is not None:
+            try:
+                return getattr(self, target)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __setitem__(self, key, value):
+        value = intern_value(key, value)
+        if key in FIELD_SET:
+            setattr(self, key, value)
+            return
+        target = ALIASES.get(key)
+        if target is not None and getattr(self, target, DELETED) == value and type(getattr(self, target)) is type(value):
+            if self.extra is not None:
+                self.extra.pop(key, None)
+            return
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key in FIELD_SET:
+            delattr(self, key)
+            return
+        if key in ALIASES:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = DELETED
+            return
+        del self.extra[key]
+
+    def __iter__(self):
+        for key in CANONICAL_FIELDS:
+            if hasattr(self, key):
+                yield key
+        extra = self.extra or {}
+        for alias, target in ALIASES.items():
+            value = extra.get(alias)
+            if value is DELETED:
+                continue
+            if value is not None or alias in extra or hasattr(self, target):
+                yield alias
+        for key, value in extra.items():
+            if key not in ALIASES and value is not DELETED:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"NormalizedRecord({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return (self.__class__.from_dict, (self.to_dict(),))
+
+    def to_dict(self):
+        try:
+            data = dict(zip(CANONICAL_FIELDS, CANONICAL_GETTER(self)))
+        except AttributeError:
+            return {key: self[key] for key in self}
+        extra = self.extra
+        if extra is None:
+            for alias, target in ALIASES.items():
+                data[alias] = data[target]
+            return data
+        for alias, target in ALIASES.items():
+            value = extra.get(alias, data[target])
+            if value is not DELETED:
+                data[alias] = value
+        for key, value in extra.items():
+            if key not in ALIASES and value is not DELETED:
+                data[key] = value
+        return data
+
+    def copy(self):
+        return self.__class__.from_dict(self)
+
+
+def compact_record(record):
+    if isinstance(record, NormalizedRecord):
+        return record
+    return NormalizedRecord.from_dict(record or {})
+
+
+def record_dicts(records):
+    return [record.to_dict() if isinstance(record, NormalizedRecord) else record for record in records]
+
+
+COLUMN_FIELDS = tuple(field for field in CANONICAL_FIELDS if field != "raw_fields")
+
+
+def is_missing(value):
+    return value is None or value == "" or (type(value) is float and value != value)
+
+
+def intern_keys(raw_fields):
+    if type(raw_fields) is not dict:
+        return raw_fields
+    return {sys.intern(name) if type(name) is str else name: value for name, value in raw_fields.items()}
+
+
+class RecordBatch(Sequence):
+    # Column lists per canonical field plus a raw_fields side table. Parsers
+    # append into a batch, the caches and partition writer keep it as is, and
+    # to_frame() hands the column lists straight to pandas instead of building
+    # one dict per row. Indexing a row returns a NormalizedRecord copy.
+    # Extra columns are padded with None for rows that lack the key, so
+    # `nones` keeps the rows that set an extra key to None explicitly.
+    def __init__(self):
+        self.columns = {field: [] for field in COLUMN_FIELDS}
+        self.raw_fields = []
+        self.extra = {}
+        self.nones = {}
+        self.length = 0
+
+    @classmethod
+    def from_records(cls, records):
+        if isinstance(records, RecordBatch):
+            return records
+        batch = cls()
+        batch.extend(records)
+        return batch
+
+    @classmethod
+    def from_frame(cls, df):
+        batch = cls()
+        batch.length = len(df)
+        aliases = {}
+        for name in df.columns:
+            values = df[name].tolist()
+            if name in batch.columns:
+                if name in INTERNED_FIELDS:
+                    values = [sys.intern(value) if type(value) is str else value for value in values]
+                batch.columns[name] = values
+            elif name == "raw_fields":
+                batch.raw_fields = [intern_keys(value) for value in values]
+            elif name in ALIASES:
+                aliases[ALIASES[name]] = values
+            else:
+                batch.extra[name] = values
+        # A frame may carry only the alias (e.g. a CSV with srcip/dstport
+        # headers); its values fill the canonical column where that is empty.
+        for target, values in aliases.items():
+            column = batch.columns[target]
+            if not column:
+                batch.columns[target] = values
+            else:
+                batch.columns[target] = [
+                    alias if is_missing(value) and not is_missing(alias) else value
+                    for value, alias in zip(column, values)
+                ]
+        for name, column in batch.columns.items():
+            if not column:
+                batch.columns[name] = [None] * batch.length
+        if not batch.raw_fields:
+            batch.raw_fields = [None] * batch.length
+        return batch
+
+    def append(self, record):
+        row = self.length
+        get = record.get
+        for field, column in self.columns.items():
+            value = get(field)
+            if is_missing(value) and field in ALIAS_OF:
+                alias = get(ALIAS_OF[field])
+                if not is_missing(alias):
+                    value = alias
+            if type(value) is str and field in INTERNED_FIELDS:
+                value = sys.intern(value)
+            column.append(value)
+        self.raw_fields.append(intern_keys(get("raw_fields")))
+        if isinstance(record, NormalizedRecord):
+            items = (record.extra or {}).items()
+        else:
+            items = record.items()
+        for key, value in items:
+            if key in FIELD_SET or key in ALIASES or value is DELETED:
+                continue
+            column = self.extra.get(key)
+            if column is None:
+                column = self.extra[key] = []
+            if len(column) < row:
+                column.extend([None] * (row - len(column)))
+            if value is None:
+                self.nones.setdefault(key, set()).add(row)
+            column.append(intern_value(key, value))
+        self.length = row + 1
+
+    def extend(self, records):
+        if not isinstance(records, RecordBatch):
+            for record in records:
+                self.append(record)
+            return
+        row = self.length
+        for field, column in self.columns.items():
+            column.extend(records.columns[field])
+        self.raw_fields.extend(records.raw_fields)
+        for key in records.extra:
+            column = self.extra.setdefault(key, [])
+            if len(column) < row:
+                column.extend([None] * (row - len(column)))
+            column.extend(records.column(key))
+        for key, rows in records.nones.items():
+            self.nones.setdefault(key, set()).update(row + index for index in rows)
+        self.length = row + records.length
+
+    def column(self, name):
+        name = ALIASES.get(name, name)
+        if name in self.columns:
+            return self.columns[name]
+        if name == "raw_fields":
+            return self.raw_fields
+        column = self.extra.get(name)
+        if column is None:
+            return [None] * self.length
+        if len(column) < self.length:
+            column.extend([None] * (self.length - len(column)))
+        return column
+
+    def take(self, rows):
+        batch = RecordBatch()
+        batch.columns = {field: [column[row] for row in rows] for field, column in self.columns.items()}
+        batch.raw_fields = [self.raw_fields[row] for row in rows]
+        batch.extra = {key: [self.column(key)[row] for row in rows] for key in self.extra}
+        batch.nones = self._nones_for(rows)
+        batch.length = len(batch.raw_fields)
+        return batch
+
+    def _nones_for(self, rows):
+        nones = {}
+        for key, explicit in self.nones.items():
+            kept = {position for position, row in enumerate(rows) if row in explicit}
+            if kept:
+                nones[key] = kept
+        return nones
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            batch = RecordBatch()
+            batch.columns = {field: column[index] for field, column in self.columns.items()}
+            batch.raw_fields = self.raw_fields[index]
+            batch.extra = {key: self.column(key)[index] for key in self.extra}
+            batch.nones = self._nones_for(range(self.length)[index]) if self.nones else {}
+            batch.length = len(batch.raw_fields)
+            return batch
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("record batch index out of range")
+        record = NormalizedRecord.__new__(NormalizedRecord)
+        record.extra = None
+        for field, column in self.columns.items():
+            setattr(record, field, column[index])
+        record.raw_fields = self.raw_fields[index]
+        for key, column in self.extra.items():
+            value = column[index] if index < len(column) else None
+            if value is not None or index in self.nones.get(key, ()):
+                if record.extra is None:
+                    record.extra = {}
+                record.extra[key] = value
+        return record
+
+    def __iter__(self):
+        for index in range(self.length):
+            yield self[index]
+
+    def to_frame(self):
+        import pandas as pd
+
+        data = dict(self.columns)
+        data["raw_fields"] = self.raw_fields
+        for alias, target in ALIASES.items():
+            data[alias] = self.columns[target]
+        for key in self.extra:
+            data[key] = self.column(key)
+        return pd.DataFrame(data, columns=list(data)) if self.length else pd.DataFrame()
+
+
+def records_frame(records):
+    if isinstance(records, RecordBatch):
+        return records.to_frame()
+    import pandas as pd
+
+    return pd.DataFrame(record_dicts(records))
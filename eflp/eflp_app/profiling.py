@@ -0,0 +1,141 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+
+
+MODES = ("deterministic", "sampling")
+MODE_ALIASES = {"cprofile": "deterministic", "1": "sampling", "true": "sampling", "sample": "sampling"}
+ARTIFACT_EXTENSIONS = {"deterministic": "pstats", "sampling": "collapsed"}
+TOP_FUNCTIONS = 15
+
+
+def normalize_mode(value):
+    mode = str(value or "").strip().lower()
+    mode = MODE_ALIASES.get(mode, mode)
+    return mode if mode in MODES else ""
+
+
+def frame_label(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class StackSampler:
+    # Samples one thread's Python stack from a helper thread, so the profiled
+    # code runs unmodified. Stacks are kept in collapsed form (root first,
+    # frames joined by ';') with a count per distinct stack.
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = {}
+        self.samples = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        current_frames = sys._current_frames
+        while not self.stopped.wait(self.interval):
+            frame = current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            stack = ";".join(reversed(labels))
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+            self.samples += 1
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1]):
+                fh.write(f"{stack} {count}\n")
+
+    def top_functions(self, limit=TOP_FUNCTIONS):
+        self_counts = {}
+        total_counts = {}
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] = self_counts.get(frames[-1], 0) + count
+            for label in set(frames):
+                total_counts[label] = total_counts.get(label, 0) + count
+        ranked = sorted(total_counts, key=lambda label: (-self_counts.get(label, 0), -total_counts[label]))
+        return [
+            {
+                "function": label,
+                "self_seconds": round(self_counts.get(label, 0) * self.interval, 4),
+                "cumulative_seconds": round(total_counts[label] * self.interval, 4),
+                "samples": total_counts[label],
+            }
+            for label in ranked[:limit]
+        ]
+
+
+def pstats_top_functions(profiler, limit=TOP_FUNCTIONS):
+    stats = pstats.Stats(profiler)
+    ranked = sorted(stats.stats.items(), key=lambda item: -item[1][2])
+    return [
+        {
+            "function": f"{os.path.basename(filename)}:{line}({name})",
+            "self_seconds": round(self_time, 4),
+            "cumulative_seconds": round(cumulative, 4),
+            "calls": calls,
+        }
+        for (filename, line, name), (_, calls, self_time, cumulative, _) in ranked[:limit]
+    ]
+
+
+class ProfileRun:
+    # `with ProfileRun(mode, path) as run:` profiles the calling thread for
+    # the duration of the block, writes the artifact on exit (also when the
+    # block raises) and leaves the top functions in `run.summary`.
+    def __init__(self, mode, artifact_path, interval=0.005):
+        self.mode = mode
+        self.artifact_path = artifact_path
+        self.interval = interval
+        self.profiler = None
+        self.sampler = None
+        self.started = 0.0
+        self.summary = {"mode": mode, "artifact": os.path.basename(artifact_path), "started": time.time()}
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        if self.mode == "deterministic":
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                self.profiler = profiler
+            except ValueError as exc:
+                self.summary["error"] = f"Profiler unavailable: {exc}"
+        else:
+            self.sampler = StackSampler(threading.get_ident(), self.interval)
+            self.sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.sampler is not None:
+            self.sampler.stop()
+        self.summary["seconds"] = round(time.perf_counter() - self.started, 4)
+        try:
+            if self.profiler is not None:
+                self.profiler.dump_stats(self.artifact_path)
+                self.summary["top_functions"] = pstats_top_functions(self.profiler)
+            elif self.sampler is not None:
+                self.sampler.write(self.artifact_path)
+                self.summary["samples"] = self.sampler.samples
+                self.summary["interval_seconds"] = self.interval
+                self.summary["top_functions"] = self.sampler.top_functions()
+        except OSError as err:
+            self.summary["error"] = f"Unable to write profile: {err}"
+        return False
@@ -0,0 +1,95 @@
+import itertools
+import threading
+import time
+from collections import deque
+
+
+STAGES = ("parsed", "appended", "indexed")
+PERCENTILES = (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+
+
+class Sample:
+    __slots__ = ("case_id", "received")
+
+    def __init__(self, case_id, received):
+        self.case_id = case_id
+        self.received = received
+
+
+class StageLatency:
+    # One in `sample_every` records carries a Sample from datagram receipt
+    # through parse, append and RAG indexing. Each stamp stores the seconds
+    # since receipt in a bounded per-case window, and samples waiting for RAG
+    # are kept so the current lag can be read even while indexing is stuck.
+    def __init__(self, sample_every, window=1024, observe=None):
+        self.sample_every = max(0, int(sample_every))
+        self.window = window
+        self.observe = observe
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+        self.cases = {}
+        self.pending = {}
+
+    def start(self, case_id, received):
+        if not self.sample_every or next(self.counter) % self.sample_every:
+            return None
+        return Sample(case_id, received)
+
+    def stamp(self, sample, stage, now=None):
+        if sample is None:
+            return
+        elapsed = (time.monotonic() if now is None else now) - sample.received
+        with self.lock:
+            stages = self.cases.setdefault(sample.case_id, {})
+            values = stages.get(stage)
+            if values is None:
+                values = stages[stage] = deque(maxlen=self.window)
+            values.append(elapsed)
+        if self.observe:
+            self.observe(elapsed, stage)
+
+    def await_index(self, samples):
+        with self.lock:
+            for sample in samples:
+                self.pending.setdefault(sample.case_id, {})[id(sample)] = sample
+
+    def indexed(self, samples):
+        now = time.monotonic()
+        self.abandon(samples)
+        for sample in samples:
+            self.stamp(sample, "indexed", now)
+
+    def abandon(self, samples):
+        with self.lock:
+            for sample in samples:
+                waiting = self.pending.get(sample.case_id)
+                if waiting is not None:
+                    waiting.pop(id(sample), None)
+                    if not waiting:
+                        del self.pending[sample.case_id]
+
+    def rag_lag(self, case_id=None):
+        # Age of the oldest sampled record still waiting for RAG, per case;
+        # 0 for sampled cases with nothing waiting.
+        now = time.monotonic()
+        with self.lock:
+            lag = {key: 0.0 for key in self.cases if case_id in (None, key)}
+            for key, waiting in self.pending.items():
+                if case_id in (None, key) and waiting:
+                    lag[key] = max(now - sample.received for sample in waiting.values())
+        return lag
+
+    def summary(self, case_id):
+        with self.lock:
+            stages = {stage: list(values) for stage, values in self.cases.get(case_id, {}).items()}
+        result = {"sample_every": self.sample_every, "stages": {}}
+        for stage in STAGES:
+            values = sorted(stages.get(stage) or [])
+            if not values:
+                continue
+            summary = {"samples": len(values)}
+            for name, fraction in PERCENTILES:
+                summary[name] = round(values[min(len(values) - 1, int(fraction * len(values)))], 4)
+            result["stages"][stage] = summary
+        result["rag_lag_seconds"] = round(self.rag_lag(case_id).get(case_id, 0.0), 3)
+        return result